@@ -1,17 +1,33 @@
 import tkinter as tk
 from tkinter import ttk, messagebox, font, filedialog
-from docx import Document
-from docx.shared import Inches
-from datetime import datetime
-import pandas as pd
+from datetime import datetime, timedelta
 import os
 import json
 import threading
 import time
-from openpyxl import load_workbook
+import bisect
+import queue
+import uuid
+import sqlite3
+import sys
+import tempfile
+import getpass
+import hashlib
+import subprocess
+import random
+import socket
+import re
+import io
+from xml.sax.saxutils import escape as xml_escape
+from contextlib import closing, contextmanager
 
 # === Building Selection Function ===
 def select_building():
+    """Show the building picker and wait until a building is chosen"""
+    root.wait_window(build_building_window())
+
+def build_building_window():
+    """Create the building picker window (returns without waiting for a choice)"""
     # Don't show root window yet - wait until UI is fully configured
     # root.deiconify()  # Removed - will show window after UI is configured
     building_window = tk.Toplevel()
@@ -135,79 +151,121 @@ def select_building():
         pady=5
     )
     confirm_btn.pack(pady=15)
-    
-    # Wait for this window to be destroyed before proceeding
-    root.wait_window(building_window)
-
-def configure_text_box(textbox, min_height=4):
-    """Configure a text box to automatically resize based on content"""
-    def update_height(event=None):
-        # Get text content
-        text = textbox.get("1.0", "end-1c")  # Exclude the automatic trailing newline
-        
-        # Get the width of the text box in pixels
+    return building_window
+
+# === Text Box Auto-Height ===
+# Note boxes grow with their wrapped content. Tk already knows how many display lines
+# a Text widget wraps to (count -displaylines), so the height is read from Tk instead
+# of re-splitting and measuring the note in Python. Updates are debounced and only run
+# for boxes whose content or width changed; very long notes stop growing and scroll.
+
+MAX_TEXT_HEIGHT = 25  # Lines; taller notes get a scrollbar instead
+HEIGHT_UPDATE_DELAY_MS = 80
+
+def count_display_lines(textbox):
+    """Number of wrapped lines Tk displays for the box's content"""
+    result = textbox.count("1.0", "end", "update", "displaylines")
+    if isinstance(result, tuple):
+        result = result[0]
+    return result or 1
+
+class TextHeightManager:
+    """Debounced, incremental height updates for auto-sized Text boxes"""
+
+    def __init__(self, widget):
+        self.widget = widget
+        self.pending = {}  # Boxes to update (dict used as an ordered set)
+        self.timer = None
+
+    def register(self, textbox, min_height):
+        textbox.min_height = min_height
+        textbox.measured_width = None
+        textbox.height_scrollbar = None
+        textbox.bind("<KeyRelease>", lambda event: self.schedule(textbox))
+        textbox.bind("<<Paste>>", lambda event: self.schedule(textbox), add="+")
+        textbox.bind("<Configure>", lambda event: self.on_configure(textbox, event.width))
+
+    def on_configure(self, textbox, width):
+        # Height changes also fire <Configure>; only a new width can change the wrapping
+        if width != textbox.measured_width:
+            self.schedule(textbox)
+
+    def schedule(self, textbox):
+        self.pending[textbox] = None
+        if self.timer is None:
+            self.timer = self.widget.after(HEIGHT_UPDATE_DELAY_MS, self.flush)
+
+    def flush(self):
+        self.timer = None
+        boxes = list(self.pending)
+        self.pending.clear()
+        for textbox in boxes:
+            if textbox.winfo_exists():
+                self.update(textbox)
+
+    def update(self, textbox):
+        """Resize one box now"""
         width = textbox.winfo_width()
-        
-        # If width is not properly initialized yet, use approximate calculation
         if width <= 1:
-            if hasattr(textbox, 'text_font'):
-                width = textbox.cget("width") * textbox.text_font.measure("0")
-            else:
-                # Default width approximation
-                width = textbox.cget("width") * 7
+            # Not laid out yet (e.g. a tab that hasn't been shown); count logical lines
+            # and measure properly once <Configure> reports the real width
+            line_count = int(textbox.index("end-1c").split(".")[0])
         else:
-            # Subtract some pixels for padding
-            width = width - 10
-        
-        # Calculate the number of wrapped lines
-        line_count = 0
-        for line in text.split('\n'):
-            if line.strip() == "":  # Empty line
-                line_count += 1
-                continue
-                
-            # Estimate line wrapping based on average character width
-            if hasattr(textbox, 'text_font'):
-                char_width = textbox.text_font.measure("0")  # Average character width
-            else:
-                char_width = 7  # Default approximation
-            
-            # Calculate how many lines this text would wrap to
-            if char_width > 0:
-                chars_per_line = max(1, width // char_width)
-                wrapped_lines = (len(line) // chars_per_line) + 1
-                line_count += wrapped_lines
-            else:
-                line_count += 1
-        
+            line_count = count_display_lines(textbox)
+            textbox.measured_width = width
         # Add 1 for the cursor line and any pending text
-        line_count += 1
-        
-        # Set minimum height
-        new_height = max(min_height, line_count)
-        
-        # Update height
-        textbox.configure(height=new_height)
-    
-    # Create a font object to measure text
-    try:
-        font_name = textbox.cget("font")
-        if isinstance(font_name, str):
-            textbox.text_font = font.Font(font=font_name)
-    except Exception:
-        # If there's any error with font, we'll use approximations instead
-        textbox.text_font = font.Font(family="Helvetica", size=11)
-    
-    # Bind events that should trigger height update
-    textbox.bind("<KeyRelease>", update_height)
-    textbox.bind("<FocusOut>", update_height)
-    textbox.bind("<Configure>", update_height)  # Also update when the widget is resized
-    
-    # Initial height update (after a short delay to ensure the widget is rendered)
-    textbox.after(100, update_height)
+        new_height = max(textbox.min_height, line_count + 1)
+        overflowing = new_height > MAX_TEXT_HEIGHT
+        new_height = min(new_height, MAX_TEXT_HEIGHT)
+        if int(textbox.cget("height")) != new_height:
+            textbox.configure(height=new_height)
+        self.show_scrollbar(textbox, overflowing)
+
+    def show_scrollbar(self, textbox, visible):
+        scrollbar = textbox.height_scrollbar
+        if visible and scrollbar is None:
+            scrollbar = self.add_scrollbar(textbox)
+        if scrollbar is None:
+            return
+        if visible and not scrollbar.winfo_ismapped():
+            scrollbar.pack(in_=scrollbar.holder, side="right", fill="y")
+        elif not visible and scrollbar.winfo_ismapped():
+            scrollbar.pack_forget()
+
+    def add_scrollbar(self, textbox):
+        """Move a packed text box into a holder frame that has room for a scrollbar"""
+        if textbox.winfo_manager() != "pack":
+            return None
+        pack_options = textbox.pack_info()
+        pack_options.pop("in", None)
+        holder = tk.Frame(textbox.master, bg=textbox.master.cget("bg"))
+        holder.pack(before=textbox, **pack_options)
+        scrollbar = tk.Scrollbar(textbox.master, command=textbox.yview)
+        scrollbar.holder = holder
+        textbox.configure(yscrollcommand=scrollbar.set)
+        textbox.pack(in_=holder, side="left", fill="both", expand=True, padx=0, pady=0)
+        # Widgets packed into a sibling must sit above it in the stacking order
+        textbox.lift(holder)
+        scrollbar.lift(holder)
+        textbox.height_scrollbar = scrollbar
+        return scrollbar
+
+def configure_text_box(textbox, min_height=4):
+    """Configure a text box to automatically resize based on content"""
+    text_heights.register(textbox, min_height)
+    textbox.update_height = lambda: text_heights.update(textbox)
     
+    refresh_text_height(textbox)
     return textbox
 
+def refresh_text_height(textbox):
+    """Resize a box once it has been laid out (or after its content was replaced)"""
+    # During a bulk restore every box is sized once when the restore finishes instead
+    if bulk_restore_boxes is not None:
+        bulk_restore_boxes[textbox] = None
+    else:
+        text_heights.schedule(textbox)
+
 root = tk.Tk()
 root.title("Night Report Generator")
 root.configure(bg="black")
@@ -215,16 +273,17 @@ root.state('zoomed')  # Open in full screen
 # root.geometry("750x700")  # Remove fixed geometry
 root.withdraw()  # Hide the main window until building is selected
 
+text_heights = TextHeightManager(root)
+
 # Global building variable
 building = ""
 
-# Global autosave variables
-autosave_thread = None
-autosave_running = False
-
 # Global draft loading variable
 loaded_from_draft = False
 
+# Local (per-PC) folder for crash-recovery data and caches
+LOCAL_DATA_DIR = os.path.join(os.environ.get("LOCALAPPDATA") or os.path.expanduser("~"), "NightReport")
+
 label_font = ("Helvetica", 11)
 entry_bg = "black"
 entry_fg = "white"
@@ -238,8 +297,6 @@ mechanical_note_tags = []
 production_boxes = []
 production_note_tags = []
 decibel_entries = []
-patron_boxes = []
-patron_note_tags = []
 patron_emergency_flags = []
 access_note_boxes = []
 access_note_tags = []
@@ -259,14 +316,14 @@ csc_shifts = ["Morning", "Evening", "Special Event", "Chair Watch"]
 traffic_notes_frame = None
 mechanical_notes_frame = None
 production_notes_frame = None
-patron_notes_frame = None
+patron_note_list = None  # VirtualNoteList
 cash_frame = None
 dining_frame = None
 hotel_frame = None
 misc_frame = None
 # Memorial Union specific frames
 carding_frame = None
-terrace_frame = None
+terrace_note_list = None  # VirtualNoteList
 enforcement_frame = None
 alumni_frame = None
 pier_frame = None
@@ -288,7 +345,6 @@ red_gym_misc_boxes = []
 
 # Memorial Union-specific
 carding_boxes = []
-terrace_boxes = []
 enforcement_boxes = []
 enforcement_note_tags = []
 enforcement_images = []  # Add this for storing image paths
@@ -299,6 +355,421 @@ alumni_note_tags = []
 pier_boxes = []
 pier_note_tags = []
 
+def reset_widget_registries():
+    """Forget the widgets of the previous form before the tabs are rebuilt"""
+    for registry in (
+        entries, building_traffic_boxes, mechanical_boxes, mechanical_note_tags,
+        production_boxes, production_note_tags, decibel_entries, patron_emergency_flags,
+        access_note_boxes, access_note_tags,
+        cash_boxes, cash_note_tags, dining_boxes, dining_note_tags, hotel_boxes,
+        misc_boxes, misc_note_tags, csc_entries, red_gym_deviation_boxes,
+        red_gym_mail_boxes, red_gym_misc_boxes, carding_boxes,
+        enforcement_boxes, enforcement_note_tags, enforcement_images, enforcement_items,
+        enforcement_components, alumni_boxes, alumni_note_tags, pier_boxes, pier_note_tags
+    ):
+        registry.clear()
+
+# === Report Data Model ===
+# The widgets above are only a view. Every note box, entry and tag dropdown writes
+# its value into report_model as it changes, so saving, autosave, the tally and the
+# Word report read plain Python objects instead of walking every Tk widget.
+
+# Note sections whose draft entries carry tags ({"text": ..., "tags": [...]})
+TAGGED_NOTE_SECTIONS = {
+    "mechanical", "production", "patron", "access", "cash", "dining",
+    "enforcement", "alumni", "pier", "red_gym_misc"
+}
+
+class NoteRecord:
+    """A single note (text, tags and optional image) with a stable ID"""
+    __slots__ = ("note_id", "section", "text", "tags", "image_path")
+
+    def __init__(self, section, text="", tags=None, image_path="", note_id=None):
+        self.note_id = note_id or uuid.uuid4().hex[:12]
+        self.section = section
+        self.text = text
+        self.tags = list(tags) if tags else []
+        self.image_path = image_path
+
+    def to_draft(self):
+        """Return the value stored for this note in the draft JSON"""
+        if self.section not in TAGGED_NOTE_SECTIONS:
+            return self.text
+        note_data = {"text": self.text, "tags": list(self.tags)}
+        if self.section == "enforcement":
+            note_data["image_path"] = self.image_path
+        return note_data
+
+class DecibelRecord:
+    """A single decibel reading row"""
+    __slots__ = ("note_id", "section", "time", "reading", "location")
+
+    def __init__(self, time="Time", reading="Reading (db)", location="Location", note_id=None):
+        self.note_id = note_id or uuid.uuid4().hex[:12]
+        self.section = "decibel"
+        self.time = time
+        self.reading = reading
+        self.location = location
+
+    def to_draft(self):
+        return {"time": self.time, "reading": self.reading, "location": self.location}
+
+# Friendly names for the "unsaved changes" indicator
+SECTION_LABELS = {
+    "entries": "Supervisor Info", "building_traffic": "Building Traffic", "mechanical": "Mechanical",
+    "production": "Production", "decibel": "Decibel Readings", "patron": "Patron Services",
+    "access": "Access", "access_inputs": "Access", "cash": "Cash Office", "dining": "Dining",
+    "hotel": "Hotel", "misc": "Misc", "carding": "Carding Runs", "terrace": "Terrace Traffic",
+    "enforcement": "Terrace Enforcement", "alumni": "Alumni Park", "pier": "Goodspeed Pier",
+    "csc": "Security", "red_gym": "Security", "red_gym_deviations": "Security",
+    "red_gym_mail": "Mail", "red_gym_misc": "Misc"
+}
+
+class ReportModel:
+    """Widget-independent copy of everything entered on the form.
+
+    Every change bumps a revision counter and records which section it touched, so
+    autosave can tell whether anything changed since the last successful save."""
+
+    # Groups of single values (everything that isn't a list of notes)
+    VALUE_GROUPS = ("entries", "access_inputs", "csc", "red_gym")
+
+    def __init__(self):
+        self.on_dirty_change = None  # Called when the set of unsaved sections changes
+        self.listeners = []  # Called with a dict describing every field-level edit
+        self.reset()
+
+    def reset(self, building_name=""):
+        self.building = building_name
+        self.entries = {}
+        self.access_inputs = {}
+        self.csc = {}
+        self.red_gym = {}
+        self.sections = {}
+        self.revision = 0
+        self.saved_revision = 0
+        self.section_revisions = {}
+        self.last_saved_at = None
+
+    # --- Dirty tracking ---
+
+    def mark_dirty(self, section):
+        newly_dirty = self.section_revisions.get(section, 0) <= self.saved_revision
+        self.revision += 1
+        self.section_revisions[section] = self.revision
+        if newly_dirty and self.on_dirty_change:
+            self.on_dirty_change()
+
+    @property
+    def is_dirty(self):
+        return self.revision > self.saved_revision
+
+    def dirty_sections(self):
+        return [section for section, revision in self.section_revisions.items()
+                if revision > self.saved_revision]
+
+    def mark_saved(self, revision, saved_at=None):
+        """Record that the snapshot taken at `revision` is safely on disk.
+        Edits made after that snapshot stay dirty."""
+        self.saved_revision = max(self.saved_revision, revision)
+        if saved_at is not None:
+            self.last_saved_at = saved_at
+        if self.on_dirty_change:
+            self.on_dirty_change()
+
+    def mark_clean(self):
+        """Treat the current contents as unmodified (fresh form or freshly loaded draft)"""
+        self.mark_saved(self.revision)
+
+    def notes(self, section):
+        """Return the ordered list of records for a section"""
+        return self.sections.setdefault(section, [])
+
+    def add_note(self, section, index=None, text="", tags=None, image_path="", note_id=None):
+        record = NoteRecord(section, text=text, tags=tags, image_path=image_path, note_id=note_id)
+        self._insert(record, index)
+        return record
+
+    def add_decibel_reading(self, index=None, **fields):
+        record = DecibelRecord(**fields)
+        self._insert(record, index)
+        return record
+
+    def _insert(self, record, index):
+        notes = self.notes(record.section)
+        if index is None:
+            notes.append(record)
+        else:
+            notes.insert(index, record)
+        self.mark_dirty(record.section)
+        self._emit({"op": "add", "section": record.section, "note_id": record.note_id,
+                    "index": notes.index(record)})
+
+    def remove_note(self, record):
+        notes = self.notes(record.section)
+        if record in notes:
+            notes.remove(record)
+            self.mark_dirty(record.section)
+            self._emit({"op": "remove", "section": record.section, "note_id": record.note_id})
+
+    def clear_section(self, section):
+        if self.notes(section):
+            self.notes(section).clear()
+            self.mark_dirty(section)
+            self._emit({"op": "clear", "section": section})
+
+    def find_note(self, section, note_id):
+        for record in self.notes(section):
+            if record.note_id == note_id:
+                return record
+        return None
+
+    def update_note(self, record, field, value):
+        """Set a field on a note record"""
+        if getattr(record, field) == value:
+            return
+        setattr(record, field, value)
+        self.mark_dirty(record.section)
+        self._emit({"op": "set", "section": record.section, "note_id": record.note_id,
+                    "field": field, "value": value})
+
+    def set_value(self, group, key, value, field=None):
+        """Set a single form value, e.g. set_value("entries", "date", ...) or
+        set_value("csc", "Morning", "2", field="requested")"""
+        store = getattr(self, group)
+        if field is not None:
+            store = store.setdefault(key, {})
+        if store.get(field or key) == value:
+            return
+        store[field or key] = value
+        self.mark_dirty(group)
+        self._emit({"op": "set", "section": group, "note_id": key, "field": field or "value", "value": value})
+
+    def _emit(self, change):
+        for listener in self.listeners:
+            listener(change)
+
+    def apply_change(self, change):
+        """Replay a change produced by _emit (used for journal recovery)"""
+        op = change.get("op")
+        section = change.get("section")
+        if op == "add":
+            if section == "decibel":
+                self.add_decibel_reading(index=change.get("index"), note_id=change.get("note_id"))
+            else:
+                self.add_note(section, index=change.get("index"), note_id=change.get("note_id"))
+        elif op == "remove":
+            record = self.find_note(section, change.get("note_id"))
+            if record is not None:
+                self.remove_note(record)
+        elif op == "clear":
+            self.clear_section(section)
+        elif op == "set" and section in self.VALUE_GROUPS:
+            field = change.get("field")
+            self.set_value(section, change.get("note_id"), change.get("value"),
+                           field=None if field == "value" else field)
+        elif op == "set":
+            record = self.find_note(section, change.get("note_id"))
+            if record is not None and change.get("field") in record.__slots__:
+                self.update_note(record, change["field"], change.get("value"))
+
+    def load_draft(self, data):
+        """Rebuild the model from a draft dictionary (the inverse of snapshot)"""
+        self.reset(data.get("building", ""))
+        note_ids = data.get("note_ids", {})
+        self.entries = {key: str(value) for key, value in data.get("entries", {}).items()}
+        self.access_inputs = {key: str(value) for key, value in data.get("access_inputs", {}).items()}
+        self.csc = {shift: dict(values) for shift, values in data.get("csc", {}).items()}
+        for key in ("red_gym_building_tours", "red_gym_deviations_count",
+                    "red_gym_door_check_time", "red_gym_door_check_day_type"):
+            if key in data:
+                self.red_gym[key] = str(data[key])
+        
+        for section, note_data in data.get("notes", {}).items():
+            if isinstance(note_data, str):
+                note_data = [note_data]
+            elif not isinstance(note_data, list):
+                note_data = [str(note_data)]
+            ids = note_ids.get(section, [])
+            for i, note_entry in enumerate(note_data):
+                note_id = ids[i] if i < len(ids) else None
+                if isinstance(note_entry, dict):
+                    self.add_note(section, text=str(note_entry.get("text", "")),
+                                  tags=note_entry.get("tags", []),
+                                  image_path=str(note_entry.get("image_path", "")), note_id=note_id)
+                else:
+                    self.add_note(section, text=str(note_entry), note_id=note_id)
+        
+        ids = note_ids.get("decibel", [])
+        for i, reading in enumerate(data.get("decibel_readings", [])):
+            self.add_decibel_reading(time=str(reading.get("time", "")), reading=str(reading.get("reading", "")),
+                                     location=str(reading.get("location", "")),
+                                     note_id=ids[i] if i < len(ids) else None)
+        
+        ids = note_ids.get("red_gym_deviations", [])
+        for i, note_text in enumerate(data.get("red_gym_deviation_notes", [])):
+            self.add_note("red_gym_deviations", text=str(note_text), note_id=ids[i] if i < len(ids) else None)
+        self.mark_clean()
+
+    def note_sections(self):
+        """Draft note sections used by the current building, in report order"""
+        if self.building == "Red Gym":
+            return ["building_traffic", "red_gym_mail", "red_gym_misc"]
+        sections = ["building_traffic", "mechanical", "production", "patron", "access",
+                    "cash", "dining", "hotel", "misc"]
+        if self.building == "Memorial Union":
+            sections += ["carding", "terrace", "enforcement", "alumni", "pier"]
+        return sections
+
+    def snapshot(self, timestamp=""):
+        """Build the draft dictionary (same layout as the JSON drafts on the share)"""
+        draft_data = {
+            "timestamp": timestamp,
+            "building": self.building,
+            "entries": dict(self.entries),
+            "notes": {},
+            "decibel_readings": [],
+            "csc": {},
+            "access_inputs": {},
+            "note_ids": {}
+        }
+        for section in self.note_sections():
+            records = self.notes(section)
+            draft_data["notes"][section] = [record.to_draft() for record in records]
+            draft_data["note_ids"][section] = [record.note_id for record in records]
+
+        if self.building == "Red Gym":
+            draft_data.update(self.red_gym)
+            deviations = self.notes("red_gym_deviations")
+            draft_data["red_gym_deviation_notes"] = [record.text for record in deviations]
+            draft_data["note_ids"]["red_gym_deviations"] = [record.note_id for record in deviations]
+        else:
+            readings = self.notes("decibel")
+            draft_data["decibel_readings"] = [record.to_draft() for record in readings]
+            draft_data["note_ids"]["decibel"] = [record.note_id for record in readings]
+            draft_data["access_inputs"] = dict(self.access_inputs)
+            for shift in csc_shifts:
+                if shift in self.csc:
+                    draft_data["csc"][shift] = dict(self.csc[shift])
+        return draft_data
+
+class ReportNote:
+    """A note as it goes into the final report: trimmed text, real tags only"""
+    __slots__ = ("section", "index", "text", "tags", "image_path")
+
+    def __init__(self, section, index, record):
+        self.section = section
+        self.index = index  # Position in the section, counting empty notes
+        self.text = record.text.strip()
+        self.tags = [tag for tag in record.tags if tag != "None"]
+        self.image_path = record.image_path
+
+class ReportNotes:
+    """Every note of a report read and normalized once, for the document and the tally.
+
+    notes[section] lists the section's ReportNotes, including empty ones."""
+
+    def __init__(self, report):
+        self.sections = {}
+        for section in report.note_sections() + ["red_gym_deviations"]:
+            self.sections[section] = [ReportNote(section, index, record) for index, record in enumerate(report.notes(section))]
+        # (time, reading, location) of each decibel reading row
+        self.decibel_readings = [(record.time.strip(), record.reading.strip(), record.location.strip())
+                                 for record in report.notes("decibel")]
+
+    def __getitem__(self, section):
+        return self.sections.get(section, [])
+
+report_model = ReportModel()
+
+# Label next to the Save/End Shift buttons showing "saved at ..." or "unsaved changes"
+save_status_label = None
+
+def refresh_save_status():
+    """Update the save indicator from the model's dirty state"""
+    if save_status_label is None:
+        return
+    if report_model.is_dirty:
+        names = []
+        for section in report_model.dirty_sections():
+            name = SECTION_LABELS.get(section, section)
+            if name not in names:
+                names.append(name)
+        if len(names) > 4:
+            names = names[:4] + ["..."]
+        text, color = "Unsaved changes: " + ", ".join(names), "orange"
+    elif report_model.last_saved_at:
+        text, color = f"All changes saved at {report_model.last_saved_at.strftime('%I:%M %p')}", "green"
+    else:
+        text, color = "No unsaved changes", "gray"
+    try:
+        save_status_label.config(text=text, fg=color)
+    except tk.TclError:
+        pass  # Label was destroyed while the tabs were rebuilt
+
+def add_save_status_label(parent):
+    """Create the save indicator in the button bar"""
+    global save_status_label
+    save_status_label = tk.Label(parent, text="", fg="gray", bg="black", font=("Helvetica", 10))
+    save_status_label.pack(side="left", padx=12)
+    refresh_save_status()
+
+report_model.on_dirty_change = refresh_save_status
+
+def track_text_changes(textbox, on_change):
+    """Call on_change(text) after each edit of a Text widget"""
+    def on_modified(event=None):
+        if not textbox.edit_modified():
+            return
+        textbox.edit_modified(False)
+        on_change(textbox.get("1.0", "end-1c"))
+    textbox.bind("<<Modified>>", on_modified, add="+")
+
+def bind_note_text(textbox, record):
+    """Keep a note record's text in sync with its Text widget"""
+    textbox.note_record = record
+    track_text_changes(textbox, lambda text: report_model.update_note(textbox.note_record, "text", text))
+
+def bind_text_to_model(textbox, group, key):
+    """Keep a single model value (e.g. Red Gym building tours) in sync with a Text widget"""
+    report_model.set_value(group, key, textbox.get("1.0", "end-1c"))
+    track_text_changes(textbox, lambda text: report_model.set_value(group, key, text))
+
+def bind_variable_to_model(var, on_change):
+    """Call on_change(value) now and whenever a Tk variable is written"""
+    on_change(var.get())
+    trace_form_variable(var, lambda *args: on_change(var.get()))
+
+form_variables = {}  # Variable name -> Tk variable traced by the current form
+
+def trace_form_variable(var, callback):
+    """var.trace_add("write", callback), undone when the form is torn down.
+
+    The trace's Tcl command holds the callback and the callback holds the variable, so
+    destroying the widget that shows the variable frees neither."""
+    var.trace_add("write", callback)
+    form_variables[str(var)] = var
+
+def forget_form_variable(var):
+    """Remove a variable's traces so it and its callbacks can be freed"""
+    for mode, callback_name in var.trace_info():
+        var.trace_remove(mode, callback_name)
+    form_variables.pop(str(var), None)
+
+def bind_entry_to_model(entry, on_change):
+    """Attach a StringVar to an Entry/Combobox and mirror its value into the model"""
+    var = tk.StringVar(value=entry.get())
+    entry.configure(textvariable=var)
+    entry.model_var = var  # Keep the variable alive as long as the widget
+    bind_variable_to_model(var, on_change)
+
+def bind_note_tags(tag_vars, record):
+    """Mirror the tag dropdown values of a note into its record"""
+    tags = [var.get() for var in tag_vars]
+    # An extra "None" dropdown doesn't change the note's tags
+    if [tag for tag in tags if tag != "None"] != [tag for tag in record.tags if tag and tag != "None"]:
+        report_model.update_note(record, "tags", tags)
+
 # Memorial Union specific function for enforcement component ordering
 def reorder_enforcement_components():
     """Reorder enforcement components in the correct order"""
@@ -320,13 +791,16 @@ DINING_TAG_OPTIONS = ["None", "Catering Order Pickup/inquiry"]
 RED_GYM_MISC_TAG_OPTIONS = ["None", "Physical Plant"]
 
 # Helper for adding tag dropdowns to a note (must be defined before use)
-def add_tagging_to_note(tag_frame, tag_options, tag_vars, tag_dropdowns):
-    def add_tag_dropdown():
-        var = tk.StringVar(value="None")
-        dropdown = ttk.Combobox(tag_frame, textvariable=var, values=tag_options, state="readonly", width=30)
+def add_tagging_to_note(tag_frame, tag_options, tag_vars, tag_dropdowns, record=None, width=30):
+    def add_tag_dropdown(value="None"):
+        var = tk.StringVar(value=value)
+        dropdown = ttk.Combobox(tag_frame, textvariable=var, values=tag_options, state="readonly", width=width)
         dropdown.pack(side="left", padx=(0, 5))
         tag_vars.append(var)
         tag_dropdowns.append(dropdown)
+        if record is not None:
+            # Keep the note's record in sync with every dropdown, including ones added later
+            trace_form_variable(var, lambda *args: bind_note_tags(tag_vars, record))
         def on_tag_change(event=None):
             if var.get() != "None" and not hasattr(dropdown, 'add_tag_btn'):
                 add_btn = tk.Button(tag_frame, text="+ Add Tag", bg="white", fg="black", font=("Helvetica", 9, "bold"),
@@ -364,11 +838,300 @@ def add_tagging_to_note(tag_frame, tag_options, tag_vars, tag_dropdowns):
     # Store the functions for later use
     tag_frame.add_tag_dropdown = add_tag_dropdown
     tag_frame.update_add_tag_buttons = update_add_tag_buttons
-    add_tag_dropdown()
+    
+    # One dropdown per tag already on the note (at least one)
+    initial_tags = [tag for tag in record.tags if tag and tag != "None"] if record is not None else []
+    for tag in initial_tags or ["None"]:
+        add_tag_dropdown(tag)
+    if initial_tags:
+        update_add_tag_buttons()
+
+# === Virtual Note List ===
+# Event nights can bring 80+ patron notes, and every note is a frame, label, text box and
+# tag dropdowns. High-volume tabs show their notes in a scrolling list that only has
+# widgets for the rows in view; rows that scroll out are reused for the ones scrolling in.
+# The notes themselves live in report_model, so a reused row loses nothing.
+
+ESTIMATED_NOTE_ROW_HEIGHT = 170  # Pixels, for rows that haven't been shown yet
+NOTE_LIST_OVERSCAN = 300  # Pixels rendered above and below the view so scrolling stays smooth
+NOTE_ROW_SPACING = 10
+
+class NoteRow:
+    """A reusable note editor (label, text box, tag dropdowns) in a VirtualNoteList"""
+
+    def __init__(self, note_list):
+        self.note_list = note_list
+        self.record = None
+        self.frame = tk.Frame(note_list.canvas, bg="black")
+        self.label = tk.Label(self.frame, fg="white", bg="black", font=label_font)
+        self.textbox = tk.Text(self.frame, height=note_list.min_height, width=80, bg=entry_bg, fg=entry_fg,
+                               insertbackground="white", font=entry_font, wrap=tk.WORD)
+        self.label.pack(anchor="w")
+        self.textbox.pack(fill="both", expand=True, padx=5)
+        configure_text_box(self.textbox, min_height=note_list.min_height)
+        bind_note_text(self.textbox, None)  # Pointed at a record by show()
+        self.tag_frame = tk.Frame(self.frame, bg="black")
+        self.tag_vars = []
+        if note_list.tag_options:
+            self.tag_frame.pack(anchor="w", pady=(2, 0))
+        self.item = note_list.canvas.create_window(0, 0, window=self.frame, anchor="nw", state="hidden")
+        self.frame.bind("<Configure>", lambda event: note_list.row_resized(self, event.height))
+
+    def show(self, index, record):
+        """Point the row at a note (only reloads the widgets if the note changed)"""
+        self.label.config(text=f"{self.note_list.label} #{index+1}:")
+        if record is self.record:
+            return
+        self.record = record
+        self.textbox.note_record = None  # Don't write the previous note's text into this one
+        self.textbox.delete("1.0", tk.END)
+        self.textbox.insert("1.0", record.text)
+        self.textbox.edit_modified(False)
+        self.textbox.note_record = record
+        refresh_text_height(self.textbox)
+        if self.note_list.tag_options:
+            for var in self.tag_vars:
+                forget_form_variable(var)
+            for child in self.tag_frame.winfo_children():
+                child.destroy()
+            self.tag_vars = []
+            add_tagging_to_note(self.tag_frame, self.note_list.tag_options, self.tag_vars, [], record)
+
+    def has_focus(self, focus):
+        return focus is not None and str(focus).startswith(str(self.frame))
+
+class VirtualNoteList:
+    """Scrolling list of one section's notes that keeps widgets only for the visible rows"""
+
+    def __init__(self, parent, section, label, tag_options=None, min_height=4):
+        self.section = section
+        self.label = label
+        self.tag_options = tag_options
+        self.min_height = min_height
+        self.heights = {}  # note_id -> measured row height
+        self.offsets = [0]  # Top of each row, plus the total height at the end
+        self.rows = {}  # note_id -> row currently showing that note
+        self.spare_rows = []
+        self.render_pending = False
+        self.scroll_position = None
+        self.scrollregion = None
+        
+        self.container = tk.Frame(parent, bg="black")
+        self.canvas = tk.Canvas(self.container, bg="black", highlightthickness=0)
+        self.canvas.note_list = self  # Found by the mouse wheel handler
+        scrollbar = tk.Scrollbar(self.container, orient="vertical", command=self.canvas.yview)
+        self.canvas.configure(yscrollcommand=lambda first, last: self.on_scroll(scrollbar, first, last))
+        scrollbar.pack(side="right", fill="y")
+        self.canvas.pack(side="left", fill="both", expand=True)
+        self.canvas.bind("<Configure>", lambda event: self.schedule_render())
+        self.schedule_render()
+
+    def pack(self, **options):
+        self.container.pack(**options)
+
+    def on_scroll(self, scrollbar, first, last):
+        scrollbar.set(first, last)
+        # Only an actual scroll needs new rows; the canvas also reports after every redraw
+        if (first, last) != self.scroll_position:
+            self.scroll_position = (first, last)
+            self.schedule_render()
+
+    def schedule_render(self):
+        if not self.render_pending:
+            self.render_pending = True
+            self.canvas.after_idle(self.render)
+
+    def row_resized(self, row, height):
+        if row.record is not None and self.heights.get(row.record.note_id) != height + NOTE_ROW_SPACING:
+            self.heights[row.record.note_id] = height + NOTE_ROW_SPACING
+            self.schedule_render()
+
+    def layout(self):
+        """Recompute row positions from the measured (or estimated) heights"""
+        offsets = [0]
+        for record in report_model.notes(self.section):
+            offsets.append(offsets[-1] + self.heights.get(record.note_id, ESTIMATED_NOTE_ROW_HEIGHT))
+        self.offsets = offsets
+        scrollregion = (0, 0, self.canvas.winfo_width(), offsets[-1])
+        if scrollregion != self.scrollregion:
+            self.scrollregion = scrollregion
+            self.canvas.configure(scrollregion=scrollregion)
+
+    def render(self):
+        """Show rows for the notes in view and recycle the rest"""
+        self.render_pending = False
+        if not self.canvas.winfo_exists():
+            return
+        self.layout()
+        records = report_model.notes(self.section)
+        top = self.canvas.canvasy(0)
+        first = max(bisect.bisect_right(self.offsets, top - NOTE_LIST_OVERSCAN) - 1, 0)
+        last = bisect.bisect_left(self.offsets, top + self.canvas.winfo_height() + NOTE_LIST_OVERSCAN)
+        visible = {record.note_id: (index, record) for index, record in enumerate(records[first:last], first)}
+        
+        # Free rows that scrolled out of view, except the one being typed in
+        try:
+            focus = self.canvas.focus_get()
+        except KeyError:  # Focus is in a combobox popdown
+            focus = None
+        for note_id, row in list(self.rows.items()):
+            if note_id not in visible and not row.has_focus(focus):
+                self.canvas.itemconfigure(row.item, state="hidden")
+                self.spare_rows.append(self.rows.pop(note_id))
+        
+        width = self.canvas.winfo_width()
+        for note_id, (index, record) in visible.items():
+            row = self.rows.get(note_id)
+            if row is None:
+                row = self.spare_rows.pop() if self.spare_rows else NoteRow(self)
+                self.rows[note_id] = row
+            row.show(index, record)
+            self.canvas.coords(row.item, 0, self.offsets[index] + NOTE_ROW_SPACING // 2)
+            self.canvas.itemconfigure(row.item, width=width, state="normal")
+
+    def scroll_to(self, record):
+        """Bring a note into view (e.g. one that was just added)"""
+        self.layout()
+        index = report_model.notes(self.section).index(record)
+        if self.offsets[-1]:
+            self.canvas.yview_moveto(self.offsets[index] / self.offsets[-1])
+        self.schedule_render()
+
+def scroll_note_list(event):
+    """Mouse wheel scrolling for whichever note list is under the pointer"""
+    try:
+        widget = root.winfo_containing(event.x_root, event.y_root)
+    except KeyError:  # Pointer over a combobox popdown or another toplevel Tk can't name
+        return
+    while widget is not None and not hasattr(widget, "note_list"):
+        widget = widget.master
+    if widget is None:
+        return
+    if event.num == 4 or event.delta > 0:
+        widget.yview_scroll(-1, "units")
+    else:
+        widget.yview_scroll(1, "units")
+
+for wheel_event in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+    root.bind_all(wheel_event, scroll_note_list, add="+")
+
+# === Performance Timing ===
+# Saves, loads and report generation are timed phase by phase. Each finished operation
+# is appended as one line to a rotating JSONL log in the local data folder and
+# summarized in the status bar, so slow days on the share are easy to spot.
+
+PERF_LOG_ENABLED = True
+PERF_LOG_MAX_BYTES = 1024 * 1024
+PERF_LOG_BACKUPS = 3
+
+PHASE_LABELS = {
+    "snapshot": "widget snapshot",
+    "json_encode": "JSON encode",
+    "spool_write": "local spool write",
+    "share_write": "share write",
+    "draft_cleanup": "draft cleanup",
+    "draft_index": "draft index",
+    "read_file": "file read",
+    "build_tabs": "tab build",
+    "populate": "form restore",
+    "imports": "docx/openpyxl import",
+    "load_template": "template load",
+    "document_build": "document build",
+    "prepare_photo": "photo resize",
+    "add_picture": "doc.add_picture",
+    "load_workbook": "tally load",
+    "tally_update": "tally update",
+    "save_workbook": "tally save",
+    "note_store": "note store write",
+    "parse_drafts": "draft parsing",
+    "doc_save": "doc.save",
+}
+
+class PerfRun:
+    """Phase timings for one save, load or generate"""
+
+    def __init__(self, log, operation):
+        self.log = log
+        self.operation = operation
+        self.started_at = datetime.now()
+        self.start = time.perf_counter()
+        self.phases = {}  # name -> [total ms, count]
+
+    @contextmanager
+    def phase(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, start)
+
+    def record(self, name, start, exclude=()):
+        """Add the time since start (a time.perf_counter() value) to a phase, minus
+        the time of nested phases listed in exclude"""
+        elapsed = (time.perf_counter() - start) * 1000
+        elapsed -= sum(self.phases.get(nested, [0.0])[0] for nested in exclude)
+        timing = self.phases.setdefault(name, [0.0, 0])
+        timing[0] += elapsed
+        timing[1] += 1
+
+    def finish(self, ok=True, **info):
+        """Log the run and return a one-line summary for the status bar"""
+        total_ms = (time.perf_counter() - self.start) * 1000
+        self.log.write({
+            "ts": self.started_at.isoformat(timespec="seconds"),
+            "op": self.operation,
+            "ok": ok,
+            "total_ms": round(total_ms, 1),
+            "phases": {name: {"ms": round(ms, 1), "n": count} for name, (ms, count) in self.phases.items()},
+            **info
+        })
+        slowest = sorted(self.phases.items(), key=lambda item: item[1][0], reverse=True)[:2]
+        details = ", ".join(f"{PHASE_LABELS.get(name, name)} {ms / 1000:.2f} s" for name, (ms, _) in slowest)
+        summary = f"Last {self.operation}: {total_ms / 1000:.2f} s"
+        return f"{summary} ({details})" if details else summary
+
+class PerfLog:
+    """Append-only JSONL log of operation timings, rotated by size"""
+
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.Lock()
+
+    def start(self, operation):
+        return PerfRun(self, operation)
+
+    def write(self, record):
+        if not PERF_LOG_ENABLED:
+            return
+        try:
+            with self.lock:
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                if os.path.exists(self.path) and os.path.getsize(self.path) > PERF_LOG_MAX_BYTES:
+                    self._rotate()
+                with open(self.path, 'a', encoding='utf-8') as f:
+                    f.write(json.dumps(record) + "\n")
+        except OSError as e:
+            print(f"Warning: Could not write performance log: {e}")
+
+    def _rotate(self):
+        for n in range(PERF_LOG_BACKUPS - 1, 0, -1):
+            if os.path.exists(f"{self.path}.{n}"):
+                os.replace(f"{self.path}.{n}", f"{self.path}.{n + 1}")
+        os.replace(self.path, f"{self.path}.1")
+
+perf_log = PerfLog(os.path.join(LOCAL_DATA_DIR, "perf_log.jsonl"))
+
+perf_status_bar = tk.Label(root, text="", fg="gray", bg="black", anchor="w", font=("Helvetica", 9))
+perf_status_bar.pack(side="bottom", fill="x", padx=8)
+
+def show_perf_summary(summary):
+    """Show the latest timing summary in the status bar (Tk thread only)"""
+    perf_status_bar.config(text=summary)
 
 # === Tabs ===
 notebook = ttk.Notebook(root)
 notebook.pack(expand=1, fill="both")
+tabs = {}  # Tab key -> tab frame for the current building
 
 style = ttk.Style()
 style.theme_use('default')
@@ -385,11 +1148,12 @@ def add_labeled_entry(parent, label_text, key, default=""):
     frame = tk.Frame(parent, bg="black")
     label = tk.Label(frame, text=label_text, fg="white", bg="black", font=label_font)
     entry = tk.Entry(frame, bg=entry_bg, fg=entry_fg, insertbackground="white", font=entry_font, width=60)
-    entry.insert(0, default)
+    entry.insert(0, report_model.entries.get(key, default))
     label.pack(anchor="w")
     entry.pack(fill="x")
     frame.pack(pady=5, padx=10, fill="x")
     entries[key] = entry
+    bind_entry_to_model(entry, lambda value: report_model.set_value("entries", key, value))
 
 # === Utility Functions ===
 
@@ -447,6 +1211,8 @@ def ensure_note_boxes(note_boxes_list, note_tags_list, add_function, target_coun
             # Get the widget to destroy - it might be the textbox or its parent frame
             widget_to_destroy = note_boxes_list[-1]
             parent = widget_to_destroy.master
+            if hasattr(widget_to_destroy, 'note_record'):
+                report_model.remove_note(widget_to_destroy.note_record)
             
             # Try to destroy the parent frame if it exists and looks like a note frame
             try:
@@ -467,121 +1233,132 @@ def ensure_note_boxes(note_boxes_list, note_tags_list, add_function, target_coun
         while len(note_tags_list) > target_count:
             note_tags_list.pop()
 
+# === Note Box Pool ===
+# Rebuilding the form (new report, draft reload) tears every widget down. Plain note
+# boxes are the bulk of a form, so instead of being destroyed they are parked in a
+# per-section pool and handed back out by the add_*_note_box functions. Pooled boxes
+# are children of their tab (packed into the tab's note container with in_), so they
+# survive the teardown of everything else on the tab.
+
+NOTE_BOX_POOL_LIMIT = 40  # Per section; boxes beyond this are destroyed on teardown
+note_box_pool = {}  # Section -> parked NoteBoxes
+active_note_boxes = []  # NoteBoxes showing a note on the current form
+
+class NoteBox:
+    """A reusable note editor: numbered label, auto-sized text box and tag dropdowns"""
+
+    def __init__(self, tab, section, min_height):
+        self.section = section
+        self.frame = tk.Frame(tab, bg="black")
+        self.label = tk.Label(self.frame, fg="white", bg="black", font=label_font)
+        self.textbox = tk.Text(self.frame, height=min_height, width=80, bg=entry_bg, fg=entry_fg,
+                               insertbackground="white", font=entry_font, wrap=tk.WORD)
+        self.label.pack(anchor="w")
+        self.textbox.pack(fill="both", expand=True, padx=5)
+        configure_text_box(self.textbox, min_height=min_height)
+        bind_note_text(self.textbox, None)  # Pointed at a record by show()
+        self.tag_frame = tk.Frame(self.frame, bg="black")
+        self.tag_vars = []
+
+    def show(self, container, label_text, record, tag_options=None, tag_width=30):
+        self.label.config(text=label_text)
+        self.textbox.note_record = None  # Don't write the previous note's text into this one
+        self.textbox.delete("1.0", tk.END)
+        self.textbox.insert("1.0", record.text)
+        self.textbox.edit_modified(False)
+        self.textbox.note_record = record
+        refresh_text_height(self.textbox)
+        if tag_options:
+            self.tag_frame.pack(anchor="w", pady=(2, 0))
+            add_tagging_to_note(self.tag_frame, tag_options, self.tag_vars, [], record, width=tag_width)
+        self.frame.pack(in_=container, pady=5, fill="x")
+        self.frame.lift()  # A widget packed into a sibling must sit above it
+
+    def release(self):
+        """Detach the box from its note and hide it"""
+        self.frame.pack_forget()
+        self.textbox.note_record = None
+        for var in self.tag_vars:
+            forget_form_variable(var)
+        for child in self.tag_frame.winfo_children():
+            child.destroy()
+        self.tag_frame.pack_forget()
+        self.tag_vars = []
+
+def show_note_box(container, record, label_text, min_height=4, tag_options=None, tag_width=30):
+    """Show a note in a pooled box (or a new one) at the end of a note container"""
+    tab = container
+    while tab not in tabs.values():
+        tab = tab.master
+    pool = note_box_pool.get(record.section, [])
+    while pool and not pool[-1].frame.winfo_exists():
+        pool.pop()
+    box = pool.pop() if pool else NoteBox(tab, record.section, min_height)
+    box.show(container, label_text, record, tag_options, tag_width)
+    active_note_boxes.append(box)
+    return box
+
+def teardown_form():
+    """Destroy the current form's widgets, parking its note boxes in the pool"""
+    for box in active_note_boxes:
+        pool = note_box_pool.setdefault(box.section, [])
+        if box.frame.winfo_exists() and len(pool) < NOTE_BOX_POOL_LIMIT:
+            box.release()
+            pool.append(box)
+        elif box.frame.winfo_exists():
+            box.frame.destroy()
+    active_note_boxes.clear()
+    parked = {str(box.frame) for pool in note_box_pool.values() for box in pool}
+    for tab in tabs.values():
+        for child in tab.winfo_children():
+            if str(child) not in parked:
+                child.destroy()
+    for var in list(form_variables.values()):
+        forget_form_variable(var)
+    reset_widget_registries()
+
+def discard_note_box_pool():
+    """Forget pooled boxes whose tabs are about to be destroyed (building change)"""
+    note_box_pool.clear()
+    active_note_boxes.clear()
+
 # === Promoted Widget Creation Helper Functions ===
 
-def add_building_traffic_box(default_text=""):
+def add_building_traffic_box(default_text="", record=None):
     """Add a building traffic note box (applies to all buildings)"""
-    frame = tk.Frame(traffic_notes_frame, bg="black")
-    label = tk.Label(frame, text=f"Building Traffic Note #{len(building_traffic_boxes)+1}:", fg="white", bg="black", font=label_font)
-    textbox = tk.Text(frame, height=4, width=80, bg=entry_bg, fg=entry_fg, insertbackground="white", font=entry_font, wrap=tk.WORD)
-    if default_text:
-        textbox.insert("1.0", default_text)
-    label.pack(anchor="w")
-    textbox.pack(fill="both", expand=True, padx=5)
-    frame.pack(pady=5, fill="x")
-    # Configure text box to auto-resize
-    configure_text_box(textbox)
-    building_traffic_boxes.append(textbox)
+    if record is None:
+        record = report_model.add_note("building_traffic", text=default_text)
+    box = show_note_box(traffic_notes_frame, record, f"Building Traffic Note #{len(building_traffic_boxes)+1}:")
+    building_traffic_boxes.append(box.textbox)
 
-def add_mechanical_box(default_text=""):
+def add_mechanical_box(default_text="", record=None):
     """Add a mechanical note box with dynamic tagging (Memorial Union & Union South)"""
-    frame = tk.Frame(mechanical_notes_frame, bg="black")
-    label = tk.Label(frame, text=f"Mechanical Note #{len(mechanical_boxes)+1}:", fg="white", bg="black", font=label_font)
-    textbox = tk.Text(frame, height=4, width=80, bg=entry_bg, fg=entry_fg, insertbackground="white", font=entry_font, wrap=tk.WORD)
-    if default_text:
-        textbox.insert("1.0", default_text)
-    label.pack(anchor="w")
-    textbox.pack(fill="both", expand=True, padx=5)
-    configure_text_box(textbox)
-    mechanical_boxes.append(textbox)
-
-    # Tagging logic
-    tag_vars = []  # List of tk.StringVar for this note
-    tag_dropdowns = []  # List of dropdown widgets for this note
-
-    tag_frame = tk.Frame(frame, bg="black")
-    tag_frame.pack(anchor="w", pady=(2, 0))
-
-    def add_tag_dropdown():
-        var = tk.StringVar(value="None")
-        dropdown = ttk.Combobox(tag_frame, textvariable=var, values=MECHANICAL_TAG_OPTIONS, state="readonly", width=22)
-        dropdown.pack(side="left", padx=(0, 5))
-        tag_vars.append(var)
-        tag_dropdowns.append(dropdown)
-
-        def on_tag_change(event=None):
-            # Show +Add Tag button if a valid tag is selected and no button exists
-            if var.get() != "None" and not hasattr(dropdown, 'add_tag_btn'):
-                add_btn = tk.Button(tag_frame, text="+ Add Tag", bg="white", fg="black", font=("Helvetica", 9, "bold"),
-                                   command=lambda: [add_tag_dropdown(), add_btn.destroy()])
-                add_btn.pack(side="left", padx=(0, 5))
-                dropdown.add_tag_btn = add_btn
-            elif var.get() == "None" and hasattr(dropdown, 'add_tag_btn'):
-                dropdown.add_tag_btn.destroy()
-                delattr(dropdown, 'add_tag_btn')
-        dropdown.bind("<<ComboboxSelected>>", on_tag_change)
-        return add_tag_dropdown  # Return function for programmatic access
-    
-    def update_add_tag_buttons():
-        """Helper function to show/hide add tag buttons based on current tag values"""
-        # First, remove all existing add tag buttons
-        for dropdown in tag_dropdowns:
-            if hasattr(dropdown, 'add_tag_btn'):
-                dropdown.add_tag_btn.destroy()
-                delattr(dropdown, 'add_tag_btn')
-        
-        # Find the last dropdown with a non-"None" value
-        last_valid_index = -1
-        for i, var in enumerate(tag_vars):
-            if var and var.get() != "None":
-                last_valid_index = i
-        
-        # Only add the "Add Tag" button to the last dropdown with a valid tag
-        if last_valid_index >= 0 and last_valid_index < len(tag_dropdowns):
-            dropdown = tag_dropdowns[last_valid_index]
-            add_btn = tk.Button(tag_frame, text="+ Add Tag", bg="white", fg="black", font=("Helvetica", 9, "bold"),
-                               command=lambda: [add_tag_dropdown(), add_btn.destroy()])
-            add_btn.pack(side="left", padx=(0, 5))
-            dropdown.add_tag_btn = add_btn
-    
-    # Store the functions for later use during restoration
-    tag_frame.add_tag_dropdown = add_tag_dropdown
-    tag_frame.update_add_tag_buttons = update_add_tag_buttons
-    add_tag_dropdown()  # Add the first dropdown
-    mechanical_note_tags.append(tag_vars)
-    frame.pack(pady=5, fill="x")
+    if record is None:
+        record = report_model.add_note("mechanical", text=default_text)
+    box = show_note_box(mechanical_notes_frame, record, f"Mechanical Note #{len(mechanical_boxes)+1}:", tag_options=MECHANICAL_TAG_OPTIONS, tag_width=22)
+    mechanical_boxes.append(box.textbox)
+    mechanical_note_tags.append(box.tag_vars)
 
-def add_production_note_box(default_text=""):
+def add_production_note_box(default_text="", record=None):
     """Add a production note box with tagging (Memorial Union & Union South)"""
-    frame = tk.Frame(production_notes_frame, bg="black")
-    label = tk.Label(frame, text=f"Production Note #{len(production_boxes)+1}:", fg="white", bg="black", font=label_font)
-    textbox = tk.Text(frame, height=4, width=80, bg=entry_bg, fg=entry_fg, insertbackground="white", font=entry_font, wrap=tk.WORD)
-    if default_text:
-        textbox.insert("1.0", default_text)
-    label.pack(anchor="w")
-    textbox.pack(fill="both", expand=True, padx=5)
-    frame.pack(pady=5, fill="x")
-    configure_text_box(textbox)
-    production_boxes.append(textbox)
-    # Tagging
-    tag_vars = []
-    tag_dropdowns = []
-    tag_frame = tk.Frame(frame, bg="black")
-    tag_frame.pack(anchor="w", pady=(2, 0))
-    add_tagging_to_note(tag_frame, PRODUCTION_TAG_OPTIONS, tag_vars, tag_dropdowns)
-    production_note_tags.append(tag_vars)
-    frame.pack(pady=5, fill="x")
+    if record is None:
+        record = report_model.add_note("production", text=default_text)
+    box = show_note_box(production_notes_frame, record, f"Production Note #{len(production_boxes)+1}:", tag_options=PRODUCTION_TAG_OPTIONS)
+    production_boxes.append(box.textbox)
+    production_note_tags.append(box.tag_vars)
 
-def add_decibel_row():
+def add_decibel_row(record=None):
     """Add a decibel reading row (Memorial Union & Union South)"""
+    if record is None:
+        record = report_model.add_decibel_reading()
     row_frame = tk.Frame(decibel_rows_container, bg="black")
     time_entry = tk.Entry(row_frame, width=15, bg=entry_bg, fg=entry_fg, insertbackground="white", font=entry_font)
     reading_entry = tk.Entry(row_frame, width=15, bg=entry_bg, fg=entry_fg, insertbackground="white", font=entry_font)
     location_entry = tk.Entry(row_frame, width=40, bg=entry_bg, fg=entry_fg, insertbackground="white", font=entry_font)
 
-    time_entry.insert(0, "Time")
-    reading_entry.insert(0, "Reading (db)")
-    location_entry.insert(0, "Location")
+    time_entry.insert(0, record.time)
+    reading_entry.insert(0, record.reading)
+    location_entry.insert(0, record.location)
 
     # Add focus event handlers to select all text when clicked
     def on_focus_in(event):
@@ -598,168 +1375,97 @@ def add_decibel_row():
     row_frame.pack(pady=3, anchor="w", fill="x")
     
     decibel_entries.append((time_entry, reading_entry, location_entry))
+    for entry, field in ((time_entry, "time"), (reading_entry, "reading"), (location_entry, "location")):
+        bind_entry_to_model(entry, lambda value, field=field: report_model.update_note(record, field, value))
 
 def add_patron_note_box(default_text=""):
-    """Add a patron services note box with tagging (Memorial Union & Union South)"""
-    frame = tk.Frame(patron_notes_frame, bg="black")
-    label = tk.Label(frame, text=f"Patron Note #{len(patron_boxes)+1}:", fg="white", bg="black", font=label_font)
-    textbox = tk.Text(frame, height=6, width=80, bg=entry_bg, fg=entry_fg, insertbackground="white", font=entry_font, wrap=tk.WORD)
-    if default_text:
-        textbox.insert("1.0", default_text)
-    label.pack(anchor="w")
-    textbox.pack(fill="both", expand=True, padx=5)
-    configure_text_box(textbox, min_height=6)
-    patron_boxes.append(textbox)
-    # Tagging
-    tag_vars = []
-    tag_dropdowns = []
-    tag_frame = tk.Frame(frame, bg="black")
-    tag_frame.pack(anchor="w", pady=(2, 0))
-    add_tagging_to_note(tag_frame, PATRON_TAG_OPTIONS, tag_vars, tag_dropdowns)
-    patron_note_tags.append(tag_vars)
-    frame.pack(pady=5, fill="x")
+    """Add a patron services note with tagging (Memorial Union & Union South)"""
+    patron_note_list.scroll_to(report_model.add_note("patron", text=default_text))
 
-def add_access_note():
+def add_access_note(record=None):
     """Add an access note box with tagging (Memorial Union & Union South)"""
-    frame = tk.Frame(access_notes_container, bg="black")
-    label = tk.Label(frame, text=f"Access Note #{len(access_note_boxes)+1}:", fg="white", bg="black", font=label_font)
-    textbox = tk.Text(frame, height=3, width=80, bg=entry_bg, fg=entry_fg, insertbackground="white", font=entry_font, wrap=tk.WORD)
-    label.pack(anchor="w")
-    textbox.pack(fill="x", expand=True, padx=5)
-    frame.pack(pady=5, fill="x")
-    configure_text_box(textbox, min_height=3)
-    access_note_boxes.append(textbox)
-    # Tagging
-    tag_vars = []
-    tag_dropdowns = []
-    tag_frame = tk.Frame(frame, bg="black")
-    tag_frame.pack(anchor="w", pady=(2, 0))
-    add_tagging_to_note(tag_frame, ACCESS_TAG_OPTIONS, tag_vars, tag_dropdowns)
-    access_note_tags.append(tag_vars)
-    frame.pack(pady=5, fill="x")
-
-def add_cash_note_box(default_text=""):
+    if record is None:
+        record = report_model.add_note("access")
+    box = show_note_box(access_notes_container, record, f"Access Note #{len(access_note_boxes)+1}:",
+                        min_height=3, tag_options=ACCESS_TAG_OPTIONS)
+    access_note_boxes.append(box.textbox)
+    access_note_tags.append(box.tag_vars)
+
+def add_cash_note_box(default_text="", record=None):
     """Add a cash office note box with tagging (Memorial Union & Union South)"""
-    frame = tk.Frame(cash_frame, bg="black")
-    label = tk.Label(frame, text=f"Cash Office Note #{len(cash_boxes)+1}:", fg="white", bg="black", font=label_font)
-    textbox = tk.Text(frame, height=4, width=80, bg=entry_bg, fg=entry_fg, insertbackground="white", font=entry_font, wrap=tk.WORD)
-    if default_text:
-        textbox.insert("1.0", default_text)
-    label.pack(anchor="w")
-    textbox.pack(fill="both", expand=True, padx=5)
-    frame.pack(pady=5, fill="x")
-    configure_text_box(textbox)
-    cash_boxes.append(textbox)
-    # Tagging
-    tag_vars = []
-    tag_dropdowns = []
-    tag_frame = tk.Frame(frame, bg="black")
-    tag_frame.pack(anchor="w", pady=(2, 0))
-    add_tagging_to_note(tag_frame, CASH_TAG_OPTIONS, tag_vars, tag_dropdowns)
-    cash_note_tags.append(tag_vars)
-    frame.pack(pady=5, fill="x")
+    if record is None:
+        record = report_model.add_note("cash", text=default_text)
+    box = show_note_box(cash_frame, record, f"Cash Office Note #{len(cash_boxes)+1}:", tag_options=CASH_TAG_OPTIONS)
+    cash_boxes.append(box.textbox)
+    cash_note_tags.append(box.tag_vars)
 
-def add_dining_note_box(default_text=""):
+def add_dining_note_box(default_text="", record=None):
     """Add a dining note box with tagging (Memorial Union & Union South)"""
-    frame = tk.Frame(dining_frame, bg="black")
-    label = tk.Label(frame, text=f"Dining Note #{len(dining_boxes)+1}:", fg="white", bg="black", font=label_font)
-    textbox = tk.Text(frame, height=4, width=80, bg=entry_bg, fg=entry_fg, insertbackground="white", font=entry_font, wrap=tk.WORD)
-    if default_text:
-        textbox.insert("1.0", default_text)
-    label.pack(anchor="w")
-    textbox.pack(fill="both", expand=True, padx=5)
-    frame.pack(pady=5, fill="x")
-    configure_text_box(textbox)
-    dining_boxes.append(textbox)
-    # Tagging
-    tag_vars = []
-    tag_dropdowns = []
-    tag_frame = tk.Frame(frame, bg="black")
-    tag_frame.pack(anchor="w", pady=(2, 0))
-    add_tagging_to_note(tag_frame, DINING_TAG_OPTIONS, tag_vars, tag_dropdowns)
-    dining_note_tags.append(tag_vars)
-    frame.pack(pady=5, fill="x")
+    if record is None:
+        record = report_model.add_note("dining", text=default_text)
+    box = show_note_box(dining_frame, record, f"Dining Note #{len(dining_boxes)+1}:", tag_options=DINING_TAG_OPTIONS)
+    dining_boxes.append(box.textbox)
+    dining_note_tags.append(box.tag_vars)
 
-def add_hotel_note_box(default_text=""):
+def add_hotel_note_box(default_text="", record=None):
     """Add a hotel note box (Memorial Union & Union South)"""
-    frame = tk.Frame(hotel_frame, bg="black")
-    label = tk.Label(frame, text=f"Hotel Note #{len(hotel_boxes)+1}:", fg="white", bg="black", font=label_font)
-    textbox = tk.Text(frame, height=3, width=80, bg=entry_bg, fg=entry_fg, insertbackground="white", font=entry_font, wrap=tk.WORD)
-    if default_text:
-        textbox.insert("1.0", default_text)
-    label.pack(anchor="w")
-    textbox.pack(fill="both", expand=True, padx=5)
-    configure_text_box(textbox, min_height=3)
-    hotel_boxes.append(textbox)
-    frame.pack(pady=5, fill="x")
+    if record is None:
+        record = report_model.add_note("hotel", text=default_text)
+    box = show_note_box(hotel_frame, record, f"Hotel Note #{len(hotel_boxes)+1}:", min_height=3)
+    hotel_boxes.append(box.textbox)
 
-def add_misc_note_box(default_text=""):
+def add_misc_note_box(default_text="", record=None):
     """Add a miscellaneous note box (Memorial Union & Union South)"""
-    frame = tk.Frame(misc_frame, bg="black")
-    label = tk.Label(frame, text=f"Misc Note #{len(misc_boxes)+1}:", fg="white", bg="black", font=label_font)
-    textbox = tk.Text(frame, height=4, width=80, bg=entry_bg, fg=entry_fg, insertbackground="white", font=entry_font, wrap=tk.WORD)
-    if default_text:
-        textbox.insert("1.0", default_text)
-    label.pack(anchor="w")
-    textbox.pack(fill="both", expand=True, padx=5)
-    frame.pack(pady=5, fill="x")
-    configure_text_box(textbox)
-    misc_boxes.append(textbox)
-    frame.pack(pady=5, fill="x")
+    if record is None:
+        record = report_model.add_note("misc", text=default_text)
+    box = show_note_box(misc_frame, record, f"Misc Note #{len(misc_boxes)+1}:")
+    misc_boxes.append(box.textbox)
 
 # === Memorial Union Specific Functions ===
 
-def add_carding_note_box(default_text=""):
+def add_carding_note_box(default_text="", record=None):
     """Add a carding note box (Memorial Union only)"""
-    frame = tk.Frame(carding_frame, bg="black")
-    label = tk.Label(frame, text=f"Carding Run Note #{len(carding_boxes)+1}:", fg="white", bg="black", font=label_font)
-    textbox = tk.Text(frame, height=3, width=80, bg=entry_bg, fg=entry_fg, insertbackground="white", font=entry_font, wrap=tk.WORD)
-    if default_text:
-        textbox.insert("1.0", default_text)
-    label.pack(anchor="w")
-    textbox.pack(fill="both", expand=True, padx=5)
-    frame.pack(pady=5, fill="x")
-    configure_text_box(textbox, min_height=3)
-    carding_boxes.append(textbox)
+    if record is None:
+        record = report_model.add_note("carding", text=default_text)
+    box = show_note_box(carding_frame, record, f"Carding Run Note #{len(carding_boxes)+1}:", min_height=3)
+    carding_boxes.append(box.textbox)
 
 def add_terrace_note_box(default_text=""):
-    """Add a terrace traffic note box (Memorial Union only)"""
-    frame = tk.Frame(terrace_frame, bg="black")
-    label = tk.Label(frame, text=f"Terrace Traffic Note #{len(terrace_boxes)+1}:", fg="white", bg="black", font=label_font)
-    textbox = tk.Text(frame, height=4, width=80, bg=entry_bg, fg=entry_fg, insertbackground="white", font=entry_font, wrap=tk.WORD)
-    if default_text:
-        textbox.insert("1.0", default_text)
-    label.pack(anchor="w")
-    textbox.pack(fill="both", expand=True, padx=5)
-    frame.pack(pady=5, fill="x")
-    configure_text_box(textbox)
-    terrace_boxes.append(textbox)
+    """Add a terrace traffic note (Memorial Union only)"""
+    terrace_note_list.scroll_to(report_model.add_note("terrace", text=default_text))
 
-def add_enforcement_note_box(default_text=""):
+def add_enforcement_note_box(default_text="", record=None):
     """Add an enforcement text note box with tagging (Memorial Union only)"""
+    if record is None:
+        record = report_model.add_note("enforcement", text=default_text)
+    position = report_model.notes("enforcement").index(record)  # Widgets follow the model's order
     frame = tk.Frame(enforcement_frame, bg="black")
     label = tk.Label(frame, text=f"Enforcement Note #{len(enforcement_boxes)+1}:", fg="white", bg="black", font=label_font)
     textbox = tk.Text(frame, height=4, width=80, bg=entry_bg, fg=entry_fg, insertbackground="white", font=entry_font, wrap=tk.WORD)
-    if default_text:
-        textbox.insert("1.0", default_text)
+    if record.text:
+        textbox.insert("1.0", record.text)
     label.pack(anchor="w")
     textbox.pack(fill="both", expand=True, padx=5)
     configure_text_box(textbox)
-    enforcement_boxes.append(textbox)
+    enforcement_boxes.insert(position, textbox)
+    bind_note_text(textbox, record)
     # Tagging
     tag_vars = []
     tag_dropdowns = []
     tag_frame = tk.Frame(frame, bg="black")
     tag_frame.pack(anchor="w", pady=(2, 0))
-    add_tagging_to_note(tag_frame, TERRACE_TAG_OPTIONS, tag_vars, tag_dropdowns)
-    enforcement_note_tags.append(tag_vars)
+    add_tagging_to_note(tag_frame, TERRACE_TAG_OPTIONS, tag_vars, tag_dropdowns, record)
+    enforcement_note_tags.insert(position, tag_vars)
     # Add to components and reorder
-    enforcement_components.append(frame)
+    enforcement_components.insert(position, frame)
     reorder_enforcement_components()
 
-def add_enforcement_image():
+def add_enforcement_image(record=None):
     """Add an enforcement image with description and tagging (Memorial Union only).
     Returns dict with image info and pushes to enforcement_items global list."""
+    if record is None:
+        record = report_model.add_note("enforcement", index=0)  # New images sit first
+    position = report_model.notes("enforcement").index(record)  # Widgets follow the model's order
     image_frame = tk.Frame(enforcement_frame, bg="black")
     
     # Label for the image section
@@ -771,7 +1477,7 @@ def add_enforcement_image():
     upload_frame.pack(fill="x", pady=2)
     
     # Variable to store image path
-    image_path_var = tk.StringVar()
+    image_path_var = tk.StringVar(value=record.image_path)
     enforcement_images.insert(0, image_path_var)  # Insert at beginning
     
     # Status label
@@ -806,7 +1512,9 @@ def add_enforcement_image():
             status_label.config(text="No image selected", fg="gray")
     
     # Trace the variable to update status when set programmatically
-    image_path_var.trace_add("write", update_status_from_var)
+    trace_form_variable(image_path_var, update_status_from_var)
+    update_status_from_var()
+    bind_variable_to_model(image_path_var, lambda value: report_model.update_note(record, "image_path", value))
     
     upload_btn = tk.Button(upload_frame, text="Select Image", command=select_image,
                          bg="white", fg="black", font=("Helvetica", 9, "bold"))
@@ -817,20 +1525,23 @@ def add_enforcement_image():
     desc_label.pack(anchor="w", pady=(5, 0))
     
     textbox = tk.Text(image_frame, height=3, width=80, bg=entry_bg, fg=entry_fg, insertbackground="white", font=entry_font, wrap=tk.WORD)
+    if record.text:
+        textbox.insert("1.0", record.text)
     textbox.pack(fill="x", padx=5)
     configure_text_box(textbox, min_height=3)
-    enforcement_boxes.insert(0, textbox)  # Insert at beginning
+    enforcement_boxes.insert(position, textbox)
+    bind_note_text(textbox, record)
     
     # Tagging
     tag_vars = []
     tag_dropdowns = []
     tag_frame = tk.Frame(image_frame, bg="black")
     tag_frame.pack(anchor="w", pady=(2, 0))
-    add_tagging_to_note(tag_frame, TERRACE_TAG_OPTIONS, tag_vars, tag_dropdowns)
-    enforcement_note_tags.insert(0, tag_vars)  # Insert at beginning
+    add_tagging_to_note(tag_frame, TERRACE_TAG_OPTIONS, tag_vars, tag_dropdowns, record)
+    enforcement_note_tags.insert(position, tag_vars)
     
     # Pack the image frame and reorder all components
-    enforcement_components.insert(0, image_frame)
+    enforcement_components.insert(position, image_frame)
     reorder_enforcement_components()
     
     # Create and store the enforcement item dict
@@ -845,86 +1556,59 @@ def add_enforcement_image():
     
     return enforcement_item
 
-def add_alumni_note_box(default_text=""):
+def add_alumni_note_box(default_text="", record=None):
     """Add an alumni park note box with tagging (Memorial Union only)"""
-    frame = tk.Frame(alumni_frame, bg="black")
-    label = tk.Label(frame, text=f"Alumni Park Note #{len(alumni_boxes)+1}:", fg="white", bg="black", font=label_font)
-    textbox = tk.Text(frame, height=3, width=80, bg=entry_bg, fg=entry_fg, insertbackground="white", font=entry_font, wrap=tk.WORD)
-    if default_text:
-        textbox.insert("1.0", default_text)
-    label.pack(anchor="w")
-    textbox.pack(fill="both", expand=True, padx=5)
-    frame.pack(pady=5, fill="x")
-    configure_text_box(textbox, min_height=3)
-    alumni_boxes.append(textbox)
-    # Tagging
-    tag_vars = []
-    tag_dropdowns = []
-    tag_frame = tk.Frame(frame, bg="black")
-    tag_frame.pack(anchor="w", pady=(2, 0))
-    add_tagging_to_note(tag_frame, TERRACE_TAG_OPTIONS, tag_vars, tag_dropdowns)
-    alumni_note_tags.append(tag_vars)
-    frame.pack(pady=5, fill="x")
+    if record is None:
+        record = report_model.add_note("alumni", text=default_text)
+    box = show_note_box(alumni_frame, record, f"Alumni Park Note #{len(alumni_boxes)+1}:", min_height=3, tag_options=TERRACE_TAG_OPTIONS)
+    alumni_boxes.append(box.textbox)
+    alumni_note_tags.append(box.tag_vars)
 
-def add_pier_note_box(default_text=""):
+def add_pier_note_box(default_text="", record=None):
     """Add a pier note box with tagging (Memorial Union only)"""
-    frame = tk.Frame(pier_frame, bg="black")
-    label = tk.Label(frame, text=f"Pier Note #{len(pier_boxes)+1}:", fg="white", bg="black", font=label_font)
-    textbox = tk.Text(frame, height=3, width=80, bg=entry_bg, fg=entry_fg, insertbackground="white", font=entry_font, wrap=tk.WORD)
-    if default_text:
-        textbox.insert("1.0", default_text)
-    label.pack(anchor="w")
-    textbox.pack(fill="both", expand=True, padx=5)
-    frame.pack(pady=5, fill="x")
-    configure_text_box(textbox, min_height=3)
-    pier_boxes.append(textbox)
-    # Tagging
-    tag_vars = []
-    tag_dropdowns = []
-    tag_frame = tk.Frame(frame, bg="black")
-    tag_frame.pack(anchor="w", pady=(2, 0))
-    add_tagging_to_note(tag_frame, TERRACE_TAG_OPTIONS, tag_vars, tag_dropdowns)
-    pier_note_tags.append(tag_vars)
-    frame.pack(pady=5, fill="x")
+    if record is None:
+        record = report_model.add_note("pier", text=default_text)
+    box = show_note_box(pier_frame, record, f"Pier Note #{len(pier_boxes)+1}:", min_height=3, tag_options=TERRACE_TAG_OPTIONS)
+    pier_boxes.append(box.textbox)
+    pier_note_tags.append(box.tag_vars)
 
 # === Red Gym Specific Functions ===
 
-def add_red_gym_mail_box(default_text=""):
+def add_red_gym_mail_box(default_text="", record=None):
     """Add a mail note box (Red Gym only)"""
-    frame = tk.Frame(mail_frame, bg="black")
-    label = tk.Label(frame, text=f"Mail Note #{len(red_gym_mail_boxes)+1}:", fg="white", bg="black", font=label_font)
-    textbox = tk.Text(frame, height=3, width=80, bg=entry_bg, fg=entry_fg, insertbackground="white", font=entry_font, wrap=tk.WORD)
-    if default_text:
-        textbox.insert("1.0", default_text)
-    label.pack(anchor="w")
-    textbox.pack(fill="both", expand=True, padx=5)
-    frame.pack(pady=5, fill="x")
-    configure_text_box(textbox, min_height=3)
-    red_gym_mail_boxes.append(textbox)
+    if record is None:
+        record = report_model.add_note("red_gym_mail", text=default_text)
+    box = show_note_box(mail_frame, record, f"Mail Note #{len(red_gym_mail_boxes)+1}:", min_height=3)
+    red_gym_mail_boxes.append(box.textbox)
 
-def add_red_gym_misc_box(default_text=""):
+def add_red_gym_misc_box(default_text="", record=None):
     """Add a misc note box with tagging (Red Gym only)"""
-    frame = tk.Frame(misc_frame, bg="black")
-    label = tk.Label(frame, text=f"Misc Note #{len(red_gym_misc_boxes)+1}:", fg="white", bg="black", font=label_font)
-    textbox = tk.Text(frame, height=3, width=80, bg=entry_bg, fg=entry_fg, insertbackground="white", font=entry_font, wrap=tk.WORD)
-    if default_text:
-        textbox.insert("1.0", default_text)
-    label.pack(anchor="w")
-    textbox.pack(fill="both", expand=True, padx=5)
-    frame.pack(pady=5, fill="x")
-    configure_text_box(textbox, min_height=3)
-    red_gym_misc_boxes.append(textbox)
-    
-    # Tagging for Red Gym misc (with ability to add multiple tags)
-    tag_vars = []
-    tag_dropdowns = []
-    tag_frame = tk.Frame(frame, bg="black")
-    tag_frame.pack(anchor="w", pady=(2, 0))
-    
-    # Use the standard tagging function for consistency
-    add_tagging_to_note(tag_frame, RED_GYM_MISC_TAG_OPTIONS, tag_vars, tag_dropdowns)
-    misc_note_tags.append(tag_vars)
-    frame.pack(pady=5, fill="x")
+    if record is None:
+        record = report_model.add_note("red_gym_misc", text=default_text)
+    box = show_note_box(misc_frame, record, f"Misc Note #{len(red_gym_misc_boxes)+1}:", min_height=3, tag_options=RED_GYM_MISC_TAG_OPTIONS)
+    red_gym_misc_boxes.append(box.textbox)
+    misc_note_tags.append(box.tag_vars)
+
+# Handle main window close event - exit application properly
+def on_main_close():
+    # Show confirmation dialog
+    if report_model.is_dirty:
+        message = "Are you sure you want to close the Night Report Generator?\n\nYou have unsaved changes that will be lost."
+    else:
+        message = "Are you sure you want to close the Night Report Generator?"
+    waiting = share_spool.count()
+    if waiting:
+        message += (f"\n\n{waiting} saved item(s) haven't reached the M: drive yet. "
+                    "They are kept on this PC and copied the next time the app starts.")
+    response = messagebox.askyesno("Confirm Exit", message, icon='warning')
+    if response:  # User clicked "Yes"
+        edit_journal.discard()  # The user chose to drop any unsaved edits
+        stop_autosave()  # Stop any running autosave
+        root.quit()  # Exit the mainloop
+        root.destroy()  # Destroy the root window
+
+# Registered once: every protocol() call creates a new Tcl command
+root.protocol("WM_DELETE_WINDOW", on_main_close)
 
 # Function to configure tabs based on selected building
 def configure_tabs_for_building():
@@ -963,264 +1647,354 @@ def configure_tabs_for_building():
     else:  # Memorial Union
         tab_keys_to_create = [key for key in all_tab_keys if key not in exclude_for_memorial_union]
     
-    # Create tabs
-    tabs = {}
-    for key in tab_keys_to_create:
-        tab_title = key
-        if key == "Access":
-            tab_title = "Access/Lock/Unlock"
-        elif key == "Dining & Markets":
-            tab_title = "Dining Service & Markets"
-        elif key == "Goodspeed Pier":
-            tab_title = "Goodspeed Family Pier"
-            
-        tabs[key] = create_tab(tab_title)
+    # Same building: keep the tabs (and the note boxes pooled in them); the form is
+    # rebuilt below. Otherwise tear everything down so no stale widgets are left behind.
+    if list(tabs) != tab_keys_to_create:
+        teardown_form()
+        discard_note_box_pool()
+        for tab_id in notebook.tabs():
+            notebook.nametowidget(tab_id).destroy()
+        
+        # Create tabs
+        tabs = {}
+        for key in tab_keys_to_create:
+            tab_title = key
+            if key == "Access":
+                tab_title = "Access/Lock/Unlock"
+            elif key == "Dining & Markets":
+                tab_title = "Dining Service & Markets"
+            elif key == "Goodspeed Pier":
+                tab_title = "Goodspeed Family Pier"
+                
+            tabs[key] = create_tab(tab_title)
     
     # Continue with the rest of the UI setup
-    setup_ui_components()
+    with bulk_restore():
+        setup_ui_components()
+    report_model.mark_clean()  # A blank form has nothing worth autosaving yet
+    begin_edit_session()
     
     # Start autosave after UI is configured
-    start_autosave(interval_min=3)
-    
-    # Handle main window close event - exit application properly
-    def on_main_close():
-        # Show confirmation dialog
-        response = messagebox.askyesno(
-            "Confirm Exit", 
-            "Are you sure you want to close the Night Report Generator?\n\nAny unsaved changes will be lost.",
-            icon='warning'
-        )
-        if response:  # User clicked "Yes"
-            stop_autosave()  # Stop any running autosave
-            root.quit()  # Exit the mainloop
-            root.destroy()  # Destroy the root window
-    
-    root.protocol("WM_DELETE_WINDOW", on_main_close)
+    start_autosave(idle_seconds=20, interval_min=3)
     
     # Now show the main window
     root.deiconify()
 
 def setup_ui_components():
-    global traffic_notes_frame, mechanical_notes_frame, production_notes_frame, patron_notes_frame
-    global cash_frame, dining_frame, hotel_frame, misc_frame
-    global carding_frame, terrace_frame, enforcement_frame, alumni_frame, pier_frame
-    global mail_frame, access_notes_container, decibel_rows_container
+    """Start a blank report for the selected building and build its form"""
+    # Start a fresh model; the widgets register themselves with it as tabs are built
+    report_model.reset(building)
+    seed_form_defaults()
+    build_form_from_model()
+
+def seed_form_defaults():
+    """Give the model the values a blank form starts with.
+
+    Tabs are built lazily, so these can't come from the widgets: a draft saved before a
+    tab was opened must look the same as one saved after. Only missing values are filled."""
+    if "date" not in report_model.entries:
+        report_model.set_value("entries", "date", datetime.now().strftime("%A, %B %d, %Y"))
+    # Every note section starts with one empty note (access notes are optional)
+    for section in report_model.note_sections():
+        if section != "access" and not report_model.notes(section):
+            report_model.add_note(section)
     
-    # === Supervisor Info tab ===
-    today_str = datetime.now().strftime("%A, %B %d, %Y")
-    add_labeled_entry(tabs["Supervisor Info"], "Date", "date", default=today_str)
-    add_labeled_entry(tabs["Supervisor Info"], "Shift Hours", "shift_hours")
-    add_labeled_entry(tabs["Supervisor Info"], "Building Manager(s)", "bms")
+    if building == "Red Gym":
+        for key, value in (("red_gym_building_tours", ""), ("red_gym_deviations_count", "0"),
+                           ("red_gym_door_check_time", ""), ("red_gym_door_check_day_type", "")):
+            if key not in report_model.red_gym:
+                report_model.set_value("red_gym", key, value)
+        return
     
-    # Only add additional fields for Memorial Union and Union South
-    if building != "Red Gym":
-        # Terrace Manager(s) only for Memorial Union
-        if building == "Memorial Union":
-            add_labeled_entry(tabs["Supervisor Info"], "Terrace Manager(s)", "terrace_managers")
-        add_labeled_entry(tabs["Supervisor Info"], "Guest Service Specialist", "gss")
-        add_labeled_entry(tabs["Supervisor Info"], "Operation Manager(s)", "operation_managers")
-        add_labeled_entry(tabs["Supervisor Info"], "Custodial Supervisor(s)", "custodial")
-        add_labeled_entry(tabs["Supervisor Info"], "Production Supervisor(s)", "production")
-        add_labeled_entry(tabs["Supervisor Info"], "Retail & Dining Supervisor(s)", "retail")
-        add_labeled_entry(tabs["Supervisor Info"], "Catering Supervisor(s)", "catering")
-        add_labeled_entry(tabs["Supervisor Info"], "Event Manager(s)", "eventmanagers")
-        add_labeled_entry(tabs["Supervisor Info"], "CAVR Desk Staff", "cavr")
-    
-    # === Building Traffic Tab ===
-    # Create a container frame inside the tab to hold text boxes
-    traffic_tab = tabs["Building Traffic"]
-    traffic_notes_frame = tk.Frame(traffic_tab, bg="black")
-    traffic_notes_frame.pack(fill="both", expand=True, padx=10, pady=(10, 0))
+    if not report_model.notes("decibel"):
+        report_model.add_decibel_reading()
+    for label_text, key, options in access_field_specs():
+        if key not in report_model.access_inputs:
+            report_model.set_value("access_inputs", key, options[0] if options else "")
+    for shift in csc_shifts:
+        for field in ("requested", "present", "names"):
+            if field not in report_model.csc.get(shift, {}):
+                report_model.set_value("csc", shift, "", field=field)
 
-    # Add first required box (using promoted function)
-    add_building_traffic_box()
+def access_field_specs():
+    """(label, key, dropdown options or None for a text entry) for the Access tab"""
+    # Set default based on building type
+    if building == "Memorial Union":
+        door_options = ["Unsuccessfully", "Successfully"]
+    else:  # Union South and other buildings
+        door_options = ["Successfully", "Unsuccessfully"]
+    return [
+        ("Loading Dock Arm Gate at Early Check:", "early_gate", ["Open", "Closed"]),
+        ("Time of Early Check:", "early_time", None),
+        ("Loading Dock Arm Gate at Closing Check:", "close_gate", ["Open", "Closed"]),
+        ("Time of Closing Check:", "close_time", None),
+        ("HID Scanners Status at Close:", "hid_status", ["Locked", "Unlocked"]),
+        ("Overhead Door Secured:", "door_status", door_options),
+    ]
 
-    # Add the + Add Note button, stays at bottom
-    add_box_btn = tk.Button(
-        traffic_tab, text="+ Add Note", command=add_building_traffic_box,
-        bg="white", fg="black", font=("Helvetica", 10, "bold")
-    )
-    add_box_btn.pack(pady=10)
+# === Lazy Tab Construction ===
+# Only the visible tab is built up front. Every other tab is built the first time it is
+# selected, or in idle time shortly after the window appears. Saving, autosave and the
+# report all read report_model, so they work the same for tabs that were never opened.
 
-    # Red Gym specific tabs
+IDLE_TAB_BUILD_DELAY_MS = 50
+tab_builders = {}  # Tab widget path -> function that fills it in (tabs not built yet)
+idle_tab_build_scheduled = False
+button_frame = None
+
+def build_form_from_model():
+    """(Re)build the form from report_model: the visible tab now, the others lazily"""
+    global idle_tab_build_scheduled
+    teardown_form()
+    
     if building == "Red Gym":
-        # === Red Gym Security Tab ===
-        global red_gym_building_tours_box, red_gym_deviations_entry, red_gym_deviation_boxes
-        global red_gym_door_check_time, red_gym_door_check_day_type
-        
-        security_tab = tabs["Security"]
-        security_frame = tk.Frame(security_tab, bg="black")
-        security_frame.pack(fill="both", expand=True, padx=10, pady=10)
-        
-        # Building Tours
-        tours_label = tk.Label(security_frame, text="Building Tours:", fg="white", bg="black", font=label_font)
-        tours_label.pack(anchor="w")
-        red_gym_building_tours_box = tk.Text(security_frame, height=3, width=80, bg=entry_bg, fg=entry_fg, insertbackground="white", font=entry_font, wrap=tk.WORD)
-        red_gym_building_tours_box.pack(fill="x", padx=5, pady=(0, 10))
-        configure_text_box(red_gym_building_tours_box, min_height=3)
-        
-        # Deviations section
-        deviations_label = tk.Label(security_frame, text="Deviations from standard building locking protocol:", fg="white", bg="black", font=label_font)
-        deviations_label.pack(anchor="w", pady=(10, 0))
-        
-        deviations_frame = tk.Frame(security_frame, bg="black")
-        deviations_frame.pack(fill="x", pady=5)
-        
-        deviations_text_label = tk.Label(deviations_frame, text="There were", fg="white", bg="black", font=label_font)
-        deviations_text_label.pack(side="left")
-        
-        red_gym_deviations_entry = tk.Entry(deviations_frame, width=5, bg=entry_bg, fg=entry_fg, insertbackground="white", font=entry_font)
-        red_gym_deviations_entry.insert(0, "0")
-        red_gym_deviations_entry.pack(side="left", padx=(5, 5))
-        
-        deviations_text_label2 = tk.Label(deviations_frame, text="deviations from the standard building locking protocol today.", fg="white", bg="black", font=label_font)
-        deviations_text_label2.pack(side="left")
-        
-        # Container for deviation notes
-        deviations_notes_frame = tk.Frame(security_frame, bg="black")
-        deviations_notes_frame.pack(fill="x", pady=5)
-        
-        def update_deviation_notes():
-            # Clear existing notes
-            for widget in deviations_notes_frame.winfo_children():
-                widget.destroy()
-            red_gym_deviation_boxes.clear()
-            
-            try:
-                num_deviations = int(red_gym_deviations_entry.get() or "0")
-                if num_deviations > 0:
-                    for i in range(num_deviations):
-                        frame = tk.Frame(deviations_notes_frame, bg="black")
-                        label = tk.Label(frame, text=f"Deviation {chr(97+i)}:", fg="white", bg="black", font=label_font)
-                        textbox = tk.Text(frame, height=2, width=80, bg=entry_bg, fg=entry_fg, insertbackground="white", font=entry_font, wrap=tk.WORD)
-                        label.pack(anchor="w")
-                        textbox.pack(fill="x", padx=5)
-                        frame.pack(pady=2, fill="x")
-                        configure_text_box(textbox, min_height=2)
-                        red_gym_deviation_boxes.append(textbox)
-            except ValueError:
-                pass
-        
-        red_gym_deviations_entry.bind('<KeyRelease>', lambda e: update_deviation_notes())
-        
-        # Door check section
-        door_check_frame = tk.Frame(security_frame, bg="black")
-        door_check_frame.pack(fill="x", pady=(20, 5))
-        
-        door_check_label1 = tk.Label(door_check_frame, text="I checked to confirm that the Building Doors were locked and the door swipe scanner was red at", fg="white", bg="black", font=label_font)
-        door_check_label1.pack(side="left")
-        
-        red_gym_door_check_time = tk.Entry(door_check_frame, width=10, bg=entry_bg, fg=entry_fg, insertbackground="white", font=entry_font)
-        red_gym_door_check_time.pack(side="left", padx=(5, 5))
-        
-        door_check_label2 = tk.Label(door_check_frame, text="on a", fg="white", bg="black", font=label_font)
-        door_check_label2.pack(side="left")
-        
-        red_gym_door_check_day_type = ttk.Combobox(door_check_frame, values=["weekday", "weekend"], state="readonly", width=10)
-        red_gym_door_check_day_type.pack(side="left", padx=(5, 0))
-        
-        door_check_label3 = tk.Label(door_check_frame, text=".", fg="white", bg="black", font=label_font)
-        door_check_label3.pack(side="left")
-        
-        # === Red Gym Mail Tab ===
-        global red_gym_mail_boxes
-        mail_tab = tabs["Mail"]
-        mail_frame = tk.Frame(mail_tab, bg="black")
-        mail_frame.pack(fill="both", expand=True, padx=10, pady=(10, 0))
-        
-        # Use promoted function
-        add_red_gym_mail_box()
-        
-        tk.Button(
-            mail_tab, text="+ Add Note", command=add_red_gym_mail_box,
-            bg="white", fg="black", font=("Helvetica", 10, "bold")
-        ).pack(pady=10)
-        
-        # === Red Gym Misc Tab ===
-        global red_gym_misc_boxes
-        misc_tab = tabs["Misc"]
-        misc_frame = tk.Frame(misc_tab, bg="black")
-        misc_frame.pack(fill="both", expand=True, padx=10, pady=(10, 0))
-        
-        # Use promoted function
-        add_red_gym_misc_box()
-        
-        tk.Button(
-            misc_tab, text="+ Add Note", command=add_red_gym_misc_box,
-            bg="white", fg="black", font=("Helvetica", 10, "bold")
-        ).pack(pady=10)
-        
-        # === Generate Report Buttons ===
-        button_frame = tk.Frame(root, bg="black")
-        button_frame.pack(pady=10)
-        
-        save_btn = tk.Button(
-            button_frame, text="Save Report", command=save_report_draft,
-            bg="white", fg="black", font=("Helvetica", 12, "bold"), padx=10, pady=6,
-            relief="raised", activebackground="white", activeforeground="black"
-        )
-        save_btn.pack(side="left", padx=8)
-        
-        submit_btn = tk.Button(
-            button_frame, text="End Shift", command=end_shift_and_generate,
-            bg="white", fg="black", font=("Helvetica", 12, "bold"), padx=10, pady=6,
-            relief="raised", activebackground="white", activeforeground="black"
-        )
-        submit_btn.pack(side="left")
-        
-        return  # Exit early for Red Gym
+        builders = {
+            "Supervisor Info": build_supervisor_tab, "Building Traffic": build_traffic_tab,
+            "Security": build_red_gym_security_tab, "Mail": build_red_gym_mail_tab,
+            "Misc": build_red_gym_misc_tab
+        }
+    else:
+        builders = {
+            "Supervisor Info": build_supervisor_tab, "Building Traffic": build_traffic_tab,
+            "Mechanical": build_mechanical_tab, "Production": build_production_tab,
+            "Patron Services": build_patron_tab, "Access": build_access_tab,
+            "Cash Office": build_cash_tab, "Carding Runs": build_carding_tab,
+            "Terrace Traffic": build_terrace_tab, "Terrace Enforcement": build_enforcement_tab,
+            "Alumni Park": build_alumni_tab, "Goodspeed Pier": build_pier_tab,
+            "Dining & Markets": build_dining_tab, "Hotel": build_hotel_tab,
+            "Misc": build_misc_tab, "Security": build_csc_tab
+        }
+    tab_builders.clear()
+    for key, tab in tabs.items():
+        tab_builders[str(tab)] = builders[key]
     
-    # Continue with existing code for Memorial Union and Union South
-    # === Mechanical/Repairs/Custodial Tab ===
-    mechanical_notes_frame = tk.Frame(tabs["Mechanical"], bg="black")
-    mechanical_notes_frame.pack(fill="both", expand=True, padx=10, pady=(10, 0))
+    build_button_bar()
+    build_tab(notebook.select())
+    if not idle_tab_build_scheduled:
+        idle_tab_build_scheduled = True
+        root.after(IDLE_TAB_BUILD_DELAY_MS, build_tabs_in_idle_time)
+
+def build_tab(tab_id):
+    """Fill in a tab if it hasn't been built yet"""
+    builder = tab_builders.pop(str(tab_id), None)
+    if builder is not None:
+        with bulk_restore():
+            builder()
+
+def build_all_tabs():
+    while tab_builders:
+        build_tab(next(iter(tab_builders)))
+
+def build_tabs_in_idle_time():
+    """Build the remaining tabs one per step, letting user input through in between"""
+    global idle_tab_build_scheduled
+    if tab_builders:
+        build_tab(next(iter(tab_builders)))
+        root.after(IDLE_TAB_BUILD_DELAY_MS, build_tabs_in_idle_time)
+    else:
+        idle_tab_build_scheduled = False
+
+notebook.bind("<<NotebookTabChanged>>", lambda event: build_tab(notebook.select()), add="+")
+
+def build_button_bar():
+    """Save / End Shift buttons under the notebook (replaces any previous bar)"""
+    global button_frame
+    if button_frame is not None:
+        button_frame.destroy()
+    button_frame = tk.Frame(root, bg="black")
+    button_frame.pack(pady=10)
+    
+    save_btn = tk.Button(
+        button_frame, text="Save Report", command=save_report_draft,
+        bg="white", fg="black", font=("Helvetica", 12, "bold"), padx=10, pady=6,
+        relief="raised", activebackground="white", activeforeground="black"
+    )
+    save_btn.pack(side="left", padx=8)
+    
+    submit_btn = tk.Button(
+        button_frame, text="End Shift", command=end_shift_and_generate,
+        bg="white", fg="black", font=("Helvetica", 12, "bold"), padx=10, pady=6,
+        relief="raised", activebackground="white", activeforeground="black"
+    )
+    submit_btn.pack(side="left")
+    add_save_status_label(button_frame)
+    add_sync_status_label(button_frame)
+
+# === Supervisor Info tab ===
+def build_supervisor_tab():
+    supervisor_tab = tabs["Supervisor Info"]
+    add_labeled_entry(supervisor_tab, "Date", "date")
+    add_labeled_entry(supervisor_tab, "Shift Hours", "shift_hours")
+    add_labeled_entry(supervisor_tab, "Building Manager(s)", "bms")
+    
+    # Only add additional fields for Memorial Union and Union South
+    if building != "Red Gym":
+        # Terrace Manager(s) only for Memorial Union
+        if building == "Memorial Union":
+            add_labeled_entry(supervisor_tab, "Terrace Manager(s)", "terrace_managers")
+        add_labeled_entry(supervisor_tab, "Guest Service Specialist", "gss")
+        add_labeled_entry(supervisor_tab, "Operation Manager(s)", "operation_managers")
+        add_labeled_entry(supervisor_tab, "Custodial Supervisor(s)", "custodial")
+        add_labeled_entry(supervisor_tab, "Production Supervisor(s)", "production")
+        add_labeled_entry(supervisor_tab, "Retail & Dining Supervisor(s)", "retail")
+        add_labeled_entry(supervisor_tab, "Catering Supervisor(s)", "catering")
+        add_labeled_entry(supervisor_tab, "Event Manager(s)", "eventmanagers")
+        add_labeled_entry(supervisor_tab, "CAVR Desk Staff", "cavr")
+
+# === Building Traffic Tab ===
+def build_traffic_tab():
+    global traffic_notes_frame
+    # Create a container frame inside the tab to hold text boxes
+    traffic_tab = tabs["Building Traffic"]
+    traffic_notes_frame = tk.Frame(traffic_tab, bg="black")
+    traffic_notes_frame.pack(fill="both", expand=True, padx=10, pady=(10, 0))
+
+    # One box per note in the model (a blank form starts with one)
+    for record in report_model.notes("building_traffic"):
+        add_building_traffic_box(record=record)
 
-    def add_mechanical_box(default_text=""):
-        frame = tk.Frame(mechanical_notes_frame, bg="black")
-        label = tk.Label(frame, text=f"Mechanical Note #{len(mechanical_boxes)+1}:", fg="white", bg="black", font=label_font)
-        textbox = tk.Text(frame, height=4, width=80, bg=entry_bg, fg=entry_fg, insertbackground="white", font=entry_font, wrap=tk.WORD)
-        if default_text:
-            textbox.insert("1.0", default_text)
+    # Add the + Add Note button, stays at bottom
+    add_box_btn = tk.Button(
+        traffic_tab, text="+ Add Note", command=add_building_traffic_box,
+        bg="white", fg="black", font=("Helvetica", 10, "bold")
+    )
+    add_box_btn.pack(pady=10)
+
+# === Red Gym Security Tab ===
+def build_red_gym_security_tab():
+    global red_gym_building_tours_box, red_gym_deviations_entry
+    global red_gym_door_check_time, red_gym_door_check_day_type
+    
+    security_tab = tabs["Security"]
+    security_frame = tk.Frame(security_tab, bg="black")
+    security_frame.pack(fill="both", expand=True, padx=10, pady=10)
+    
+    # Building Tours
+    tours_label = tk.Label(security_frame, text="Building Tours:", fg="white", bg="black", font=label_font)
+    tours_label.pack(anchor="w")
+    red_gym_building_tours_box = tk.Text(security_frame, height=3, width=80, bg=entry_bg, fg=entry_fg, insertbackground="white", font=entry_font, wrap=tk.WORD)
+    red_gym_building_tours_box.insert("1.0", report_model.red_gym.get("red_gym_building_tours", ""))
+    red_gym_building_tours_box.pack(fill="x", padx=5, pady=(0, 10))
+    configure_text_box(red_gym_building_tours_box, min_height=3)
+    bind_text_to_model(red_gym_building_tours_box, "red_gym", "red_gym_building_tours")
+    
+    # Deviations section
+    deviations_label = tk.Label(security_frame, text="Deviations from standard building locking protocol:", fg="white", bg="black", font=label_font)
+    deviations_label.pack(anchor="w", pady=(10, 0))
+    
+    deviations_frame = tk.Frame(security_frame, bg="black")
+    deviations_frame.pack(fill="x", pady=5)
+    
+    deviations_text_label = tk.Label(deviations_frame, text="There were", fg="white", bg="black", font=label_font)
+    deviations_text_label.pack(side="left")
+    
+    red_gym_deviations_entry = tk.Entry(deviations_frame, width=5, bg=entry_bg, fg=entry_fg, insertbackground="white", font=entry_font)
+    red_gym_deviations_entry.insert(0, report_model.red_gym.get("red_gym_deviations_count", "0"))
+    red_gym_deviations_entry.pack(side="left", padx=(5, 5))
+    bind_entry_to_model(red_gym_deviations_entry, lambda value: report_model.set_value("red_gym", "red_gym_deviations_count", value))
+    
+    deviations_text_label2 = tk.Label(deviations_frame, text="deviations from the standard building locking protocol today.", fg="white", bg="black", font=label_font)
+    deviations_text_label2.pack(side="left")
+    
+    # Container for deviation notes
+    deviations_notes_frame = tk.Frame(security_frame, bg="black")
+    deviations_notes_frame.pack(fill="x", pady=5)
+    
+    def add_deviation_box(i, record):
+        frame = tk.Frame(deviations_notes_frame, bg="black")
+        label = tk.Label(frame, text=f"Deviation {chr(97+i)}:", fg="white", bg="black", font=label_font)
+        textbox = tk.Text(frame, height=2, width=80, bg=entry_bg, fg=entry_fg, insertbackground="white", font=entry_font, wrap=tk.WORD)
+        if record.text:
+            textbox.insert("1.0", record.text)
         label.pack(anchor="w")
-        textbox.pack(fill="both", expand=True, padx=5)
-        configure_text_box(textbox)
-        mechanical_boxes.append(textbox)
-
-        # Tagging logic
-        tag_vars = []  # List of tk.StringVar for this note
-        tag_dropdowns = []  # List of dropdown widgets for this note
-
-        tag_frame = tk.Frame(frame, bg="black")
-        tag_frame.pack(anchor="w", pady=(2, 0))
-
-        def add_tag_dropdown():
-            var = tk.StringVar(value="None")
-            dropdown = ttk.Combobox(tag_frame, textvariable=var, values=MECHANICAL_TAG_OPTIONS, state="readonly", width=22)
-            dropdown.pack(side="left", padx=(0, 5))
-            tag_vars.append(var)
-            tag_dropdowns.append(dropdown)
-
-            def on_tag_change(event=None):
-                # Show +Add Tag button if a valid tag is selected and no button exists
-                if var.get() != "None" and not hasattr(dropdown, 'add_tag_btn'):
-                    add_btn = tk.Button(tag_frame, text="+ Add Tag", bg="white", fg="black", font=("Helvetica", 9, "bold"),
-                                       command=lambda: [add_tag_dropdown(), add_btn.destroy()])
-                    add_btn.pack(side="left", padx=(0, 5))
-                    dropdown.add_tag_btn = add_btn
-                elif var.get() == "None" and hasattr(dropdown, 'add_tag_btn'):
-                    dropdown.add_tag_btn.destroy()
-                    delattr(dropdown, 'add_tag_btn')
-            dropdown.bind("<<ComboboxSelected>>", on_tag_change)
-            return add_tag_dropdown  # Return function for programmatic access
+        textbox.pack(fill="x", padx=5)
+        frame.pack(pady=2, fill="x")
+        configure_text_box(textbox, min_height=2)
+        red_gym_deviation_boxes.append(textbox)
+        bind_note_text(textbox, record)
+    
+    def update_deviation_notes():
+        # Clear existing notes
+        for widget in deviations_notes_frame.winfo_children():
+            widget.destroy()
+        red_gym_deviation_boxes.clear()
+        report_model.clear_section("red_gym_deviations")
         
-        # Store the add_tag_dropdown function for later use during restoration
-        tag_frame.add_tag_dropdown = add_tag_dropdown
-        add_tag_dropdown()  # Add the first dropdown
-        mechanical_note_tags.append(tag_vars)
-        frame.pack(pady=5, fill="x")
+        try:
+            num_deviations = int(red_gym_deviations_entry.get() or "0")
+            if num_deviations > 0:
+                for i in range(num_deviations):
+                    add_deviation_box(i, report_model.add_note("red_gym_deviations"))
+        except ValueError:
+            pass
+    
+    # Deviation notes already in the model (e.g. from a draft)
+    for i, record in enumerate(report_model.notes("red_gym_deviations")):
+        add_deviation_box(i, record)
+    
+    red_gym_deviations_entry.bind('<KeyRelease>', lambda e: update_deviation_notes())
+    
+    # Door check section
+    door_check_frame = tk.Frame(security_frame, bg="black")
+    door_check_frame.pack(fill="x", pady=(20, 5))
+    
+    door_check_label1 = tk.Label(door_check_frame, text="I checked to confirm that the Building Doors were locked and the door swipe scanner was red at", fg="white", bg="black", font=label_font)
+    door_check_label1.pack(side="left")
+    
+    red_gym_door_check_time = tk.Entry(door_check_frame, width=10, bg=entry_bg, fg=entry_fg, insertbackground="white", font=entry_font)
+    red_gym_door_check_time.insert(0, report_model.red_gym.get("red_gym_door_check_time", ""))
+    red_gym_door_check_time.pack(side="left", padx=(5, 5))
+    bind_entry_to_model(red_gym_door_check_time, lambda value: report_model.set_value("red_gym", "red_gym_door_check_time", value))
+    
+    door_check_label2 = tk.Label(door_check_frame, text="on a", fg="white", bg="black", font=label_font)
+    door_check_label2.pack(side="left")
+    
+    red_gym_door_check_day_type = ttk.Combobox(door_check_frame, values=["weekday", "weekend"], state="readonly", width=10)
+    red_gym_door_check_day_type.set(report_model.red_gym.get("red_gym_door_check_day_type", ""))
+    red_gym_door_check_day_type.pack(side="left", padx=(5, 0))
+    bind_entry_to_model(red_gym_door_check_day_type, lambda value: report_model.set_value("red_gym", "red_gym_door_check_day_type", value))
+    
+    door_check_label3 = tk.Label(door_check_frame, text=".", fg="white", bg="black", font=label_font)
+    door_check_label3.pack(side="left")
+
+# === Red Gym Mail Tab ===
+def build_red_gym_mail_tab():
+    global mail_frame
+    mail_tab = tabs["Mail"]
+    mail_frame = tk.Frame(mail_tab, bg="black")
+    mail_frame.pack(fill="both", expand=True, padx=10, pady=(10, 0))
+    
+    for record in report_model.notes("red_gym_mail"):
+        add_red_gym_mail_box(record=record)
+    
+    tk.Button(
+        mail_tab, text="+ Add Note", command=add_red_gym_mail_box,
+        bg="white", fg="black", font=("Helvetica", 10, "bold")
+    ).pack(pady=10)
+
+# === Red Gym Misc Tab ===
+def build_red_gym_misc_tab():
+    global misc_frame
+    misc_tab = tabs["Misc"]
+    misc_frame = tk.Frame(misc_tab, bg="black")
+    misc_frame.pack(fill="both", expand=True, padx=10, pady=(10, 0))
+    
+    for record in report_model.notes("red_gym_misc"):
+        add_red_gym_misc_box(record=record)
+    
+    tk.Button(
+        misc_tab, text="+ Add Note", command=add_red_gym_misc_box,
+        bg="white", fg="black", font=("Helvetica", 10, "bold")
+    ).pack(pady=10)
+
+# === Mechanical/Repairs/Custodial Tab ===
+def build_mechanical_tab():
+    global mechanical_notes_frame
+    mechanical_notes_frame = tk.Frame(tabs["Mechanical"], bg="black")
+    mechanical_notes_frame.pack(fill="both", expand=True, padx=10, pady=(10, 0))
 
-    # Add first required box
-    add_mechanical_box()
+    for record in report_model.notes("mechanical"):
+        add_mechanical_box(record=record)
 
     # Add Note button
     add_mechanical_btn = tk.Button(
@@ -1229,12 +2003,14 @@ def setup_ui_components():
     )
     add_mechanical_btn.pack(pady=10)
 
-    # === Production Services Tab ===
+# === Production Services Tab ===
+def build_production_tab():
+    global production_notes_frame, decibel_rows_container
     production_notes_frame = tk.Frame(tabs["Production"], bg="black")
     production_notes_frame.pack(fill="x", padx=10, pady=(10, 5))
 
-    # Use promoted function
-    add_production_note_box()
+    for record in report_model.notes("production"):
+        add_production_note_box(record=record)
 
     # Button to add more production notes
     add_note_btn = tk.Button(
@@ -1254,8 +2030,8 @@ def setup_ui_components():
     decibel_rows_container = tk.Frame(decibel_frame, bg="black")
     decibel_rows_container.pack(fill="x", expand=True)
 
-    # Use promoted function
-    add_decibel_row()
+    for record in report_model.notes("decibel"):
+        add_decibel_row(record=record)
 
     # Button to add more decibel rows - kept outside the container
     add_decibel_btn = tk.Button(
@@ -1264,12 +2040,12 @@ def setup_ui_components():
     )
     add_decibel_btn.pack(pady=10)
 
-    # === Patron Services Tab ===
-    patron_notes_frame = tk.Frame(tabs["Patron Services"], bg="black")
-    patron_notes_frame.pack(fill="both", expand=True, padx=10, pady=(10, 0))
-
-    # Use promoted function
-    add_patron_note_box()
+# === Patron Services Tab ===
+def build_patron_tab():
+    global patron_note_list
+    patron_note_list = VirtualNoteList(tabs["Patron Services"], "patron", "Patron Note",
+                                       tag_options=PATRON_TAG_OPTIONS, min_height=6)
+    patron_note_list.pack(fill="both", expand=True, padx=10, pady=(10, 0))
 
     # Add button to add more notes
     add_patron_btn = tk.Button(
@@ -1278,47 +2054,42 @@ def setup_ui_components():
     )
     add_patron_btn.pack(pady=10)
 
-    # === Access/Lock/Unlock Tab ===
-    global access_inputs, csc_shifts, csc_entries  # <-- This line ensures both are global
+# === Access/Lock/Unlock Tab ===
+def build_access_tab():
+    global access_inputs, access_notes_container
     access_tab = tabs["Access"]
     access_frame = tk.Frame(access_tab, bg="black")
     access_frame.pack(fill="both", expand=True, padx=10, pady=10)
     
     access_inputs = {}
-    access_note_boxes = []
 
     def add_dropdown(label_text, key, options):
         frame = tk.Frame(access_frame, bg="black")
         label = tk.Label(frame, text=label_text, fg="white", bg="black", font=label_font)
-        var = tk.StringVar(value=options[0])
+        var = tk.StringVar(value=report_model.access_inputs.get(key, options[0]))
         dropdown = ttk.Combobox(frame, textvariable=var, values=options, state="readonly", width=20)
         label.pack(anchor="w")
         dropdown.pack(fill="x")
         frame.pack(pady=5, fill="x")
         access_inputs[key] = var
+        bind_variable_to_model(var, lambda value: report_model.set_value("access_inputs", key, value))
 
     def add_entry(label_text, key):
         frame = tk.Frame(access_frame, bg="black")
         label = tk.Label(frame, text=label_text, fg="white", bg="black", font=label_font)
         entry = tk.Entry(frame, bg=entry_bg, fg=entry_fg, insertbackground="white", font=entry_font, width=30)
+        entry.insert(0, report_model.access_inputs.get(key, ""))
         label.pack(anchor="w")
         entry.pack(fill="x")
         frame.pack(pady=5, fill="x")
         access_inputs[key] = entry
+        bind_entry_to_model(entry, lambda value: report_model.set_value("access_inputs", key, value))
 
-    add_dropdown("Loading Dock Arm Gate at Early Check:", "early_gate", ["Open", "Closed"])
-    add_entry("Time of Early Check:", "early_time")
-
-    add_dropdown("Loading Dock Arm Gate at Closing Check:", "close_gate", ["Open", "Closed"])
-    add_entry("Time of Closing Check:", "close_time")
-
-    add_dropdown("HID Scanners Status at Close:", "hid_status", ["Locked", "Unlocked"])
-    
-    # Set default based on building type
-    if building == "Memorial Union":
-        add_dropdown("Overhead Door Secured:", "door_status", ["Unsuccessfully", "Successfully"])
-    else:  # Union South and other buildings
-        add_dropdown("Overhead Door Secured:", "door_status", ["Successfully", "Unsuccessfully"])
+    for label_text, key, options in access_field_specs():
+        if options:
+            add_dropdown(label_text, key, options)
+        else:
+            add_entry(label_text, key)
 
     # === Optional Access Notes ===
     access_notes_label = tk.Label(access_frame, text="Additional Access Notes (Optional):", fg="white", bg="black", font=label_font)
@@ -1327,6 +2098,9 @@ def setup_ui_components():
     access_notes_container = tk.Frame(access_frame, bg="black")
     access_notes_container.pack(fill="both", expand=True)
 
+    for record in report_model.notes("access"):
+        add_access_note(record=record)
+
     # Add Note button (using promoted function)
     add_note_btn = tk.Button(
         access_frame, text="+ Add Note", command=add_access_note,
@@ -1334,12 +2108,14 @@ def setup_ui_components():
     )
     add_note_btn.pack(pady=10)
 
-    # === Cash Office Tab ===
+# === Cash Office Tab ===
+def build_cash_tab():
+    global cash_frame
     cash_frame = tk.Frame(tabs["Cash Office"], bg="black")
     cash_frame.pack(fill="both", expand=True, padx=10, pady=(10, 0))
 
-    # Use promoted function
-    add_cash_note_box()
+    for record in report_model.notes("cash"):
+        add_cash_note_box(record=record)
 
     add_cash_btn = tk.Button(
         tabs["Cash Office"], text="+ Add Note", command=add_cash_note_box,
@@ -1347,120 +2123,135 @@ def setup_ui_components():
     )
     add_cash_btn.pack(pady=10)
 
-    # Create the Memorial Union-specific tabs only if the selected building is Memorial Union
-    if building == "Memorial Union":
-        # === Carding Runs Tab ===
-        carding_frame = tk.Frame(tabs["Carding Runs"], bg="black")
-        carding_frame.pack(fill="both", expand=True, padx=10, pady=(10, 0))
-
-        # Use promoted function
-        add_carding_note_box()
+# === Carding Runs Tab (Memorial Union only) ===
+def build_carding_tab():
+    global carding_frame
+    carding_frame = tk.Frame(tabs["Carding Runs"], bg="black")
+    carding_frame.pack(fill="both", expand=True, padx=10, pady=(10, 0))
 
-        # Add note button
-        add_carding_btn = tk.Button(
-            tabs["Carding Runs"], text="+ Add Note", command=add_carding_note_box,
-            bg="white", fg="black", font=("Helvetica", 10, "bold")
-        )
-        add_carding_btn.pack(pady=10)
+    for record in report_model.notes("carding"):
+        add_carding_note_box(record=record)
 
-        # === Terrace Traffic Tab ===
-        terrace_frame = tk.Frame(tabs["Terrace Traffic"], bg="black")
-        terrace_frame.pack(fill="both", expand=True, padx=10, pady=(10, 0))
+    # Add note button
+    add_carding_btn = tk.Button(
+        tabs["Carding Runs"], text="+ Add Note", command=add_carding_note_box,
+        bg="white", fg="black", font=("Helvetica", 10, "bold")
+    )
+    add_carding_btn.pack(pady=10)
 
-        # Use promoted function
-        add_terrace_note_box()
+# === Terrace Traffic Tab (Memorial Union only) ===
+def build_terrace_tab():
+    global terrace_note_list
+    terrace_note_list = VirtualNoteList(tabs["Terrace Traffic"], "terrace", "Terrace Traffic Note")
+    terrace_note_list.pack(fill="both", expand=True, padx=10, pady=(10, 0))
 
-        add_terrace_btn = tk.Button(
-            tabs["Terrace Traffic"], text="+ Add Note", command=add_terrace_note_box,
-            bg="white", fg="black", font=("Helvetica", 10, "bold")
-        )
-        add_terrace_btn.pack(pady=10)
+    add_terrace_btn = tk.Button(
+        tabs["Terrace Traffic"], text="+ Add Note", command=add_terrace_note_box,
+        bg="white", fg="black", font=("Helvetica", 10, "bold")
+    )
+    add_terrace_btn.pack(pady=10)
 
-        # === Terrace Enforcement Tab ===
-        enforcement_frame = tk.Frame(tabs["Terrace Enforcement"], bg="black")
-        enforcement_frame.pack(fill="both", expand=True, padx=10, pady=(10, 0))
+# === Terrace Enforcement Tab (Memorial Union only) ===
+def build_enforcement_tab():
+    global enforcement_frame
+    enforcement_frame = tk.Frame(tabs["Terrace Enforcement"], bg="black")
+    enforcement_frame.pack(fill="both", expand=True, padx=10, pady=(10, 0))
 
-        # Use promoted functions
-        # Button to add enforcement image with description
-        add_image_btn = tk.Button(
-            enforcement_frame, text="+ Add Enforcement Image", command=add_enforcement_image,
-            bg="white", fg="black", font=("Helvetica", 10, "bold")
-        )
-        add_image_btn.pack(pady=5)
+    # Button to add enforcement image with description
+    add_image_btn = tk.Button(
+        enforcement_frame, text="+ Add Enforcement Image", command=add_enforcement_image,
+        bg="white", fg="black", font=("Helvetica", 10, "bold")
+    )
+    add_image_btn.pack(pady=5)
 
-        add_enforcement_note_box()
+    # Notes with an image path get the image layout (missing files still show their name)
+    for record in report_model.notes("enforcement"):
+        if record.image_path:
+            add_enforcement_image(record=record)
+        else:
+            add_enforcement_note_box(record=record)
 
-        add_enforcement_btn = tk.Button(
-            tabs["Terrace Enforcement"], text="+ Add Note", command=add_enforcement_note_box,
-            bg="white", fg="black", font=("Helvetica", 10, "bold")
-        )
-        add_enforcement_btn.pack(pady=10)
+    add_enforcement_btn = tk.Button(
+        tabs["Terrace Enforcement"], text="+ Add Note", command=add_enforcement_note_box,
+        bg="white", fg="black", font=("Helvetica", 10, "bold")
+    )
+    add_enforcement_btn.pack(pady=10)
 
-        # === Alumni Park Tab ===
-        alumni_frame = tk.Frame(tabs["Alumni Park"], bg="black")
-        alumni_frame.pack(fill="both", expand=True, padx=10, pady=(10, 0))
+# === Alumni Park Tab (Memorial Union only) ===
+def build_alumni_tab():
+    global alumni_frame
+    alumni_frame = tk.Frame(tabs["Alumni Park"], bg="black")
+    alumni_frame.pack(fill="both", expand=True, padx=10, pady=(10, 0))
 
-        # Use promoted function
-        add_alumni_note_box()
+    for record in report_model.notes("alumni"):
+        add_alumni_note_box(record=record)
 
-        tk.Button(
-            tabs["Alumni Park"], text="+ Add Note", command=add_alumni_note_box,
-            bg="white", fg="black", font=("Helvetica", 10, "bold")
-        ).pack(pady=10)
+    tk.Button(
+        tabs["Alumni Park"], text="+ Add Note", command=add_alumni_note_box,
+        bg="white", fg="black", font=("Helvetica", 10, "bold")
+    ).pack(pady=10)
 
-        # === Goodspeed Pier Tab ===
-        pier_frame = tk.Frame(tabs["Goodspeed Pier"], bg="black")
-        pier_frame.pack(fill="both", expand=True, padx=10, pady=(10, 0))
+# === Goodspeed Pier Tab (Memorial Union only) ===
+def build_pier_tab():
+    global pier_frame
+    pier_frame = tk.Frame(tabs["Goodspeed Pier"], bg="black")
+    pier_frame.pack(fill="both", expand=True, padx=10, pady=(10, 0))
 
-        # Use promoted function
-        add_pier_note_box()
+    for record in report_model.notes("pier"):
+        add_pier_note_box(record=record)
 
-        tk.Button(
-            tabs["Goodspeed Pier"], text="+ Add Note", command=add_pier_note_box,
-            bg="white", fg="black", font=("Helvetica", 10, "bold")
-        ).pack(pady=10)
+    tk.Button(
+        tabs["Goodspeed Pier"], text="+ Add Note", command=add_pier_note_box,
+        bg="white", fg="black", font=("Helvetica", 10, "bold")
+    ).pack(pady=10)
 
-    # === Dining & Markets Tab ===
+# === Dining & Markets Tab ===
+def build_dining_tab():
+    global dining_frame
     dining_frame = tk.Frame(tabs["Dining & Markets"], bg="black")
     dining_frame.pack(fill="both", expand=True, padx=10, pady=(10, 0))
 
-    # Use promoted function
-    add_dining_note_box()
+    for record in report_model.notes("dining"):
+        add_dining_note_box(record=record)
 
     tk.Button(
         tabs["Dining & Markets"], text="+ Add Note", command=add_dining_note_box,
         bg="white", fg="black", font=("Helvetica", 10, "bold")
     ).pack(pady=10)
 
-    # === Hotel Tab ===
+# === Hotel Tab ===
+def build_hotel_tab():
+    global hotel_frame
     hotel_frame = tk.Frame(tabs["Hotel"], bg="black")
     hotel_frame.pack(fill="both", expand=True, padx=10, pady=(10, 0))
 
-    # Use promoted function
-    add_hotel_note_box()
+    for record in report_model.notes("hotel"):
+        add_hotel_note_box(record=record)
     tk.Button(
         tabs["Hotel"], text="+ Add Note", command=add_hotel_note_box,
         bg="white", fg="black", font=("Helvetica", 10, "bold")
     ).pack(pady=10)
 
-    # === Miscellaneous Tab ===
+# === Miscellaneous Tab ===
+def build_misc_tab():
+    global misc_frame
     misc_frame = tk.Frame(tabs["Misc"], bg="black")
     misc_frame.pack(fill="both", expand=True, padx=10, pady=(10, 0))
 
-    # Use promoted function
-    add_misc_note_box()
+    for record in report_model.notes("misc"):
+        add_misc_note_box(record=record)
 
     tk.Button(
         tabs["Misc"], text="+ Add Note", command=add_misc_note_box,
         bg="white", fg="black", font=("Helvetica", 10, "bold")
     ).pack(pady=10)
 
-    # === Security Tab === (Changed from CSC Log)
+# === Security Tab === (Changed from CSC Log)
+def build_csc_tab():
     csc_tab = tabs["Security"]  # Changed from "CSC Log"
     csc_frame = tk.Frame(csc_tab, bg="black")
     csc_frame.pack(fill="both", expand=True, padx=10, pady=(10, 0))
 
-    # Remove the local csc_entries and csc_shifts declarations since they're now global
     for shift in csc_shifts:
         section = tk.LabelFrame(csc_frame, text=shift, fg="white", bg="black", font=label_font, labelanchor="n", padx=10, pady=10)
         section.pack(fill="x", pady=5)
@@ -1488,26 +2279,88 @@ def setup_ui_components():
             "present": pres_entry,
             "names": names_entry
         }
-
-    # === Generate Report Buttons ===
-    button_frame = tk.Frame(root, bg="black")
-    button_frame.pack(pady=10)
-    
-    save_btn = tk.Button(
-        button_frame, text="Save Report", command=save_report_draft,
-        bg="white", fg="black", font=("Helvetica", 12, "bold"), padx=10, pady=6,
-        relief="raised", activebackground="white", activeforeground="black"
-    )
-    save_btn.pack(side="left", padx=8)
-    
-    submit_btn = tk.Button(
-        button_frame, text="End Shift", command=end_shift_and_generate,
-        bg="white", fg="black", font=("Helvetica", 12, "bold"), padx=10, pady=6,
-        relief="raised", activebackground="white", activeforeground="black"
-    )
-    submit_btn.pack(side="left")
+        for field, entry in csc_entries[shift].items():
+            entry.insert(0, report_model.csc.get(shift, {}).get(field, ""))
+            bind_entry_to_model(entry, lambda value, shift=shift, field=field: report_model.set_value("csc", shift, value, field=field))
 
 # === Load Draft Functions ===
+def choose_draft(initial_dir):
+    """Let the user pick a recent draft from the local index, or browse for a file.
+    Returns (file_path, data); data is None when the file still needs to be read,
+    and both are None if the user cancelled."""
+    try:
+        recent = recent_indexed_drafts()
+    except Exception as e:
+        print(f"Warning: Draft index unavailable: {e}")
+        recent = []
+
+    def browse():
+        return filedialog.askopenfilename(
+            title="Select Draft Report to Load",
+            filetypes=[
+                ("JSON files", "*.json"),
+                ("All files", "*.*")
+            ],
+            initialdir=initial_dir
+        ), None
+
+    if not recent:
+        return browse()
+
+    result = {"choice": (None, None)}
+    picker = tk.Toplevel(root)
+    picker.title("Open Recent Draft")
+    picker.configure(bg="black")
+    picker.transient(root)
+    picker.grab_set()
+
+    tk.Label(picker, text="Recent Drafts", font=("Helvetica", 14, "bold"),
+             fg="white", bg="black").pack(padx=20, pady=(15, 5))
+
+    list_frame = tk.Frame(picker, bg="black")
+    list_frame.pack(fill="both", expand=True, padx=20, pady=5)
+    scrollbar = tk.Scrollbar(list_frame)
+    scrollbar.pack(side="right", fill="y")
+    listbox = tk.Listbox(list_frame, width=90, height=min(len(recent), 15),
+                         font=("Courier", 10), yscrollcommand=scrollbar.set)
+    listbox.pack(side="left", fill="both", expand=True)
+    scrollbar.config(command=listbox.yview)
+
+    for _, (draft_id, building_name, report_date, saved_at, kind, path, author) in recent:
+        short_name = BUILDING_SHORT_NAMES.get(building_name, building_name)
+        listbox.insert(tk.END, f"{short_name:<3} {report_date or '(no date)':<11} saved {saved_at.replace('T', ' ')[:16]}  {kind:<8} {author}")
+    listbox.selection_set(0)
+
+    def open_selected(event=None):
+        selection = listbox.curselection()
+        if not selection:
+            return
+        store, row = recent[selection[0]]
+        try:
+            data = store.load(row[0])
+        except (sqlite3.Error, ValueError) as e:
+            messagebox.showerror("Load Error", f"Could not read draft from the local index: {e}", parent=picker)
+            return
+        result["choice"] = (row[5], data)
+        picker.destroy()
+
+    def browse_files():
+        picker.destroy()
+        result["choice"] = browse()
+
+    listbox.bind("<Double-Button-1>", open_selected)
+    listbox.bind("<Return>", open_selected)
+
+    button_row = tk.Frame(picker, bg="black")
+    button_row.pack(pady=(5, 15))
+    tk.Button(button_row, text="Open", width=12, command=open_selected).pack(side="left", padx=5)
+    tk.Button(button_row, text="Browse Files...", width=14, command=browse_files).pack(side="left", padx=5)
+    tk.Button(button_row, text="Cancel", width=12, command=picker.destroy).pack(side="left", padx=5)
+
+    listbox.focus_set()
+    root.wait_window(picker)
+    return result["choice"]
+
 def load_draft_report():
     """Load a draft report from JSON file and restore the UI state"""
     # Declare global variables at the start
@@ -1516,13 +2369,13 @@ def load_draft_report():
     try:
         # Determine initial directory based on existing entries
         initial_dir = None
-        if "date" in entries and entries["date"].get():
+        if report_model.entries.get("date"):
             try:
-                user_date = entries["date"].get()
+                user_date = report_model.entries.get("date", "")
                 parsed_date = datetime.strptime(user_date, "%A, %B %d, %Y")
                 current_year = parsed_date.strftime("%Y")
                 current_month = parsed_date.strftime("%B")
-                initial_dir = f"M:\\Sh_BM\\{building}\\Night Reports\\{current_year}\\{current_month}\\drafts"
+                initial_dir = os.path.join(share_storage.reports_dir(building), current_year, current_month, "drafts")
             except:
                 # Fall back to desktop if date parsing fails
                 initial_dir = os.path.expanduser("~/Desktop")
@@ -1530,22 +2383,17 @@ def load_draft_report():
             # Default to desktop if no date entry
             initial_dir = os.path.expanduser("~/Desktop")
         
-        # Get the file path from user
-        file_path = filedialog.askopenfilename(
-            title="Select Draft Report to Load",
-            filetypes=[
-                ("JSON files", "*.json"),
-                ("All files", "*.*")
-            ],
-            initialdir=initial_dir
-        )
+        # Pick a recent draft from the local index, or browse for one
+        file_path, data = choose_draft(initial_dir)
         
-        if not file_path:
+        if not file_path and data is None:
             return  # User cancelled
         
         # Load and validate the JSON data
-        with open(file_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        perf = perf_log.start("load")
+        if data is None:
+            with perf.phase("read_file"), open(file_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
         
         # Validate the data structure with backward compatibility
         if not isinstance(data, dict):
@@ -1570,16 +2418,14 @@ def load_draft_report():
         building = data["building"]
         loaded_from_draft = True
         
-        # Clear existing tabs if they exist
-        if notebook.tabs():
-            for tab_id in notebook.tabs():
-                notebook.forget(tab_id)
-        
-        # Configure tabs for the loaded building
-        configure_tabs_for_building()
+        # Configure tabs for the loaded building (this also tears down the old tabs)
+        with perf.phase("build_tabs"):
+            configure_tabs_for_building()
         
         # Populate the form with the loaded data
-        populate_form_from_data(data)
+        with perf.phase("populate"):
+            populate_form_from_data(data)
+        show_perf_summary(perf.finish(path=file_path))
         
         # Show success message
         messagebox.showinfo("Success", "Report loaded successfully!")
@@ -1599,1976 +2445,2515 @@ def load_draft_report():
             pass
         messagebox.showerror("Load Error", str(e))
 
+# === Bulk Restore ===
+# Restoring a busy night creates dozens of note frames. Packing each one normally makes
+# the window recompute its size and every text box schedule its own height update, so
+# the form visibly reflows for seconds. In bulk mode geometry propagation is switched
+# off while the widgets are built; the layout and text box heights are then done once.
+
+BULK_RESTORE_ENABLED = True
+bulk_restore_boxes = None  # Text boxes waiting for their height pass (dict used as an ordered set)
+
+@contextmanager
+def bulk_restore():
+    """Build many widgets with layout suspended; safe to nest"""
+    global bulk_restore_boxes
+    if not BULK_RESTORE_ENABLED or bulk_restore_boxes is not None:
+        yield
+        return
+    containers = [root] + list(tabs.values())
+    for container in containers:
+        container.pack_propagate(False)
+        container.grid_propagate(False)
+    bulk_restore_boxes = {}
+    try:
+        yield
+    finally:
+        boxes, bulk_restore_boxes = bulk_restore_boxes, None
+        for container in containers:
+            if container.winfo_exists():
+                container.pack_propagate(True)
+                container.grid_propagate(True)
+        root.update_idletasks()  # One layout for everything that was built
+        for textbox in boxes:
+            if textbox.winfo_exists():
+                textbox.update_height()
+
 def populate_form_from_data(data):
-    """Populate the form fields with data from a loaded draft"""
+    """Load a draft into the model and rebuild the form from it"""
     try:
-        # Clear existing data first
-        clear_all_form_data()
-        
-        # Restore entries
-        if "entries" in data:
-            entries_data = data.get("entries", {})
-            for key, value in entries_data.items():
-                if key in entries and hasattr(entries[key], 'delete') and hasattr(entries[key], 'insert'):
-                    entries[key].delete(0, tk.END)
-                    entries[key].insert(0, str(value))
-                    # RULE: Leave everything editable
-                    try:
-                        entries[key].config(state="normal")
-                    except:
-                        pass
+        # The widgets are built from the model, so loading the model restores the form
+        report_model.load_draft(data)
+        seed_form_defaults()  # Older drafts may lack sections or fields
+        report_model.mark_clean()
+        with bulk_restore():
+            build_form_from_model()
         
-        # Restore building traffic notes
-        if "notes" in data and "building_traffic" in data["notes"]:
-            restore_note_section(
-                data["notes"]["building_traffic"], 
-                building_traffic_boxes,
-                add_building_traffic_box
-            )
+        # The form now matches the draft on disk
+        begin_edit_session()
         
-        # Building-specific data restoration
-        if building == "Red Gym":
-            restore_red_gym_data(data)
-        else:
-            restore_union_data(data)
-            
     except Exception as e:
         messagebox.showerror("Error", f"Failed to populate form: {str(e)}")
 
-def clear_all_form_data():
-    """Clear all form data to prepare for loading a draft"""
-    # Clear entries
-    for entry in entries.values():
-        if hasattr(entry, 'delete'):
-            entry.delete(0, tk.END)
-    
-    # Clear building traffic boxes
-    clear_note_boxes(building_traffic_boxes)
-    
-    if building == "Red Gym":
-        clear_red_gym_data()
-    else:
-        clear_union_data()
-
-def clear_note_boxes(note_boxes):
-    """Helper to clear a list of text boxes"""
-    for box in note_boxes:
-        if hasattr(box, 'delete'):
-            box.delete("1.0", tk.END)
-            # RULE: Leave everything editable
+# === Background Draft Writer ===
+# Drafts are written by a worker thread so encoding a large form never freezes it.
+# The Tk thread only takes the snapshot; the writer serializes it into the offline
+# spool (which copies it to the share), then reports back through draft_results,
+# which poll_draft_results drains on the main loop.
+
+class DraftWriteJob:
+    """A snapshot waiting to be written to the drafts folder"""
+    __slots__ = ("drafts_dir", "filename", "data", "revision", "saved_at", "silent", "journal_seq", "perf")
+
+    def __init__(self, drafts_dir, filename, data, revision, saved_at, silent, journal_seq=0, perf=None):
+        self.drafts_dir = drafts_dir
+        self.filename = filename
+        self.data = data
+        self.revision = revision
+        self.saved_at = saved_at
+        self.silent = silent
+        self.journal_seq = journal_seq
+        self.perf = perf or perf_log.start("autosave" if silent else "save")
+
+    @property
+    def path(self):
+        return os.path.join(self.drafts_dir, self.filename)
+
+def write_json_atomic(path, data):
+    """Write JSON to path so readers only ever see the old or the complete new file"""
+    write_text_atomic(path, json.dumps(data, indent=2, ensure_ascii=False))
+
+def write_text_atomic(path, text):
+    write_bytes_atomic(path, text.encode("utf-8"))
+
+def write_bytes_atomic(path, data):
+    tmp_path = f"{path}.tmp"  # Doesn't end in .json, so it is never picked up as a draft
+    try:
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+class DraftWriter:
+    """Single background thread that writes draft jobs in order"""
+
+    def __init__(self, results):
+        self.results = results
+        self.jobs = queue.Queue()
+        self.thread = None
+        self.pending = 0
+        self.idle = threading.Condition()
+
+    def submit(self, job):
+        if self.thread is None or not self.thread.is_alive():
+            self.thread = threading.Thread(target=self._run, name="draft-writer", daemon=True)
+            self.thread.start()
+        with self.idle:
+            self.pending += 1
+        self.jobs.put(job)
+
+    def wait_until_idle(self, timeout=None):
+        """Block until every submitted job has finished (used before deleting drafts)"""
+        with self.idle:
+            return self.idle.wait_for(lambda: self.pending == 0, timeout)
+
+    def _run(self):
+        while True:
+            job = self.jobs.get()
             try:
-                box.config(state="normal")
-            except:
-                pass
-
-def restore_note_section(note_data, note_boxes, add_function):
-    """Helper to restore a section of notes with their text content"""
-    if not note_data:
-        return
+                with job.perf.phase("json_encode"):
+                    text = json.dumps(job.data, indent=2, ensure_ascii=False)
+                with job.perf.phase("spool_write"):
+                    share_spool.add_text(job.path, text)
+                    if job.silent:
+                        # Old autosaves go once the new one has reached the share
+                        share_spool.prune_autosaves(job.drafts_dir, job.filename)
+                with job.perf.phase("draft_index"):
+                    self._index(job)
+                self.results.put((job, None))
+            except Exception as e:
+                self.results.put((job, e))
+            finally:
+                with self.idle:
+                    self.pending -= 1
+                    self.idle.notify_all()
+
+    def _index(self, job):
+        """Record the draft in the local index used by the recent-draft picker"""
+        if not DRAFT_INDEX_ENABLED:
+            return
+        try:
+            get_draft_store(job.data.get("building", "")).add(
+                job.data, "autosave" if job.silent else "manual", job.path, job.saved_at)
+        except sqlite3.Error as e:
+            print(f"Warning: Could not index draft: {e}")
+
+draft_results = queue.Queue()
+draft_writer = DraftWriter(draft_results)
+draft_results_polling = False
+
+def get_drafts_dir():
+    """Return the drafts folder for the report date currently on the form"""
+    user_date = report_model.entries.get("date", "")
+    parsed_date = datetime.strptime(user_date, "%A, %B %d, %Y")
+    current_year = parsed_date.strftime("%Y")
+    current_month = parsed_date.strftime("%B")
     
-    # ENHANCED: Handle type mismatches - convert string to array if needed
-    if isinstance(note_data, str):
-        note_data = [note_data]  # Convert single string to array
-    elif not isinstance(note_data, list):
-        note_data = [str(note_data)]  # Convert other types to string array
-    
-    # RULE: Never assume counts - dynamically add rows/boxes to match JSON
-    # Ensure we have enough boxes to match the data
-    while len(note_boxes) < len(note_data):
-        add_function("")
-    
-    # RULE: Leave everything editable (state="normal")
-    # Set content for each note box
-    for i, note_text in enumerate(note_data):
-        if i < len(note_boxes):
-            # Clear and populate the text box
-            note_boxes[i].delete("1.0", tk.END)
-            note_boxes[i].insert("1.0", str(note_text))
-            
-            # Ensure text box is editable
-            try:
-                note_boxes[i].config(state="normal")
-            except:
-                pass
-
-def restore_note_section_with_tags(note_data, note_boxes, note_tags, add_function):
-    """Helper to restore a section of notes with text and tags"""
-    if not note_data:
-        return
+    base_dir = share_storage.reports_dir(building)
+    year_dir = os.path.join(base_dir, current_year)
+    month_dir = os.path.join(year_dir, current_month)
+    return os.path.join(month_dir, "drafts")
+
+def queue_draft_save(filename_prefix, silent):
+    """Snapshot the form on the Tk thread and hand it to the background writer"""
+    now = datetime.now()
+    perf = perf_log.start("autosave" if silent else "save")
+    with perf.phase("snapshot"):
+        data = report_model.snapshot(now.isoformat())
+    job = DraftWriteJob(
+        drafts_dir=get_drafts_dir(),
+        filename=f"{filename_prefix}_{now.strftime('%Y-%m-%d_%H-%M')}.json",
+        data=data,
+        revision=report_model.revision,
+        saved_at=now,
+        silent=silent,
+        journal_seq=edit_journal.seq,
+        perf=perf
+    )
+    draft_writer.submit(job)
+    start_draft_results_polling()
+    return job
+
+def start_draft_results_polling():
+    global draft_results_polling
+    if not draft_results_polling:
+        draft_results_polling = True
+        root.after(200, poll_draft_results)
+
+def poll_draft_results():
+    """Apply finished draft writes on the Tk thread"""
+    global draft_results_polling
+    while True:
+        try:
+            job, error = draft_results.get_nowait()
+        except queue.Empty:
+            break
+        show_perf_summary(job.perf.finish(ok=error is None, path=job.path))
+        if error is None:
+            report_model.mark_saved(job.revision, job.saved_at)
+            edit_journal.compact(job.data, job.path, job.journal_seq)
+            if job.silent:
+                autosave_scheduler.save_finished()
+                # Optional: Print to console for debugging (no popup)
+                print(f"Autosave completed: {job.path}")
+            else:
+                messagebox.showinfo("Draft Saved", f"Report draft saved to:\n{job.path}\n\n"
+                                    "It is copied to the M: drive in the background.")
+        elif job.silent:
+            autosave_scheduler.save_finished()
+            # Silent error handling for autosave
+            print(f"Autosave failed: {str(error)}")
+        else:
+            messagebox.showerror("Error", f"Failed to save draft: {str(error)}")
     
-    # ENHANCED: Handle type mismatches - convert string to array if needed
-    if isinstance(note_data, str):
-        note_data = [note_data]  # Convert single string to array
-    elif not isinstance(note_data, list):
-        note_data = [str(note_data)]  # Convert other types to string array
-    
-    # RULE: Never assume counts - dynamically add rows/boxes to match JSON
-    # Ensure we have enough boxes to match the data
-    while len(note_boxes) < len(note_data):
-        add_function("")
-    
-    # Set content for each note box
-    for i, note_entry in enumerate(note_data):
-        if i < len(note_boxes):
-            # ENHANCED: Handle mixed types within the array
-            if isinstance(note_entry, dict):
-                text = note_entry.get("text", "")
-                tags = note_entry.get("tags", [])
-            elif isinstance(note_entry, str):
-                text = note_entry
-                tags = []
+    if draft_writer.pending or not draft_results.empty():
+        root.after(200, poll_draft_results)
+    else:
+        draft_results_polling = False
+
+# === Local Edit Journal ===
+# Between autosaves every field-level edit is appended to a small JSONL file on the
+# local disk, so a crash or power blip loses at most the last flush interval instead
+# of up to three minutes of notes. The first line holds the last saved draft; each
+# successful draft write compacts the journal back down to that single line.
+
+class EditJournal:
+    """Append-only JSONL log of report_model changes"""
+
+    FLUSH_DELAY_MS = 750  # Edits arriving within this window are written as one batch
+
+    def __init__(self, path):
+        self.path = path
+        self.active = False
+        self.seq = 0
+        self.buffer = []
+        self.buffered_sets = {}  # (section, note_id, field) -> index in buffer
+        self.flush_scheduled = False
+
+    def start(self, base_data, base_path=None):
+        """Begin a new journal whose base is the given (already saved or blank) draft"""
+        self.buffer.clear()
+        self.buffered_sets.clear()
+        self._rewrite(base_data, base_path, [])
+        self.active = True
+
+    def record(self, change):
+        """Model listener: buffer a change and schedule a flush"""
+        if not self.active:
+            return
+        self.seq += 1
+        entry = dict(change, seq=self.seq)
+        if change["op"] == "set":
+            # Keystrokes in the same batch only need their final value
+            key = (change["section"], change["note_id"], change["field"])
+            if key in self.buffered_sets:
+                self.buffer[self.buffered_sets[key]] = entry
             else:
-                text = str(note_entry)
-                tags = []
-            
-            # Clear and populate the text box
-            note_boxes[i].delete("1.0", tk.END)
-            note_boxes[i].insert("1.0", text)
-            
-            # RULE: Leave everything editable (state="normal")
-            try:
-                note_boxes[i].config(state="normal")
-            except:
-                pass
-            
-            # RULE: Tag arrays vs note counts - clamp safely
-            # RULE: Set comboboxes via .set(value)
-            if i < len(note_tags) and tags:
-                # Filter out empty/None tags
-                valid_tags = [tag for tag in tags if tag and tag != "None"]
-                
-                # Ensure we have enough tag dropdowns for all valid tags
-                while len(note_tags[i]) < len(valid_tags):
-                    # Find the tag frame for this note and add more dropdowns
-                    # We need to access the parent frame's add_tag_dropdown function
-                    # Get the textbox and find its parent frame, then the tag frame
-                    textbox = note_boxes[i]
-                    note_frame = textbox.master
-                    # Look for tag frame (it should be the frame with tag dropdowns)
-                    tag_frame = None
-                    for child in note_frame.winfo_children():
-                        if hasattr(child, 'add_tag_dropdown'):
-                            tag_frame = child
-                            break
-                    
-                    if tag_frame and hasattr(tag_frame, 'add_tag_dropdown'):
-                        tag_frame.add_tag_dropdown()
-                    else:
-                        break  # Can't add more dropdowns
-                
-                # Set the tag values
-                for j, tag in enumerate(valid_tags):
-                    if j < len(note_tags[i]) and tag:
-                        try:
-                            note_tags[i][j].set(str(tag))
-                        except:
-                            pass
-                
-                # Update add tag buttons after setting values
-                # Find the tag frame and call update_add_tag_buttons if available
-                textbox = note_boxes[i]
-                note_frame = textbox.master
-                tag_frame = None
-                for child in note_frame.winfo_children():
-                    if hasattr(child, 'update_add_tag_buttons'):
-                        tag_frame = child
-                        break
-                
-                if tag_frame and hasattr(tag_frame, 'update_add_tag_buttons'):
-                    tag_frame.update_add_tag_buttons()
-
-def restore_red_gym_data(data):
-    """Restore Red Gym specific data"""
-    # Clear Red Gym specific data
-    clear_red_gym_data()
-    
-    # Building tours
-    if "red_gym_building_tours" in data and red_gym_building_tours_box:
-        red_gym_building_tours_box.delete("1.0", tk.END)
-        red_gym_building_tours_box.insert("1.0", str(data.get("red_gym_building_tours", "")))
-        # RULE: Leave everything editable
+                self.buffered_sets[key] = len(self.buffer)
+                self.buffer.append(entry)
+        else:
+            self.buffered_sets.clear()
+            self.buffer.append(entry)
+        if not self.flush_scheduled:
+            self.flush_scheduled = True
+            root.after(self.FLUSH_DELAY_MS, self.flush)
+
+    def flush(self):
+        self.flush_scheduled = False
+        if not self.buffer or not self.active:
+            return
         try:
-            red_gym_building_tours_box.config(state="normal")
-        except:
-            pass
-    
-    # Deviations count
-    if "red_gym_deviations_count" in data and red_gym_deviations_entry:
-        red_gym_deviations_entry.delete(0, tk.END)
-        red_gym_deviations_entry.insert(0, str(data.get("red_gym_deviations_count", "0")))
-        # RULE: Leave everything editable
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write("".join(json.dumps(entry, ensure_ascii=False) + "\n" for entry in self.buffer))
+                f.flush()
+                os.fsync(f.fileno())
+        except OSError as e:
+            print(f"Warning: Could not write edit journal: {e}")
+            return
+        self.buffer.clear()
+        self.buffered_sets.clear()
+
+    def compact(self, base_data, base_path, upto_seq):
+        """Replace the journal with the saved draft plus edits made after it was taken"""
+        if not self.active:
+            return
+        self.flush()
+        _, changes = self.read()
+        self._rewrite(base_data, base_path, [change for change in changes if change.get("seq", 0) > upto_seq])
+
+    def discard(self):
+        self.active = False
+        self.buffer.clear()
+        self.buffered_sets.clear()
         try:
-            red_gym_deviations_entry.config(state="normal")
-        except:
+            os.remove(self.path)
+        except OSError:
             pass
-        # Trigger update to create deviation boxes
-        red_gym_deviations_entry.event_generate('<KeyRelease>')
-    
-    # Deviation notes (populated after the boxes are created)
-    if "red_gym_deviation_notes" in data:
-        # RULE: Never assume counts - dynamically add to match JSON
-        def populate_deviations():
-            deviation_notes = data.get("red_gym_deviation_notes", [])
-            for i, note_text in enumerate(deviation_notes):
-                if i < len(red_gym_deviation_boxes):
-                    red_gym_deviation_boxes[i].delete("1.0", tk.END)
-                    red_gym_deviation_boxes[i].insert("1.0", str(note_text))
-                    # RULE: Leave everything editable
-                    try:
-                        red_gym_deviation_boxes[i].config(state="normal")
-                    except:
-                        pass
-        root.after(100, populate_deviations)
-    
-    # Door check
-    if "red_gym_door_check_time" in data and red_gym_door_check_time:
-        red_gym_door_check_time.delete(0, tk.END)
-        red_gym_door_check_time.insert(0, str(data.get("red_gym_door_check_time", "")))
-        # RULE: Leave everything editable
+
+    def read(self):
+        """Return (header, changes); header is None if there is no usable journal"""
+        header, changes = None, []
         try:
-            red_gym_door_check_time.config(state="normal")
-        except:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        break  # Torn last line from a crash - everything before it is good
+                    if header is None:
+                        header = entry
+                    else:
+                        changes.append(entry)
+        except OSError:
             pass
-    
-    # RULE: Set comboboxes via .set(value)
-    if "red_gym_door_check_day_type" in data and red_gym_door_check_day_type:
+        if header is None or header.get("op") != "base":
+            return None, []
+        return header, changes
+
+    def _rewrite(self, base_data, base_path, changes):
+        header = {"op": "base", "saved_at": datetime.now().isoformat(), "path": base_path, "data": base_data}
         try:
-            red_gym_door_check_day_type.set(str(data.get("red_gym_door_check_day_type", "")))
-            red_gym_door_check_day_type.config(state="readonly")  # Comboboxes should be readonly
-        except:
-            pass
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                for entry in [header] + changes:
+                    f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"Warning: Could not write edit journal: {e}")
+
+def replay_journal(header, changes):
+    """Rebuild a draft from the journal's base draft plus the recorded edits"""
+    model = ReportModel()
+    model.load_draft(header.get("data") or {})
+    for change in changes:
+        model.apply_change(change)
+    return model.snapshot(datetime.now().isoformat())
+
+edit_journal = EditJournal(os.path.join(LOCAL_DATA_DIR, "edit_journal.jsonl"))
+report_model.listeners.append(edit_journal.record)
+
+def begin_edit_session(base_path=None):
+    """Start journaling from the current state of the form"""
+    edit_journal.start(report_model.snapshot(datetime.now().isoformat()), base_path)
+
+def offer_journal_recovery():
+    """Offer to restore edits left in the journal by a crash. Returns True if restored."""
+    header, changes = edit_journal.read()
+    if header is None:
+        return False
+    if not changes:
+        edit_journal.discard()
+        return False
     
-    # Mail notes
-    if "notes" in data and "red_gym_mail" in data["notes"]:
-        restore_note_section(
-            data["notes"]["red_gym_mail"], 
-            red_gym_mail_boxes,
-            add_red_gym_mail_box
-        )
+    base_data = header.get("data") or {}
+    response = messagebox.askyesno(
+        "Recover Unsaved Edits",
+        f"The Night Report Generator did not close normally.\n\n"
+        f"{len(changes)} unsaved edit(s) to the {base_data.get('building', '')} report were found "
+        f"(last saved {header.get('saved_at', 'never')[:16].replace('T', ' ')}).\n\n"
+        f"Recover them now?",
+        icon='warning'
+    )
+    if not response:
+        edit_journal.discard()
+        return False
     
-    # Misc notes with tags
-    if "notes" in data and "red_gym_misc" in data["notes"]:
-        restore_note_section_with_tags(
-            data["notes"]["red_gym_misc"], 
-            red_gym_misc_boxes,
-            misc_note_tags,
-            add_red_gym_misc_box
-        )
+    try:
+        data = replay_journal(header, changes)
+        open_draft_data(data)
+    except Exception as e:
+        messagebox.showerror("Recovery Error", f"Could not recover the unsaved edits: {str(e)}")
+        return False
+    # Keep the recovered edits marked unsaved so the next autosave writes them to the share
+    for section in {change.get("section") for change in changes}:
+        report_model.mark_dirty(section)
+    begin_edit_session(header.get("path"))
+    return True
+
+# === Local Draft Index ===
+# Every draft written to the share is also recorded in a small SQLite database on the
+# local disk (one per building), indexed by building, report date and save time. The
+# recent-draft picker reads from here instead of browsing the M: drive.
+#
+# Saves for the same report date form a revision chain: a full base snapshot followed by
+# JSON deltas against the previous save. A new base is written every REBASE_EVERY saves,
+# or once the deltas outgrow the base, so any revision rebuilds from one short chain.
+
+DRAFT_INDEX_ENABLED = True
+BUILDING_SHORT_NAMES = {"Memorial Union": "MU", "Union South": "US", "Red Gym": "RG"}
+REBASE_EVERY = 25
+
+def diff_json(old, new):
+    """List of changes turning old into new: [path, value] to set, [path] to delete"""
+    if isinstance(old, dict) and isinstance(new, dict):
+        changes = []
+        for key, value in new.items():
+            if key not in old:
+                changes.append([[key], value])
+            else:
+                changes.extend([[key] + path] + rest for path, *rest in diff_json(old[key], value))
+        changes.extend([[key]] for key in old if key not in new)
+        return changes
+    if isinstance(old, list) and isinstance(new, list) and len(old) == len(new):
+        changes = []
+        for index, (old_item, new_item) in enumerate(zip(old, new)):
+            changes.extend([[index] + path] + rest for path, *rest in diff_json(old_item, new_item))
+        return changes
+    return [] if old == new else [[[], new]]
+
+def apply_json_delta(data, changes):
+    """Apply changes from diff_json to a copy of data"""
+    data = json.loads(json.dumps(data))
+    for path, *value in changes:
+        if not path:
+            data = value[0]
+            continue
+        target = data
+        for key in path[:-1]:
+            target = target[key]
+        if value:
+            target[path[-1]] = value[0]
+        else:
+            del target[path[-1]]
+    return data
 
-def restore_union_data(data):
-    """Restore Memorial Union and Union South specific data"""
-    # Clear union specific data
-    clear_union_data()
-    
-    # Mechanical notes with tags
-    if "notes" in data and "mechanical" in data["notes"]:
-        restore_note_section_with_tags(
-            data["notes"]["mechanical"], 
-            mechanical_boxes,
-            mechanical_note_tags,
-            add_mechanical_box
-        )
-    
-    # Production notes with tags
-    if "notes" in data and "production" in data["notes"]:
-        restore_note_section_with_tags(
-            data["notes"]["production"], 
-            production_boxes,
-            production_note_tags,
-            add_production_note_box
-        )
-    
-    # Decibel readings
-    if "decibel_readings" in data:
-        # RULE: Never assume counts - dynamically add rows to match JSON
-        decibel_data = data.get("decibel_readings", [])
-        
-        # Ensure we have enough rows to match the data
-        while len(decibel_entries) < len(decibel_data):
-            add_decibel_row()
-        
-        # Populate decibel readings
-        for i, reading_data in enumerate(decibel_data):
-            if i < len(decibel_entries):
-                time_entry, reading_entry, location_entry = decibel_entries[i]
-                
-                # RULE: Be backward-compatible - use .get(...) with defaults
-                time_entry.delete(0, tk.END)
-                time_entry.insert(0, str(reading_data.get("time", "")))
-                reading_entry.delete(0, tk.END)  
-                reading_entry.insert(0, str(reading_data.get("reading", "")))
-                location_entry.delete(0, tk.END)
-                location_entry.insert(0, str(reading_data.get("location", "")))
-                
-                # RULE: Leave everything editable
-                try:
-                    time_entry.config(state="normal")
-                    reading_entry.config(state="normal")
-                    location_entry.config(state="normal")
-                except:
-                    pass
-    
-    # Patron notes with tags
-    if "notes" in data and "patron" in data["notes"]:
-        restore_note_section_with_tags(
-            data["notes"]["patron"], 
-            patron_boxes,
-            patron_note_tags,
-            add_patron_note_box
-        )
-    
-    # Access inputs
-    if "access_inputs" in data:
-        access_data = data.get("access_inputs", {})
-        for key, value in access_data.items():
-            if key in access_inputs:
-                # RULE: Set comboboxes via .set(value) and entries via insert
-                if hasattr(access_inputs[key], 'delete') and hasattr(access_inputs[key], 'insert'):
-                    access_inputs[key].delete(0, tk.END)
-                    access_inputs[key].insert(0, str(value))
-                    # RULE: Leave everything editable
-                    try:
-                        access_inputs[key].config(state="normal")
-                    except:
-                        pass
-                elif hasattr(access_inputs[key], 'set'):
-                    # RULE: Set comboboxes via .set(value)
-                    try:
-                        access_inputs[key].set(str(value))
-                        access_inputs[key].config(state="readonly")  # Comboboxes should be readonly
-                    except:
-                        pass
-    
-    # Access notes with tags
-    if "notes" in data and "access" in data["notes"]:
-        restore_note_section_with_tags(
-            data["notes"]["access"], 
-            access_note_boxes,
-            access_note_tags,
-            add_access_note
-        )
-    
-    # Cash notes with tags
-    if "notes" in data and "cash" in data["notes"]:
-        restore_note_section_with_tags(
-            data["notes"]["cash"], 
-            cash_boxes,
-            cash_note_tags,
-            add_cash_note_box
-        )
-    
-    # Dining notes with tags
-    if "notes" in data and "dining" in data["notes"]:
-        restore_note_section_with_tags(
-            data["notes"]["dining"], 
-            dining_boxes,
-            dining_note_tags,
-            add_dining_note_box
-        )
-    
-    # Hotel notes
-    if "notes" in data and "hotel" in data["notes"]:
-        restore_note_section(
-            data["notes"]["hotel"], 
-            hotel_boxes,
-            add_hotel_note_box
-        )
-    
-    # Misc notes
-    if "notes" in data and "misc" in data["notes"]:
-        restore_note_section(
-            data["notes"]["misc"], 
-            misc_boxes,
-            add_misc_note_box
-        )
-    
-    # Memorial Union specific sections
-    if building == "Memorial Union":
-        # Carding notes
-        if "notes" in data and "carding" in data["notes"]:
-            restore_note_section(
-                data["notes"]["carding"], 
-                carding_boxes,
-                add_carding_note_box
-            )
-        
-        # Terrace notes without tags
-        if "notes" in data and "terrace" in data["notes"]:
-            restore_note_section(
-                data["notes"]["terrace"], 
-                terrace_boxes,
-                add_terrace_note_box
-            )
-        
-        # Enforcement notes with tags and images
-        if "notes" in data and "enforcement" in data["notes"]:
-            restore_enforcement_notes(data["notes"]["enforcement"])
-        
-        # Alumni notes with tags
-        if "notes" in data and "alumni" in data["notes"]:
-            restore_note_section_with_tags(
-                data["notes"]["alumni"], 
-                alumni_boxes,
-                alumni_note_tags,
-                add_alumni_note_box
-            )
-        
-        # Pier notes with tags
-        if "notes" in data and "pier" in data["notes"]:
-            restore_note_section_with_tags(
-                data["notes"]["pier"], 
-                pier_boxes,
-                pier_note_tags,
-                add_pier_note_box
+def draft_author(data):
+    """Who made a save: the building manager(s) on the form plus the Windows login"""
+    try:
+        login = getpass.getuser()
+    except Exception:
+        login = "unknown"
+    bms = data.get("entries", {}).get("bms", "").strip()
+    return f"{bms} ({login})" if bms else login
+
+class DraftStore:
+    """SQLite index and revision history of saved drafts for one building"""
+
+    SCHEMA_VERSION = 2
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        # report_date -> (id, base_id, data, saves since base, delta bytes since base, base bytes)
+        # for the newest revision of each chain written by this process
+        self.heads = {}
+
+    def connect(self):
+        # A short-lived connection per call keeps this safe to use from the writer thread
+        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+        conn = sqlite3.connect(self.db_path, timeout=10)
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        if version < self.SCHEMA_VERSION:
+            self.migrate(conn, version)
+        return conn
+
+    def migrate(self, conn, version):
+        with conn:
+            if version == 0 and conn.execute(
+                    "SELECT 1 FROM sqlite_master WHERE name = 'drafts'").fetchone():
+                # Version 1 stored a full copy of every save in `data`; those become bases
+                conn.execute("ALTER TABLE drafts RENAME COLUMN data TO payload")
+                conn.execute("ALTER TABLE drafts ADD COLUMN base_id INTEGER")
+                conn.execute("ALTER TABLE drafts ADD COLUMN author TEXT NOT NULL DEFAULT ''")
+            else:
+                conn.execute("""
+                    CREATE TABLE IF NOT EXISTS drafts (
+                        id INTEGER PRIMARY KEY AUTOINCREMENT,
+                        building TEXT NOT NULL,
+                        report_date TEXT NOT NULL,
+                        saved_at TEXT NOT NULL,
+                        kind TEXT NOT NULL,
+                        path TEXT,
+                        payload TEXT NOT NULL,
+                        base_id INTEGER,
+                        author TEXT NOT NULL DEFAULT ''
+                    )""")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_drafts_recent ON drafts (building, report_date, saved_at)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_drafts_chain ON drafts (base_id, id)")
+            conn.execute(f"PRAGMA user_version = {self.SCHEMA_VERSION}")
+
+    def add(self, data, kind, path, saved_at):
+        """Record a save, as a delta against the previous revision of the same report when possible"""
+        report_date = report_date_key(data)
+        with closing(self.connect()) as conn, conn:
+            head = self.heads.get(report_date) or self._load_head(conn, report_date)
+            payload = json.dumps(data, ensure_ascii=False)
+            base_id = None
+            if head:
+                head_id, head_base_id, head_data, saves, delta_bytes, base_bytes = head
+                delta = json.dumps(diff_json(head_data, data), ensure_ascii=False)
+                if saves + 1 < REBASE_EVERY and delta_bytes + len(delta) < base_bytes:
+                    base_id, payload = head_base_id, delta
+            cursor = conn.execute(
+                "INSERT INTO drafts (building, report_date, saved_at, kind, path, payload, base_id, author) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (data.get("building", ""), report_date, saved_at.isoformat(timespec="seconds"),
+                 kind, path, payload, base_id, draft_author(data))
             )
-    
-    # CSC/Security data
-    if "csc" in data:
-        csc_data = data.get("csc", {})
-        for shift, shift_data in csc_data.items():
-            if shift in csc_entries:
-                for field, value in shift_data.items():
-                    if field in csc_entries[shift]:
-                        csc_entries[shift][field].delete(0, tk.END)
-                        csc_entries[shift][field].insert(0, str(value))
-                        # RULE: Leave everything editable
-                        try:
-                            csc_entries[shift][field].config(state="normal")
-                        except:
-                            pass
-
-def restore_enforcement_notes(enforcement_data):
-    """Special handler for enforcement notes with images"""
-    if not enforcement_data:
-        return
-    
-    # RULE: Never assume counts - dynamically add to match JSON
-    # Clear existing enforcement data by clearing the lists
-    enforcement_boxes.clear()
-    enforcement_note_tags.clear()
-    enforcement_images.clear()
-    
-    # RULE: Never assume counts - dynamically add entries to match JSON
-    # Restore enforcement entries
-    for i, note_entry in enumerate(enforcement_data):
-        # RULE: Be backward-compatible - use .get(...) with defaults
-        if isinstance(note_entry, dict):
-            text = note_entry.get("text", "")
-            tags = note_entry.get("tags", [])
-            image_path = note_entry.get("image_path", "")
+        if base_id is None:
+            self.heads[report_date] = (cursor.lastrowid, cursor.lastrowid, data, 0, 0, len(payload))
         else:
-            text = str(note_entry)
-            tags = []
-            image_path = ""
-        
-        if image_path:
-            # Add as image entry
-            add_enforcement_image()
-            if len(enforcement_images) > 0:
-                # RULE: Missing image files - still show filename in status label; allow reselection
-                enforcement_images[-1].set(str(image_path))
-                # Find the status label and update it to show the filename
-                # (The add_enforcement_image function will handle missing files gracefully)
+            self.heads[report_date] = (cursor.lastrowid, base_id, data, saves + 1,
+                                       delta_bytes + len(payload), base_bytes)
+
+    def _load_head(self, conn, report_date):
+        row = conn.execute(
+            "SELECT id, COALESCE(base_id, id) FROM drafts WHERE report_date = ? ORDER BY id DESC LIMIT 1",
+            (report_date,)
+        ).fetchone()
+        if not row:
+            return None
+        chain = self._chain(conn, row[0])
+        data = self._rebuild(chain)
+        return (row[0], row[1], data, len(chain) - 1,
+                sum(len(payload) for _, payload in chain[1:]), len(chain[0][1]))
+
+    def _chain(self, conn, draft_id):
+        """(id, payload) rows from the base up to draft_id"""
+        row = conn.execute("SELECT COALESCE(base_id, id) FROM drafts WHERE id = ?", (draft_id,)).fetchone()
+        if not row:
+            return []
+        return conn.execute(
+            "SELECT id, payload FROM drafts WHERE id = ? OR (base_id = ? AND id <= ?) ORDER BY id",
+            (row[0], row[0], draft_id)
+        ).fetchall()
+
+    def _rebuild(self, chain):
+        data = json.loads(chain[0][1])
+        for _, payload in chain[1:]:
+            data = apply_json_delta(data, json.loads(payload))
+        return data
+
+    def recent(self, limit=40):
+        """Newest drafts first, without loading their contents"""
+        with closing(self.connect()) as conn:
+            return conn.execute(
+                "SELECT id, building, report_date, saved_at, kind, path, author FROM drafts "
+                "ORDER BY saved_at DESC LIMIT ?", (limit,)
+            ).fetchall()
+
+    def history(self, report_date):
+        """Every save of one report, oldest first: (id, saved_at, kind, author)"""
+        with closing(self.connect()) as conn:
+            return conn.execute(
+                "SELECT id, saved_at, kind, author FROM drafts WHERE report_date = ? ORDER BY id",
+                (report_date,)
+            ).fetchall()
+
+    def load(self, draft_id):
+        """Rebuild the draft exactly as it was at revision draft_id"""
+        with closing(self.connect()) as conn:
+            chain = self._chain(conn, draft_id)
+        return self._rebuild(chain) if chain else None
+
+def report_date_key(data):
+    """ISO date (YYYY-MM-DD) of a draft's report, or "" if the date can't be parsed"""
+    try:
+        return datetime.strptime(data.get("entries", {}).get("date", ""), "%A, %B %d, %Y").strftime("%Y-%m-%d")
+    except ValueError:
+        return ""
+
+draft_stores = {}
+
+def get_draft_store(building_name):
+    short_name = BUILDING_SHORT_NAMES.get(building_name, "XX")
+    if short_name not in draft_stores:
+        draft_stores[short_name] = DraftStore(os.path.join(LOCAL_DATA_DIR, f"drafts_{short_name}.sqlite3"))
+    return draft_stores[short_name]
+
+def recent_indexed_drafts(limit=40):
+    """Recent drafts across all buildings as (store, row) pairs, newest first"""
+    results = []
+    if not DRAFT_INDEX_ENABLED:
+        return results
+    for building_name in BUILDING_SHORT_NAMES:
+        store = get_draft_store(building_name)
+        if not os.path.exists(store.db_path):
+            continue
+        try:
+            results.extend((store, row) for row in store.recent(limit))
+        except sqlite3.Error as e:
+            print(f"Warning: Could not read draft index {store.db_path}: {e}")
+    results.sort(key=lambda item: item[1][3], reverse=True)
+    return results[:limit]
+
+# === Share Storage ===
+# Everything the app keeps on the M: drive goes through share_storage, so the sync and
+# tally paths can also run against something other than a mapped Windows drive. Three
+# implementations share the same file operations:
+#   LocalDirectoryStorage - Night Reports folders under any directory (M:\Sh_BM in use)
+#   MemoryStorage         - the same files and folders held in a dict, for benchmarks
+#   LatencyStorage        - wraps either and adds a delay and failure rate per operation,
+#                           to stand in for a slow or flaky SMB share
+# The tally lock, workbook and drafts are all read and written with these operations, so
+# each round trip to the share is one call.
+# "python geNRator.py --benchmark-storage [ms]" times each save path against an
+# in-memory share with that much latency per operation (default 200 ms).
+
+SHARE_ROOT = "M:\\Sh_BM"
+STORAGE_BENCHMARK_LATENCY_MS = 200
+
+class LocalDirectoryStorage:
+    """Night Reports folders under a local or mapped directory"""
+
+    def __init__(self, root_dir):
+        self.root_dir = root_dir
+
+    def reports_dir(self, building_name):
+        return os.path.join(self.root_dir, building_name, "Night Reports")
+
+    def makedirs(self, path):
+        os.makedirs(path, exist_ok=True)
+
+    def exists(self, path):
+        return os.path.exists(path)
+
+    def getmtime(self, path):
+        return os.path.getmtime(path)
+
+    def listdir(self, path):
+        return os.listdir(path)
+
+    def read_bytes(self, path):
+        with open(path, "rb") as f:
+            return f.read()
+
+    def write_bytes(self, path, data):
+        write_bytes_atomic(path, data)
+
+    def create_exclusive(self, path, data):
+        """Create path holding data; FileExistsError if it already exists"""
+        fd = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+
+    def replace(self, source, target):
+        os.replace(source, target)
+
+    def rename_noreplace(self, source, target):
+        """Rename source to target; fails if target exists"""
+        if os.name == "nt":
+            os.rename(source, target)  # Refuses to replace an existing file
         else:
-            # Add as text note
-            add_enforcement_note_box("")
-        
-        # Set text content
-        if len(enforcement_boxes) > 0:
-            enforcement_boxes[-1].delete("1.0", tk.END)
-            enforcement_boxes[-1].insert("1.0", str(text))
-            # RULE: Leave everything editable
-            try:
-                enforcement_boxes[-1].config(state="normal")
-            except:
-                pass
-        
-        # RULE: Set comboboxes via .set(value)
-        # RULE: Tag arrays vs note counts - clamp safely
-        if len(enforcement_note_tags) > 0 and tags:
-            for j, tag in enumerate(tags):
-                if j < len(enforcement_note_tags[-1]) and tag:
-                    try:
-                        enforcement_note_tags[-1][j].set(str(tag))
-                    except:
-                        pass
-            
-            # Update add tag buttons after setting values for enforcement
-            if len(enforcement_boxes) > 0:
-                textbox = enforcement_boxes[-1]
-                note_frame = textbox.master
-                tag_frame = None
-                for child in note_frame.winfo_children():
-                    if hasattr(child, 'update_add_tag_buttons'):
-                        tag_frame = child
-                        break
-                
-                if tag_frame and hasattr(tag_frame, 'update_add_tag_buttons'):
-                    tag_frame.update_add_tag_buttons()
-
-def clear_red_gym_data():
-    """Clear Red Gym specific form data"""
-    if red_gym_building_tours_box:
-        red_gym_building_tours_box.delete("1.0", tk.END)
-        # RULE: Leave everything editable
+            os.link(source, target)  # Likewise
+            os.remove(source)
+
+    def remove(self, path):
+        os.remove(path)
+
+    def rmtree(self, path):
+        import shutil
+        shutil.rmtree(path)
+
+class MemoryStorage:
+    """The share's folders and files held in memory"""
+
+    def __init__(self, root_dir=SHARE_ROOT):
+        self.root_dir = root_dir
+        self.files = {}  # path -> bytes
+        self.mtimes = {}  # path -> time.time() of the last write
+        self.dirs = set()
+        self.lock = threading.Lock()
+
+    def reports_dir(self, building_name):
+        return os.path.join(self.root_dir, building_name, "Night Reports")
+
+    def makedirs(self, path):
+        with self.lock:
+            while path not in self.dirs and os.path.dirname(path) != path:
+                self.dirs.add(path)
+                path = os.path.dirname(path)
+
+    def exists(self, path):
+        return path in self.files or path in self.dirs
+
+    def getmtime(self, path):
         try:
-            red_gym_building_tours_box.config(state="normal")
-        except:
-            pass
-    
-    if red_gym_deviations_entry:
-        red_gym_deviations_entry.delete(0, tk.END)
-        red_gym_deviations_entry.insert(0, "0")
-        # RULE: Leave everything editable
+            return self.mtimes[path]
+        except KeyError:
+            raise FileNotFoundError(f"No such file: {path!r}") from None
+
+    def listdir(self, path):
+        with self.lock:
+            if path not in self.dirs:
+                raise FileNotFoundError(f"No such directory: {path!r}")
+            return sorted(os.path.basename(child) for child in (*self.files, *self.dirs)
+                          if os.path.dirname(child) == path)
+
+    def read_bytes(self, path):
         try:
-            red_gym_deviations_entry.config(state="normal")
-        except:
-            pass
-    
-    if red_gym_door_check_time:
-        red_gym_door_check_time.delete(0, tk.END)
-        # RULE: Leave everything editable
+            return self.files[path]
+        except KeyError:
+            raise FileNotFoundError(f"No such file: {path!r}") from None
+
+    def write_bytes(self, path, data):
+        with self.lock:
+            self._write(path, data)
+
+    def create_exclusive(self, path, data):
+        with self.lock:
+            if path in self.files:
+                raise FileExistsError(f"File exists: {path!r}")
+            self._write(path, data)
+
+    def _write(self, path, data):
+        if os.path.dirname(path) not in self.dirs:
+            raise FileNotFoundError(f"No such directory: {os.path.dirname(path)!r}")
+        self.files[path] = bytes(data)
+        self.mtimes[path] = time.time()
+
+    def replace(self, source, target):
+        with self.lock:
+            self._move(source, target)
+
+    def rename_noreplace(self, source, target):
+        with self.lock:
+            if target in self.files:
+                raise FileExistsError(f"File exists: {target!r}")
+            self._move(source, target)
+
+    def _move(self, source, target):
+        if source not in self.files:
+            raise FileNotFoundError(f"No such file: {source!r}")
+        self.files[target] = self.files.pop(source)
+        self.mtimes[target] = self.mtimes.pop(source)
+
+    def remove(self, path):
+        with self.lock:
+            if self.files.pop(path, None) is None:
+                raise FileNotFoundError(f"No such file: {path!r}")
+            self.mtimes.pop(path, None)
+
+    def rmtree(self, path):
+        prefix = os.path.join(path, "")
+        with self.lock:
+            if path not in self.dirs:
+                raise FileNotFoundError(f"No such directory: {path!r}")
+            self.files = {name: data for name, data in self.files.items() if not name.startswith(prefix)}
+            self.mtimes = {name: mtime for name, mtime in self.mtimes.items() if name in self.files}
+            self.dirs = {name for name in self.dirs if name != path and not name.startswith(prefix)}
+
+class LatencyStorage:
+    """Another storage behind a simulated network: every call waits, and some fail"""
+
+    def __init__(self, inner, latency=0.2, failure_rate=0.0, latencies=None, seed=None):
+        self.inner = inner
+        self.root_dir = inner.root_dir
+        self.latency = latency  # Seconds per round trip
+        self.latencies = latencies or {}  # Operation name -> seconds, overriding latency
+        self.failure_rate = failure_rate  # Share of calls that raise OSError after waiting
+        self.random = random.Random(seed)
+        self.calls = {}  # Operation name -> count
+        self.lock = threading.Lock()
+
+    def _call(self, name, *args):
+        with self.lock:
+            self.calls[name] = self.calls.get(name, 0) + 1
+            fail = self.random.random() < self.failure_rate
+        time.sleep(self.latencies.get(name, self.latency))
+        if fail:
+            raise OSError(f"Simulated share failure in {name}")
+        return getattr(self.inner, name)(*args)
+
+    def reports_dir(self, building_name):
+        return self.inner.reports_dir(building_name)  # Only builds a path
+
+    def makedirs(self, path):
+        return self._call("makedirs", path)
+
+    def exists(self, path):
+        return self._call("exists", path)
+
+    def getmtime(self, path):
+        return self._call("getmtime", path)
+
+    def listdir(self, path):
+        return self._call("listdir", path)
+
+    def read_bytes(self, path):
+        return self._call("read_bytes", path)
+
+    def write_bytes(self, path, data):
+        return self._call("write_bytes", path, data)
+
+    def create_exclusive(self, path, data):
+        return self._call("create_exclusive", path, data)
+
+    def replace(self, source, target):
+        return self._call("replace", source, target)
+
+    def rename_noreplace(self, source, target):
+        return self._call("rename_noreplace", source, target)
+
+    def remove(self, path):
+        return self._call("remove", path)
+
+    def rmtree(self, path):
+        return self._call("rmtree", path)
+
+share_storage = LocalDirectoryStorage(SHARE_ROOT)
+
+# === Offline Spool ===
+# Drafts, reports and tally updates are written to a spool on the local disk first and
+# the save returns at once, so a slow or disconnected M: drive never holds up a save or
+# End Shift. A background thread pushes the spool to the share in the order it was
+# queued, backing off while the share is unreachable. Each pass sends everything that
+# is waiting and skips writes a later entry makes pointless: an autosave replaced by a
+# newer one, or a draft in a folder that is about to be removed. A failed write stops
+# the pass, whatever its kind, and is retried first next time. The spool survives a
+# restart; anything left over is pushed the next time the app starts.
+
+SPOOL_DIR = os.path.join(LOCAL_DATA_DIR, "spool")
+SYNC_RETRY_MIN_SECONDS = 5
+SYNC_RETRY_MAX_SECONDS = 300
+SYNC_STATUS_POLL_MS = 1000
+
+class ShareSpool:
+    """Local outbox of share writes, pushed in order by ShareSync"""
+
+    SCHEMA_VERSION = 1
+
+    def __init__(self, spool_dir):
+        self.spool_dir = spool_dir
+        self.files_dir = os.path.join(spool_dir, "files")
+        self.db_path = os.path.join(spool_dir, "outbox.sqlite3")
+        self.listeners = []  # Called (from any thread) whenever an entry is queued
+
+    def connect(self):
+        os.makedirs(self.spool_dir, exist_ok=True)
+        conn = sqlite3.connect(self.db_path, timeout=10)
+        if conn.execute("PRAGMA user_version").fetchone()[0] < self.SCHEMA_VERSION:
+            with conn:
+                conn.execute("""
+                    CREATE TABLE IF NOT EXISTS outbox (
+                        id INTEGER PRIMARY KEY AUTOINCREMENT,
+                        kind TEXT NOT NULL,
+                        target TEXT NOT NULL,
+                        payload TEXT NOT NULL,
+                        queued_at TEXT NOT NULL,
+                        attempts INTEGER NOT NULL DEFAULT 0,
+                        last_error TEXT
+                    )""")
+                conn.execute(f"PRAGMA user_version = {self.SCHEMA_VERSION}")
+        return conn
+
+    def add_file(self, target, write):
+        """Queue a file for target; write(f) fills a local binary file with its contents"""
+        os.makedirs(self.files_dir, exist_ok=True)
+        local_path = os.path.join(self.files_dir, f"{uuid.uuid4().hex}{os.path.splitext(target)[1]}")
         try:
-            red_gym_door_check_time.config(state="normal")
-        except:
-            pass
-    
-    if red_gym_door_check_day_type:
-        red_gym_door_check_day_type.set("")
-        # RULE: Comboboxes should remain readonly but functional
-        try:
-            red_gym_door_check_day_type.config(state="readonly")
-        except:
-            pass
-    
-    clear_note_boxes(red_gym_mail_boxes)
-    clear_note_boxes(red_gym_misc_boxes)
-
-def clear_union_data():
-    """Clear Memorial Union and Union South specific form data"""
-    clear_note_boxes(mechanical_boxes)
-    clear_note_boxes(production_boxes)
-    clear_note_boxes(patron_boxes)
-    clear_note_boxes(access_note_boxes)
-    clear_note_boxes(cash_boxes)
-    clear_note_boxes(dining_boxes)
-    clear_note_boxes(hotel_boxes)
-    clear_note_boxes(misc_boxes)
-    
-    # Clear access inputs
-    for widget in access_inputs.values():
-        if hasattr(widget, 'delete') and hasattr(widget, 'insert'):
-            widget.delete(0, tk.END)
-            # RULE: Leave everything editable
-            try:
-                widget.config(state="normal")
-            except:
-                pass
-        elif hasattr(widget, 'set'):
-            widget.set("")
-            # RULE: Comboboxes should remain readonly but functional
+            with open(f"{local_path}.tmp", "wb") as f:
+                write(f)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(f"{local_path}.tmp", local_path)
+            self._add("file", target, local_path)
+        except BaseException:
+            for path in (f"{local_path}.tmp", local_path):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+            raise
+
+    def add_text(self, target, text):
+        self.add_file(target, lambda f: f.write(text.encode("utf-8")))
+
+    def prune_autosaves(self, drafts_dir, keep):
+        """Queue removal of every autosave in drafts_dir except keep"""
+        self._add("prune", drafts_dir, keep)
+
+    def remove_dir(self, path):
+        self._add("remove_dir", path, "")
+
+    def add_tally(self, tally_path, report_date, building_name, note_rows):
+        """Queue one night's notes for the tally (see update_tally)"""
+        self._add("tally", tally_path, json.dumps({
+            "report_date": report_date.strftime("%Y-%m-%d"),
+            "building": building_name,
+            "rows": [list(row) for row in note_rows]
+        }, ensure_ascii=False))
+
+    def _add(self, kind, target, payload):
+        with closing(self.connect()) as conn, conn:
+            conn.execute("INSERT INTO outbox (kind, target, payload, queued_at) VALUES (?, ?, ?, ?)",
+                         (kind, target, payload, datetime.now().isoformat(timespec="seconds")))
+        for listener in self.listeners:
+            listener()
+
+    def pending(self):
+        """Waiting entries in queue order: (id, kind, target, payload)"""
+        with closing(self.connect()) as conn:
+            return conn.execute("SELECT id, kind, target, payload FROM outbox ORDER BY id").fetchall()
+
+    def count(self):
+        if not os.path.exists(self.db_path):
+            return 0
+        with closing(self.connect()) as conn:
+            return conn.execute("SELECT COUNT(*) FROM outbox").fetchone()[0]
+
+    def finish(self, entries):
+        """Drop pushed (or skipped) entries and their local copies"""
+        with closing(self.connect()) as conn, conn:
+            conn.executemany("DELETE FROM outbox WHERE id = ?", [(entry_id,) for entry_id, *_ in entries])
+        for _, kind, _, payload in entries:
+            if kind == "file":
+                try:
+                    os.remove(payload)
+                except OSError:
+                    pass
+
+    def record_failure(self, entry_id, error):
+        with closing(self.connect()) as conn, conn:
+            conn.execute("UPDATE outbox SET attempts = attempts + 1, last_error = ? WHERE id = ?", (error, entry_id))
+
+def superseded_entries(entries):
+    """Ids of queued entries that later entries undo: the same file written again, an
+    autosave (or earlier prune) a later prune of its folder covers, or anything inside
+    a folder that is later removed"""
+    skipped = set()
+    seen_files, pruned_dirs, removed_dirs = set(), {}, []
+    for entry_id, kind, target, payload in reversed(entries):
+        path = os.path.normcase(target)
+        if kind == "tally":
+            continue
+        if any(os.path.join(path, "").startswith(removed) for removed in removed_dirs):
+            skipped.add(entry_id)
+        elif kind == "prune":
+            if path in pruned_dirs:
+                skipped.add(entry_id)
+            else:
+                pruned_dirs[path] = payload
+        elif kind == "remove_dir":
+            removed_dirs.append(os.path.join(path, ""))
+        elif kind == "file":
+            name = os.path.basename(target)
+            keep = pruned_dirs.get(os.path.dirname(path))
+            if path in seen_files or (keep is not None and name.startswith("autosave_")
+                                      and name.endswith(".json") and name != keep):
+                skipped.add(entry_id)
+            seen_files.add(path)
+    return skipped
+
+class ShareSync:
+    """Background thread pushing the spool to share storage, with exponential backoff"""
+
+    def __init__(self, spool, storage):
+        self.spool = spool
+        self.storage = storage
+        self.wake = threading.Event()
+        self.thread = None
+        self.lock = threading.Lock()
+        self.pending = 0
+        self.error = None
+        self.retry_at = None
+        self.synced_at = None
+        spool.listeners.append(self.notify)
+
+    def start(self):
+        if self.thread is None or not self.thread.is_alive():
+            self.thread = threading.Thread(target=self._run, name="share-sync", daemon=True)
+            self.thread.start()
+
+    def notify(self):
+        with self.lock:
+            self.pending += 1
+        self.wake.set()
+
+    def status(self):
+        """(entries waiting, last error or None, retry time, last successful push)"""
+        with self.lock:
+            return self.pending, self.error, self.retry_at, self.synced_at
+
+    def _run(self):
+        failures = 0
+        while True:
+            self.wake.clear()
             try:
-                widget.config(state="readonly")
-            except:
-                pass
-    
-    # Clear CSC data
-    for shift_data in csc_entries.values():
-        for field_widget in shift_data.values():
-            field_widget.delete(0, tk.END)
-            # RULE: Leave everything editable
+                ok = self.push()
+            except Exception as e:  # The spool database itself is unusable
+                ok = False
+                with self.lock:
+                    self.error = str(e)
+            if ok:
+                failures = 0
+                with self.lock:
+                    self.retry_at = None
+                self.wake.wait()
+            else:
+                failures += 1
+                delay = min(SYNC_RETRY_MAX_SECONDS, SYNC_RETRY_MIN_SECONDS * 2 ** (failures - 1))
+                delay *= random.uniform(0.8, 1.2)
+                with self.lock:
+                    self.retry_at = datetime.now() + timedelta(seconds=delay)
+                # A new save is a good moment to try again, so it cuts the wait short
+                self.wake.wait(delay)
+
+    def push(self):
+        """Push everything waiting, in order; stops at the first failure. True once empty."""
+        entries = self.spool.pending()
+        with self.lock:
+            self.pending = len(entries)
+        if not entries:
+            return True
+        perf = perf_log.start("sync")
+        skipped = superseded_entries(entries)
+        made_dirs = set()
+        done = []
+        error = None
+        try:
+            for entry in entries:
+                entry_id, kind, target, payload = entry
+                if entry_id not in skipped:
+                    try:
+                        self.apply(kind, target, payload, made_dirs, perf)
+                    except Exception as e:
+                        error = f"{os.path.basename(target) or target}: {e}"
+                        self.spool.record_failure(entry_id, error)
+                        break  # Later entries may depend on this one (and the share is probably down)
+                done.append(entry)
+        finally:
+            self.spool.finish(done)
+            with self.lock:
+                self.pending = len(entries) - len(done)
+                self.error = error
+                if done and error is None:
+                    self.synced_at = datetime.now()
+            perf.finish(ok=error is None, pushed=sum(entry[0] not in skipped for entry in done),
+                        skipped=len(skipped), error=error)
+        return error is None
+
+    def apply(self, kind, target, payload, made_dirs, perf):
+        if kind == "file":
+            target_dir = os.path.dirname(target)
+            if target_dir not in made_dirs:
+                self.storage.makedirs(target_dir)
+                made_dirs.add(target_dir)
             try:
-                field_widget.config(state="normal")
-            except:
-                pass
-    
-    # Clear decibel entries
-    for time_entry, reading_entry, location_entry in decibel_entries:
-        time_entry.delete(0, tk.END)
-        reading_entry.delete(0, tk.END)
-        location_entry.delete(0, tk.END)
-        time_entry.insert(0, "Time")
-        reading_entry.insert(0, "Reading (db)")
-        location_entry.insert(0, "Location")
-        # RULE: Leave everything editable
+                with open(payload, "rb") as f:
+                    data = f.read()
+            except FileNotFoundError:
+                print(f"Warning: Spooled copy of {target} is missing; skipping it")
+                return
+            with perf.phase("share_write"):
+                self.storage.write_bytes(target, data)
+        elif kind == "prune":
+            with perf.phase("draft_cleanup"):
+                remove_old_autosaves(self.storage, target, payload)
+        elif kind == "remove_dir":
+            with perf.phase("draft_cleanup"):
+                if self.storage.exists(target):
+                    self.storage.rmtree(target)
+        elif kind == "tally":
+            night = json.loads(payload)
+            self.storage.makedirs(os.path.dirname(target))
+            update_tally(self.storage, target, datetime.strptime(night["report_date"], "%Y-%m-%d"), night["building"],
+                         tally_categories(night["building"]), night["rows"], perf)
+
+def remove_old_autosaves(storage, drafts_dir, keep):
+    """Keep only the autosave named keep (only after it is safely on the share)"""
+    try:
+        for filename in storage.listdir(drafts_dir):
+            if filename.startswith("autosave_") and filename.endswith(".json") and filename != keep:
+                storage.remove(os.path.join(drafts_dir, filename))
+                print(f"Deleted old autosave: {filename}")
+    except FileNotFoundError:
+        pass  # The drafts folder was removed by End Shift
+
+share_spool = ShareSpool(SPOOL_DIR)
+share_sync = ShareSync(share_spool, share_storage)
+
+# Label in the button bar showing whether everything has reached the share
+sync_status_label = None
+
+def refresh_sync_status():
+    """Show the sync state in the button bar (polled on the Tk thread)"""
+    pending, error, retry_at, synced_at = share_sync.status()
+    if error:
+        retry = f", retrying at {retry_at.strftime('%I:%M:%S %p')}" if retry_at else ""
+        text, color = f"{pending} waiting for the M: drive{retry} ({error})", "red"
+    elif pending:
+        text, color = f"Copying {pending} to the M: drive...", "orange"
+    elif synced_at:
+        text, color = f"M: drive up to date ({synced_at.strftime('%I:%M %p')})", "gray"
+    else:
+        text, color = "", "gray"
+    if sync_status_label is not None:
         try:
-            time_entry.config(state="normal")
-            reading_entry.config(state="normal")
-            location_entry.config(state="normal")
-        except:
-            pass
-    
-    # Memorial Union specific
-    if building == "Memorial Union":
-        clear_note_boxes(carding_boxes)
-        clear_note_boxes(terrace_boxes)
-        clear_note_boxes(enforcement_boxes)
-        clear_note_boxes(alumni_boxes)
-        clear_note_boxes(pier_boxes)
+            sync_status_label.config(text=text, fg=color)
+        except tk.TclError:
+            pass  # Label was destroyed while the tabs were rebuilt
+    root.after(SYNC_STATUS_POLL_MS, refresh_sync_status)
+
+def add_sync_status_label(parent):
+    global sync_status_label
+    sync_status_label = tk.Label(parent, text="", fg="gray", bg="black", font=("Helvetica", 10))
+    sync_status_label.pack(side="left", padx=12)
+
+def start_share_sync():
+    """Start pushing the spool, including anything left from an earlier session"""
+    share_sync.start()
+    root.after(SYNC_STATUS_POLL_MS, refresh_sync_status)
 
 # === Draft Save Function ===
 def save_report_draft():
     try:
-        # Create timestamp
-        now = datetime.now()
-        timestamp = now.isoformat()
-        
-        # Build the draft data structure
-        draft_data = {
-            "timestamp": timestamp,
-            "building": building,
-            "entries": {},
-            "notes": {},
-            "decibel_readings": [],
-            "csc": {},
-            "access_inputs": {}
-        }
-        
-        # Save all entries
-        for key, entry in entries.items():
-            if hasattr(entry, 'get'):
-                draft_data["entries"][key] = entry.get()
-        
-        # Save building traffic notes
-        traffic_notes = []
-        for box in building_traffic_boxes:
-            traffic_notes.append(box.get("1.0", "end-1c"))
-        draft_data["notes"]["building_traffic"] = traffic_notes
-        
-        # Red Gym specific data
-        if building == "Red Gym":
-            # Building tours
-            if red_gym_building_tours_box:
-                draft_data["red_gym_building_tours"] = red_gym_building_tours_box.get("1.0", "end-1c")
-            
-            # Deviations
-            if red_gym_deviations_entry:
-                draft_data["red_gym_deviations_count"] = red_gym_deviations_entry.get()
-            
-            deviation_notes = []
-            for box in red_gym_deviation_boxes:
-                deviation_notes.append(box.get("1.0", "end-1c"))
-            draft_data["red_gym_deviation_notes"] = deviation_notes
-            
-            # Door check
-            if red_gym_door_check_time:
-                draft_data["red_gym_door_check_time"] = red_gym_door_check_time.get()
-            if red_gym_door_check_day_type:
-                draft_data["red_gym_door_check_day_type"] = red_gym_door_check_day_type.get()
-            
-            # Mail notes
-            mail_notes = []
-            for box in red_gym_mail_boxes:
-                mail_notes.append(box.get("1.0", "end-1c"))
-            draft_data["notes"]["red_gym_mail"] = mail_notes
-            
-            # Misc notes with tags
-            misc_notes = []
-            for i, box in enumerate(red_gym_misc_boxes):
-                note_data = {
-                    "text": box.get("1.0", "end-1c"),
-                    "tags": []
-                }
-                if i < len(misc_note_tags):
-                    note_data["tags"] = [var.get() for var in misc_note_tags[i]]
-                misc_notes.append(note_data)
-            draft_data["notes"]["red_gym_misc"] = misc_notes
-        else:
-            # Memorial Union and Union South specific data
-            
-            # Save mechanical notes with tags
-            mechanical_notes = []
-            for i, box in enumerate(mechanical_boxes):
-                note_data = {
-                    "text": box.get("1.0", "end-1c"),
-                    "tags": []
-                }
-                if i < len(mechanical_note_tags):
-                    note_data["tags"] = [var.get() for var in mechanical_note_tags[i]]
-                mechanical_notes.append(note_data)
-            draft_data["notes"]["mechanical"] = mechanical_notes
-            
-            # Save production notes with tags
-            production_notes = []
-            for i, box in enumerate(production_boxes):
-                note_data = {
-                    "text": box.get("1.0", "end-1c"),
-                    "tags": []
-                }
-                if i < len(production_note_tags):
-                    note_data["tags"] = [var.get() for var in production_note_tags[i]]
-                production_notes.append(note_data)
-            draft_data["notes"]["production"] = production_notes
-            
-            # Save decibel readings
-            for time_entry, reading_entry, location_entry in decibel_entries:
-                reading_data = {
-                    "time": time_entry.get(),
-                    "reading": reading_entry.get(),
-                    "location": location_entry.get()
-                }
-                draft_data["decibel_readings"].append(reading_data)
-            
-            # Save patron notes with tags
-            patron_notes = []
-            for i, box in enumerate(patron_boxes):
-                note_data = {
-                    "text": box.get("1.0", "end-1c"),
-                    "tags": []
-                }
-                if i < len(patron_note_tags):
-                    note_data["tags"] = [var.get() for var in patron_note_tags[i]]
-                patron_notes.append(note_data)
-            draft_data["notes"]["patron"] = patron_notes
-            
-            # Save access inputs
-            for key, widget in access_inputs.items():
-                if hasattr(widget, 'get'):
-                    draft_data["access_inputs"][key] = widget.get()
-            
-            # Save access notes with tags
-            access_notes = []
-            for i, box in enumerate(access_note_boxes):
-                note_data = {
-                    "text": box.get("1.0", "end-1c"),
-                    "tags": []
-                }
-                if i < len(access_note_tags):
-                    note_data["tags"] = [var.get() for var in access_note_tags[i]]
-                access_notes.append(note_data)
-            draft_data["notes"]["access"] = access_notes
-            
-            # Save cash notes with tags
-            cash_notes = []
-            for i, box in enumerate(cash_boxes):
-                note_data = {
-                    "text": box.get("1.0", "end-1c"),
-                    "tags": []
-                }
-                if i < len(cash_note_tags):
-                    note_data["tags"] = [var.get() for var in cash_note_tags[i]]
-                cash_notes.append(note_data)
-            draft_data["notes"]["cash"] = cash_notes
-            
-            # Save dining notes with tags
-            dining_notes = []
-            for i, box in enumerate(dining_boxes):
-                note_data = {
-                    "text": box.get("1.0", "end-1c"),
-                    "tags": []
-                }
-                if i < len(dining_note_tags):
-                    note_data["tags"] = [var.get() for var in dining_note_tags[i]]
-                dining_notes.append(note_data)
-            draft_data["notes"]["dining"] = dining_notes
-            
-            # Save hotel notes
-            hotel_notes = []
-            for box in hotel_boxes:
-                hotel_notes.append(box.get("1.0", "end-1c"))
-            draft_data["notes"]["hotel"] = hotel_notes
-            
-            # Save misc notes
-            misc_notes = []
-            for box in misc_boxes:
-                misc_notes.append(box.get("1.0", "end-1c"))
-            draft_data["notes"]["misc"] = misc_notes
-            
-            # Memorial Union specific sections
-            if building == "Memorial Union":
-                # Save carding notes
-                carding_notes = []
-                for box in carding_boxes:
-                    carding_notes.append(box.get("1.0", "end-1c"))
-                draft_data["notes"]["carding"] = carding_notes
-                
-                # Save terrace notes without tags
-                terrace_notes = []
-                for box in terrace_boxes:
-                    terrace_notes.append(box.get("1.0", "end-1c"))
-                draft_data["notes"]["terrace"] = terrace_notes
-                
-                # Save enforcement notes with tags and images
-                enforcement_notes = []
-                for i, box in enumerate(enforcement_boxes):
-                    note_data = {
-                        "text": box.get("1.0", "end-1c"),
-                        "tags": [],
-                        "image_path": ""
-                    }
-                    if i < len(enforcement_note_tags):
-                        note_data["tags"] = [var.get() for var in enforcement_note_tags[i]]
-                    if i < len(enforcement_images):
-                        note_data["image_path"] = enforcement_images[i].get()
-                    enforcement_notes.append(note_data)
-                draft_data["notes"]["enforcement"] = enforcement_notes
-                
-                # Save alumni notes with tags
-                alumni_notes = []
-                for i, box in enumerate(alumni_boxes):
-                    note_data = {
-                        "text": box.get("1.0", "end-1c"),
-                        "tags": []
-                    }
-                    if i < len(alumni_note_tags):
-                        note_data["tags"] = [var.get() for var in alumni_note_tags[i]]
-                    alumni_notes.append(note_data)
-                draft_data["notes"]["alumni"] = alumni_notes
-                
-                # Save pier notes with tags
-                pier_notes = []
-                for i, box in enumerate(pier_boxes):
-                    note_data = {
-                        "text": box.get("1.0", "end-1c"),
-                        "tags": []
-                    }
-                    if i < len(pier_note_tags):
-                        note_data["tags"] = [var.get() for var in pier_note_tags[i]]
-                    pier_notes.append(note_data)
-                draft_data["notes"]["pier"] = pier_notes
-            
-            # Save CSC/Security data
-            for shift in csc_shifts:
-                if shift in csc_entries:
-                    draft_data["csc"][shift] = {
-                        "requested": csc_entries[shift]["requested"].get(),
-                        "present": csc_entries[shift]["present"].get(),
-                        "names": csc_entries[shift]["names"].get()
-                    }
-        
-        # Create draft folder path
-        user_date = entries["date"].get()
-        parsed_date = datetime.strptime(user_date, "%A, %B %d, %Y")
-        current_year = parsed_date.strftime("%Y")
-        current_month = parsed_date.strftime("%B")
-        
-        base_dir = f"M:\\Sh_BM\\{building}\\Night Reports"
-        year_dir = os.path.join(base_dir, current_year)
-        month_dir = os.path.join(year_dir, current_month)
-        drafts_dir = os.path.join(month_dir, "drafts")
-        os.makedirs(drafts_dir, exist_ok=True)
-        
-        # Create draft filename with timestamp
-        draft_filename = f"draft_{now.strftime('%Y-%m-%d_%H-%M')}.json"
-        draft_path = os.path.join(drafts_dir, draft_filename)
-        
-        # Save the JSON file (overwrite if exists)
-        with open(draft_path, 'w', encoding='utf-8') as f:
-            json.dump(draft_data, f, indent=2, ensure_ascii=False)
-        
-        messagebox.showinfo("Draft Saved", f"Report draft saved to:\n{draft_path}")
+        # Snapshot now; the file is written in the background and a message is
+        # shown once it is on disk (see poll_draft_results)
+        queue_draft_save("draft", silent=False)
         
     except Exception as e:
         messagebox.showerror("Error", f"Failed to save draft: {str(e)}")
 
 # === Autosave Functions ===
-def start_autosave(interval_min=5):
-    """Start autosave mechanism that saves drafts every interval_min minutes"""
-    global autosave_thread, autosave_running
-    
-    # Don't start multiple autosave threads
-    if autosave_thread is not None and autosave_thread.is_alive():
-        return
-    
-    autosave_running = True
-    
-    def autosave_worker():
-        """Background worker that triggers autosave periodically"""
-        while autosave_running:
-            # Sleep for the specified interval
-            time.sleep(interval_min * 60)
-            
-            # Check if we should still be running
-            if not autosave_running:
-                break
-                
-            # Schedule save_report_draft on the main thread
-            try:
-                root.after(0, lambda: save_report_draft_silent())
-            except Exception as e:
-                print(f"Autosave error: {e}")
-    
-    # Create and start daemon thread
-    autosave_thread = threading.Thread(target=autosave_worker, daemon=True)
-    autosave_thread.start()
+# === Autosave Scheduler ===
+class AutosaveScheduler:
+    """Main-loop autosave built on root.after.
+
+    A save runs idle_seconds after the last edit, and at most interval_min minutes after
+    the first unsaved edit even if typing never pauses. Requests that arrive while a save
+    is still being written are coalesced into a single follow-up save."""
+
+    def __init__(self, widget, save):
+        self.widget = widget
+        self.save = save  # Returns the queued job, or None if nothing was written
+        self.idle_ms = 20 * 1000
+        self.max_ms = 3 * 60 * 1000
+        self.running = False
+        self.idle_timer = None
+        self.max_timer = None
+        self.in_flight = False
+        self.pending = False
+
+    def start(self, idle_seconds=20, interval_min=3):
+        """(Re)start autosaving; safe to call again after a draft is reloaded"""
+        self.stop()
+        self.idle_ms = int(idle_seconds * 1000)
+        self.max_ms = int(interval_min * 60 * 1000)
+        self.running = True
+
+    def stop(self):
+        """Cancel any scheduled save immediately"""
+        self.running = False
+        self.pending = False
+        self._cancel_timers()
+
+    def notify_edit(self, change=None):
+        """Model listener: push the idle deadline back, and start the max-interval clock"""
+        if not self.running:
+            return
+        if self.idle_timer is not None:
+            self.widget.after_cancel(self.idle_timer)
+        self.idle_timer = self.widget.after(self.idle_ms, self.request_save)
+        if self.max_timer is None:
+            self.max_timer = self.widget.after(self.max_ms, self.request_save)
+
+    def request_save(self):
+        self._cancel_timers()
+        if not self.running:
+            return
+        if self.in_flight:
+            self.pending = True  # One more save once the current write lands
+            return
+        self.in_flight = self.save() is not None
+
+    def save_finished(self):
+        """Called on the Tk thread once the writer has finished an autosave"""
+        self.in_flight = False
+        if self.pending:
+            self.pending = False
+            self.request_save()
+
+    def _cancel_timers(self):
+        for timer in (self.idle_timer, self.max_timer):
+            if timer is not None:
+                self.widget.after_cancel(timer)
+        self.idle_timer = None
+        self.max_timer = None
+
+def start_autosave(idle_seconds=20, interval_min=3):
+    """Autosave idle_seconds after typing stops, and at least every interval_min minutes"""
+    autosave_scheduler.start(idle_seconds, interval_min)
 
 def stop_autosave():
     """Stop the autosave mechanism"""
-    global autosave_running
-    autosave_running = False
+    autosave_scheduler.stop()
 
 def save_report_draft_silent():
     """Silent version of save_report_draft for autosave (no popup messages)"""
     try:
-        # Create timestamp
-        now = datetime.now()
-        timestamp = now.isoformat()
-        
-        # Build the draft data structure (same as save_report_draft)
-        draft_data = {
-            "timestamp": timestamp,
-            "building": building,
-            "entries": {},
-            "notes": {},
-            "decibel_readings": [],
-            "csc": {},
-            "access_inputs": {}
-        }
-        
-        # Save all entries
-        for key, entry in entries.items():
-            if hasattr(entry, 'get'):
-                draft_data["entries"][key] = entry.get()
-        
-        # Save building traffic notes
-        traffic_notes = []
-        for box in building_traffic_boxes:
-            traffic_notes.append(box.get("1.0", "end-1c"))
-        draft_data["notes"]["building_traffic"] = traffic_notes
-        
-        # Red Gym specific data
-        if building == "Red Gym":
-            # Building tours
-            if red_gym_building_tours_box:
-                draft_data["red_gym_building_tours"] = red_gym_building_tours_box.get("1.0", "end-1c")
-            
-            # Deviations
-            if red_gym_deviations_entry:
-                draft_data["red_gym_deviations_count"] = red_gym_deviations_entry.get()
-            
-            deviation_notes = []
-            for box in red_gym_deviation_boxes:
-                deviation_notes.append(box.get("1.0", "end-1c"))
-            draft_data["red_gym_deviation_notes"] = deviation_notes
-            
-            # Door check
-            if red_gym_door_check_time:
-                draft_data["red_gym_door_check_time"] = red_gym_door_check_time.get()
-            if red_gym_door_check_day_type:
-                draft_data["red_gym_door_check_day_type"] = red_gym_door_check_day_type.get()
-            
-            # Mail notes
-            mail_notes = []
-            for box in red_gym_mail_boxes:
-                mail_notes.append(box.get("1.0", "end-1c"))
-            draft_data["notes"]["red_gym_mail"] = mail_notes
-            
-            # Misc notes with tags
-            misc_notes = []
-            for i, box in enumerate(red_gym_misc_boxes):
-                note_data = {
-                    "text": box.get("1.0", "end-1c"),
-                    "tags": []
-                }
-                if i < len(misc_note_tags):
-                    note_data["tags"] = [var.get() for var in misc_note_tags[i]]
-                misc_notes.append(note_data)
-            draft_data["notes"]["red_gym_misc"] = misc_notes
-        else:
-            # Memorial Union and Union South specific data
-            
-            # Save mechanical notes with tags
-            mechanical_notes = []
-            for i, box in enumerate(mechanical_boxes):
-                note_data = {
-                    "text": box.get("1.0", "end-1c"),
-                    "tags": []
-                }
-                if i < len(mechanical_note_tags):
-                    note_data["tags"] = [var.get() for var in mechanical_note_tags[i]]
-                mechanical_notes.append(note_data)
-            draft_data["notes"]["mechanical"] = mechanical_notes
-            
-            # Save production notes with tags
-            production_notes = []
-            for i, box in enumerate(production_boxes):
-                note_data = {
-                    "text": box.get("1.0", "end-1c"),
-                    "tags": []
-                }
-                if i < len(production_note_tags):
-                    note_data["tags"] = [var.get() for var in production_note_tags[i]]
-                production_notes.append(note_data)
-            draft_data["notes"]["production"] = production_notes
-            
-            # Save decibel readings
-            for time_entry, reading_entry, location_entry in decibel_entries:
-                reading_data = {
-                    "time": time_entry.get(),
-                    "reading": reading_entry.get(),
-                    "location": location_entry.get()
-                }
-                draft_data["decibel_readings"].append(reading_data)
-            
-            # Save patron notes with tags
-            patron_notes = []
-            for i, box in enumerate(patron_boxes):
-                note_data = {
-                    "text": box.get("1.0", "end-1c"),
-                    "tags": []
-                }
-                if i < len(patron_note_tags):
-                    note_data["tags"] = [var.get() for var in patron_note_tags[i]]
-                patron_notes.append(note_data)
-            draft_data["notes"]["patron"] = patron_notes
-            
-            # Save access inputs
-            for key, widget in access_inputs.items():
-                if hasattr(widget, 'get'):
-                    draft_data["access_inputs"][key] = widget.get()
-            
-            # Save access notes with tags
-            access_notes = []
-            for i, box in enumerate(access_note_boxes):
-                note_data = {
-                    "text": box.get("1.0", "end-1c"),
-                    "tags": []
-                }
-                if i < len(access_note_tags):
-                    note_data["tags"] = [var.get() for var in access_note_tags[i]]
-                access_notes.append(note_data)
-            draft_data["notes"]["access"] = access_notes
-            
-            # Save cash notes with tags
-            cash_notes = []
-            for i, box in enumerate(cash_boxes):
-                note_data = {
-                    "text": box.get("1.0", "end-1c"),
-                    "tags": []
-                }
-                if i < len(cash_note_tags):
-                    note_data["tags"] = [var.get() for var in cash_note_tags[i]]
-                cash_notes.append(note_data)
-            draft_data["notes"]["cash"] = cash_notes
-            
-            # Save dining notes with tags
-            dining_notes = []
-            for i, box in enumerate(dining_boxes):
-                note_data = {
-                    "text": box.get("1.0", "end-1c"),
-                    "tags": []
-                }
-                if i < len(dining_note_tags):
-                    note_data["tags"] = [var.get() for var in dining_note_tags[i]]
-                dining_notes.append(note_data)
-            draft_data["notes"]["dining"] = dining_notes
-            
-            # Save hotel notes
-            hotel_notes = []
-            for box in hotel_boxes:
-                hotel_notes.append(box.get("1.0", "end-1c"))
-            draft_data["notes"]["hotel"] = hotel_notes
-            
-            # Save misc notes
-            misc_notes = []
-            for box in misc_boxes:
-                misc_notes.append(box.get("1.0", "end-1c"))
-            draft_data["notes"]["misc"] = misc_notes
-            
-            # Memorial Union specific sections
-            if building == "Memorial Union":
-                # Save carding notes
-                carding_notes = []
-                for box in carding_boxes:
-                    carding_notes.append(box.get("1.0", "end-1c"))
-                draft_data["notes"]["carding"] = carding_notes
-                
-                # Save terrace notes without tags
-                terrace_notes = []
-                for box in terrace_boxes:
-                    terrace_notes.append(box.get("1.0", "end-1c"))
-                draft_data["notes"]["terrace"] = terrace_notes
-                
-                # Save enforcement notes with tags and images
-                enforcement_notes = []
-                for i, box in enumerate(enforcement_boxes):
-                    note_data = {
-                        "text": box.get("1.0", "end-1c"),
-                        "tags": [],
-                        "image_path": ""
-                    }
-                    if i < len(enforcement_note_tags):
-                        note_data["tags"] = [var.get() for var in enforcement_note_tags[i]]
-                    if i < len(enforcement_images):
-                        note_data["image_path"] = enforcement_images[i].get()
-                    enforcement_notes.append(note_data)
-                draft_data["notes"]["enforcement"] = enforcement_notes
-                
-                # Save alumni notes with tags
-                alumni_notes = []
-                for i, box in enumerate(alumni_boxes):
-                    note_data = {
-                        "text": box.get("1.0", "end-1c"),
-                        "tags": []
-                    }
-                    if i < len(alumni_note_tags):
-                        note_data["tags"] = [var.get() for var in alumni_note_tags[i]]
-                    alumni_notes.append(note_data)
-                draft_data["notes"]["alumni"] = alumni_notes
-                
-                # Save pier notes with tags
-                pier_notes = []
-                for i, box in enumerate(pier_boxes):
-                    note_data = {
-                        "text": box.get("1.0", "end-1c"),
-                        "tags": []
-                    }
-                    if i < len(pier_note_tags):
-                        note_data["tags"] = [var.get() for var in pier_note_tags[i]]
-                    pier_notes.append(note_data)
-                draft_data["notes"]["pier"] = pier_notes
-            
-            # Save CSC/Security data
-            for shift in csc_shifts:
-                if shift in csc_entries:
-                    draft_data["csc"][shift] = {
-                        "requested": csc_entries[shift]["requested"].get(),
-                        "present": csc_entries[shift]["present"].get(),
-                        "names": csc_entries[shift]["names"].get()
-                    }
-        
-        # Create draft folder path
-        user_date = entries["date"].get()
-        parsed_date = datetime.strptime(user_date, "%A, %B %d, %Y")
-        current_year = parsed_date.strftime("%Y")
-        current_month = parsed_date.strftime("%B")
-        
-        base_dir = f"M:\\Sh_BM\\{building}\\Night Reports"
-        year_dir = os.path.join(base_dir, current_year)
-        month_dir = os.path.join(year_dir, current_month)
-        drafts_dir = os.path.join(month_dir, "drafts")
-        os.makedirs(drafts_dir, exist_ok=True)
-        
-        # Delete previous autosave files to keep only the latest one
-        try:
-            for filename in os.listdir(drafts_dir):
-                if filename.startswith("autosave_") and filename.endswith(".json"):
-                    old_autosave_path = os.path.join(drafts_dir, filename)
-                    os.remove(old_autosave_path)
-                    print(f"Deleted old autosave: {filename}")
-        except Exception as cleanup_error:
-            print(f"Warning: Could not clean up old autosave files: {cleanup_error}")
-        
-        # Create autosave filename (different from manual saves)
-        draft_filename = f"autosave_{now.strftime('%Y-%m-%d_%H-%M')}.json"
-        draft_path = os.path.join(drafts_dir, draft_filename)
-        
-        # Save the JSON file (overwrite if exists)
-        with open(draft_path, 'w', encoding='utf-8') as f:
-            json.dump(draft_data, f, indent=2, ensure_ascii=False)
+        # Nothing changed since the last save - skip the write to the share
+        if not report_model.is_dirty:
+            print("Autosave skipped: no unsaved changes")
+            return
         
-        # Optional: Print to console for debugging (no popup)
-        print(f"Autosave completed: {draft_path}")
+        # Old autosaves are removed once the new one is safely on the share
+        return queue_draft_save("autosave", silent=True)
         
     except Exception as e:
         # Silent error handling for autosave
         print(f"Autosave failed: {str(e)}")
 
+autosave_scheduler = AutosaveScheduler(root, save_report_draft_silent)
+report_model.listeners.append(autosave_scheduler.notify_edit)
+
 # === Rename existing function ===
 def end_shift_and_generate():
     try:
         # Stop autosave before generating final report
         stop_autosave()
         
-        # Generate the report using existing logic
-        generate_report()
-        
-        # After successful generation, delete the drafts folder
+        job = ReportJob(report_model.snapshot(datetime.now().isoformat()), get_drafts_dir())
+        ReportProgressDialog(job)
+        job.start()
+    except Exception as e:
+        messagebox.showerror("Error", str(e))
+
+def finish_end_shift(kind, value):
+    """Handle the report worker's outcome on the Tk thread"""
+    if kind == "done":
+        report_path, warnings, summary = value
+        show_perf_summary(summary)
+        edit_journal.discard()
+        for title, warning in warnings:
+            messagebox.showerror(title, warning)
+        if share_spool.count():
+            messagebox.showinfo("Success", f"Report saved as {report_path}\n\n"
+                                "It is being copied to the M: drive in the background.")
+        else:
+            messagebox.showinfo("Success", f"Report saved as {report_path}")
+        return
+    # Keep drafts and the edit journal so nothing is lost, and carry on autosaving
+    if kind == "error":
+        message, summary = value
+        show_perf_summary(summary)
+        messagebox.showerror("Error", message)
+    else:
+        show_perf_summary(value)
+    start_autosave(idle_seconds=20, interval_min=3)
+
+# === Report Generation Worker ===
+# Building the document, embedding photos, rewriting the tally and saving to the share
+# can take long enough for Windows to mark the window "Not Responding". End Shift
+# therefore snapshots the form and hands it to a worker thread; the worker reports
+# each stage through a queue that the progress dialog polls from the Tk main loop.
+
+REPORT_POLL_MS = 100
+REPORT_STAGES = {
+    "imports": "Loading report libraries",
+    "document": "Building the Word document",
+    "tally": "Queueing the Excel tally update",
+    "save": "Saving the report",
+    "cleanup": "Queueing draft removal",
+}
+
+class ReportCancelled(Exception):
+    """The user cancelled End Shift before anything was written"""
+
+class ReportJob:
+    """One End Shift run on a worker thread"""
+
+    def __init__(self, snapshot, drafts_dir):
+        # The worker gets its own copy of the form, so nothing it reads can change under it.
+        # The snapshot it was built from is kept as the final draft.
+        self.snapshot = snapshot
+        self.report = ReportModel()
+        self.report.load_draft(snapshot)
+        self.drafts_dir = drafts_dir
+        self.events = queue.Queue()  # (kind, value) for the Tk thread
+        self.cancel_requested = threading.Event()
+        self.cancellable = True
+
+    def start(self):
+        threading.Thread(target=self.run, daemon=True).start()
+
+    def stage(self, name):
+        """Called by the worker on entering a stage"""
+        self.check_cancelled()
+        if name == "tally":
+            self.cancellable = False  # The tally update is queued for the share
+        self.events.put(("stage", name))
+
+    def check_cancelled(self):
+        if self.cancellable and self.cancel_requested.is_set():
+            raise ReportCancelled()
+
+    def run(self):
+        perf = perf_log.start("generate")
         try:
-            user_date = entries["date"].get()
-            parsed_date = datetime.strptime(user_date, "%A, %B %d, %Y")
-            current_year = parsed_date.strftime("%Y")
-            current_month = parsed_date.strftime("%B")
-            drafts_dir = os.path.join(f"M:\\Sh_BM\\{building}\\Night Reports", current_year, current_month, "drafts")
-            
-            if os.path.exists(drafts_dir):
-                import shutil
-                shutil.rmtree(drafts_dir)
+            report_path, warnings = generate_report(self.report, self, perf)
+            summary = perf.finish(path=report_path)
+            self.stage("cleanup")
+            self.remove_drafts()
+            self.events.put(("done", (report_path, warnings, summary)))
+        except ReportCancelled:
+            self.events.put(("cancelled", perf.finish(ok=False, error="cancelled")))
+        except Exception as e:
+            self.events.put(("error", (str(e), perf.finish(ok=False, error=str(e)))))
+
+    def remove_drafts(self):
+        """Delete the drafts folder (after the report reaches the share)"""
+        try:
+            # Let any in-flight draft write be queued first so it can't recreate the folder
+            draft_writer.wait_until_idle(timeout=30)
+            share_spool.remove_dir(self.drafts_dir)
         except Exception as e:
             # Don't fail the entire operation if draft cleanup fails
             print(f"Warning: Could not clean up drafts folder: {e}")
-            
-    except Exception as e:
-        messagebox.showerror("Error", str(e))
 
-# === Generate Report Logic === (renamed from generate_report)
-def generate_report():
-    try:
-        doc = Document()
-        # Include building name in the heading
-        doc.add_heading(f'{building.upper()}\nBUILDING MANAGER\'S NIGHT REPORT', level=1)
+class ReportProgressDialog:
+    """Modal per-stage progress for a ReportJob, with a Cancel button"""
+
+    def __init__(self, job):
+        self.job = job
+        self.current_stage = None
+        self.window = tk.Toplevel(root)
+        self.window.title("Generating Report")
+        self.window.configure(bg="black")
+        self.window.resizable(False, False)
+        self.window.transient(root)
+        self.window.protocol("WM_DELETE_WINDOW", self.cancel)
         
-        # Add bold paragraphs with regular user input
-        def add_bold_para_with_input(bold_text, user_input):
-            p = doc.add_paragraph()
-            p.add_run(f"{bold_text}: ").bold = True
-            p.add_run(user_input)
+        tk.Label(self.window, text="Generating the night report...", fg="white", bg="black",
+                 font=("Helvetica", 12, "bold")).pack(padx=20, pady=(15, 10), anchor="w")
+        self.stage_labels = {}
+        for name, text in REPORT_STAGES.items():
+            label = tk.Label(self.window, text=f"    {text}", fg="gray", bg="black", font=label_font, anchor="w")
+            label.pack(fill="x", padx=20)
+            self.stage_labels[name] = label
         
-        add_bold_para_with_input("Date", entries["date"].get())
-        add_bold_para_with_input("Shift Hours", entries["shift_hours"].get())
-        add_bold_para_with_input("Building Manager(s)", entries["bms"].get())
+        self.cancel_btn = tk.Button(self.window, text="Cancel", command=self.cancel,
+                                    bg="white", fg="black", font=("Helvetica", 10, "bold"))
+        self.cancel_btn.pack(pady=15)
+        self.window.grab_set()
+        self.window.after(REPORT_POLL_MS, self.poll)
+
+    def cancel(self):
+        if not self.job.cancellable:
+            return  # Too late: the tally update has been queued
+        self.job.cancel_requested.set()
+        self.cancel_btn.config(text="Cancelling...", state="disabled")
+
+    def show_stage(self, name):
+        if self.current_stage:
+            self.stage_labels[self.current_stage].config(text=f"✓  {REPORT_STAGES[self.current_stage]}", fg="green")
+        self.stage_labels[name].config(text=f"▶  {REPORT_STAGES[name]}", fg="white")
+        self.current_stage = name
+        if name == "tally":
+            self.cancel_btn.config(state="disabled")
+
+    def poll(self):
+        """Apply the worker's progress; close and hand over once it has finished"""
+        try:
+            while True:
+                kind, value = self.job.events.get_nowait()
+                if kind == "stage":
+                    self.show_stage(value)
+                    continue
+                self.window.grab_release()
+                self.window.destroy()
+                finish_end_shift(kind, value)
+                return
+        except queue.Empty:
+            pass
+        self.window.after(REPORT_POLL_MS, self.poll)
+
+# === Enforcement Photo Pipeline ===
+# Enforcement photos come straight off phones (4-12 MB each) but are printed 6.5" wide,
+# so a few of them used to make a 40 MB report. Before embedding, each photo is turned
+# upright (EXIF orientation), scaled to its printed size at PHOTO_DPI and re-encoded as
+# JPEG. Results are cached by content hash, so regenerating a report reuses them.
+# Pillow is optional: without it the original file is embedded as before.
+
+PHOTO_WIDTH_IN = 6.5
+PHOTO_HEIGHT_IN = 250 / 72
+PHOTO_DPI = 200
+PHOTO_JPEG_QUALITY = 85
+PHOTO_CACHE_DIR = os.path.join(LOCAL_DATA_DIR, "photo_cache")
+PHOTO_CACHE_MAX_FILES = 200
+
+def prepare_report_photo(image_path):
+    """Path of a report-sized JPEG of the photo, or the original if it can't be processed"""
+    try:
+        from PIL import Image, ImageOps
+    except ImportError:
+        return image_path
+    try:
+        with open(image_path, "rb") as f:
+            digest = hashlib.sha256(f.read()).hexdigest()
+        max_size = (round(PHOTO_WIDTH_IN * PHOTO_DPI), round(PHOTO_HEIGHT_IN * PHOTO_DPI))
+        cached_path = os.path.join(PHOTO_CACHE_DIR, f"{digest}-{max_size[0]}x{max_size[1]}-q{PHOTO_JPEG_QUALITY}.jpg")
+        if os.path.exists(cached_path):
+            os.utime(cached_path)  # Recently used photos survive pruning
+            return cached_path
         
-        # Red Gym specific report format
-        if building == "Red Gym":
-            # Bold section headers
-            p = doc.add_paragraph()
-            p.add_run("\nNotes:").bold = True
-            
-            def add_bold_section_header(text):
-                p = doc.add_paragraph()
-                p.add_run(text).bold = True
-                return p
-                
-            # Function to add indented paragraphs using Inches for better control
-            def add_indented_paragraph(number, content):
-                p = doc.add_paragraph("")
-                p.paragraph_format.left_indent = Inches(0.25)
-                p.add_run(f"{number}. ").bold = True
-                p.add_run(content)
-                return p
-            
-            def add_sub_indented_paragraph(letter, content):
-                p = doc.add_paragraph("")
-                p.paragraph_format.left_indent = Inches(0.75)
-                p.add_run(f"{letter}. ").bold = True
-                p.add_run(content)
-                return p
-
-            note_counter = 1
-
-            # Building Traffic
-            add_bold_section_header("Building Traffic")
-            has_traffic_notes = False
-            for box in building_traffic_boxes:
-                content = box.get("1.0", "end").strip()
-                if content:
-                    has_traffic_notes = True
-                    add_indented_paragraph(note_counter, content)
-                    note_counter += 1
-            
-            if not has_traffic_notes:
-                add_indented_paragraph(note_counter, "")
-                note_counter += 1
-
-            # Security
-            add_bold_section_header("Security")
-            
-            # Building Tours
-            tours_content = red_gym_building_tours_box.get("1.0", "end").strip()
-            tours_text = f"Building Tours: {tours_content}" if tours_content else "Building Tours:"
-            add_indented_paragraph(note_counter, tours_text)
-            note_counter += 1
-            
-            # Deviations
-            num_deviations = int(red_gym_deviations_entry.get() or "0")
-            deviation_text = f"There were {num_deviations} deviations from the standard building locking protocol today."
-            
-            # Create paragraph for deviations with bold formatting
-            p = doc.add_paragraph("")
-            p.paragraph_format.left_indent = Inches(0.25)
-            p.add_run(f"{note_counter}. ").bold = True
-            p.add_run("There were ")
-            p.add_run(str(num_deviations)).bold = True
-            p.add_run(" deviations from the standard building locking protocol today.")
-            
-            if num_deviations > 0:
-                for i, box in enumerate(red_gym_deviation_boxes):
-                    content = box.get("1.0", "end").strip()
-                    letter = chr(97 + i)  # a, b, c, etc.
-                    add_sub_indented_paragraph(letter, content)
-            
-            note_counter += 1
-            
-            # Door check
-            door_time = red_gym_door_check_time.get().strip()   
-            door_day_type = red_gym_door_check_day_type.get()
-            
-            # Create paragraph for door check with bold formatting
-            p = doc.add_paragraph("")
-            p.paragraph_format.left_indent = Inches(0.25)
-            p.add_run(f"{note_counter}. ").bold = True
-            p.add_run("I checked to confirm that the Building Doors were locked and the door swipe scanner was red at ")
-            p.add_run(door_time).bold = True
-            p.add_run(" on a ")
-            p.add_run(door_day_type).bold = True
-            p.add_run(".")
-            
-            note_counter += 1
-
-            # Mail
-            add_bold_section_header("Mail")
-            has_mail_notes = False
-            for box in red_gym_mail_boxes:
-                content = box.get("1.0", "end").strip()
-                if content:
-                    has_mail_notes = True
-                    add_indented_paragraph(note_counter, content)
-                    note_counter += 1
-            
-            if not has_mail_notes:
-                add_indented_paragraph(note_counter, "")
-                note_counter += 1
-
-            # Miscellaneous
-            add_bold_section_header("Miscellaneous")
-            has_misc_notes = False
-            for box in red_gym_misc_boxes:
-                content = box.get("1.0", "end").strip()
-               
-                if content:
-                    has_misc_notes = True
-                    add_indented_paragraph(note_counter, content)
-                    note_counter += 1
-            
-            if not has_misc_notes:
-                add_indented_paragraph(note_counter, "None")
-                note_counter += 1
-
-        else:
-            # Existing code for Memorial Union and Union South
-            # Terrace Manager(s) only for Memorial Union
-            if building == "Memorial Union":
-                add_bold_para_with_input("Terrace Manager(s)", entries["terrace_managers"].get())
-            add_bold_para_with_input("Event Manager(s)", entries["eventmanagers"].get())
-            add_bold_para_with_input("Guest Service Specialist", entries["gss"].get())
-            add_bold_para_with_input("Operation Manager(s)", entries["operation_managers"].get())
-            add_bold_para_with_input("Custodial Supervisor(s)", entries["custodial"].get())
-            add_bold_para_with_input("Production Supervisor(s)", entries["production"].get())
-            add_bold_para_with_input("Retail & Dining Supervisor(s)", entries["retail"].get())
-            add_bold_para_with_input("Catering Supervisor(s)", entries["catering"].get())
-            add_bold_para_with_input("CAVR Desk Staff", entries["cavr"].get())
-
-            # Bold section headers
-            p = doc.add_paragraph()
-            p.add_run("\nNotes:").bold = True
-            
-            def add_bold_section_header(text):
-                p = doc.add_paragraph()
-                p.add_run(text).bold = True
-                return p
-                
-            # Function to add indented paragraphs using Inches for better control
-            def add_indented_paragraph(number, content):
-                # Create a paragraph with the content and number
-                p = doc.add_paragraph("")
-                p.paragraph_format.left_indent = Inches(0.25)  # Change from 0.5 to 0.25 inch indent
-                
-                # Add the number with bold formatting
-                p.add_run(f"{number}. ").bold = True
-                
-                # Add the content directly
-                p.add_run(content)
-                
-                return p
-
-            # Start a global counter for note numbering across all sections
-            note_counter = 1
-
-            add_bold_section_header("Building Traffic")
-            
-            # Add building traffic notes with global counter
-            has_traffic_notes = False
-            for box in building_traffic_boxes:
-                content = box.get("1.0", "end").strip()
-                if content:
-                    has_traffic_notes = True
-                    add_indented_paragraph(note_counter, content)
-                    note_counter += 1
-            
-            # Add an empty numbered note if no content
-            if not has_traffic_notes:
-                add_indented_paragraph(note_counter, "")
-                note_counter += 1
-
-            add_bold_section_header("Mechanical/Repairs/Custodial")
-            
-            # Add mechanical notes with continuing counter
-            has_mechanical_notes = False
-            for box in mechanical_boxes:
-                content = box.get("1.0", "end").strip()
-                if content:
-                    has_mechanical_notes = True
-                    add_indented_paragraph(note_counter, content)
-                    note_counter += 1
-            
-            # Add an empty numbered note if no content
-            if not has_mechanical_notes:
-                add_indented_paragraph(note_counter, "")
-                note_counter += 1
-
-            add_bold_section_header("Production Services (Meetings, Events, Set-ups, AV)")
-            
-            # Add production notes with continuing counter
-            has_production_notes = False
-            for box in production_boxes:
-                content = box.get("1.0", "end").strip()
-                if content:
-                    has_production_notes = True
-                    add_indented_paragraph(note_counter, content)
-                    note_counter += 1
-            
-            # Add an empty numbered note if no content
-            if not has_production_notes:
-                add_indented_paragraph(note_counter, "")
-                note_counter += 1
-                
-            # === Decibel reading and Security table modifications ===
-            
-            if decibel_entries:
-                add_bold_section_header("Decibel Readings")
-                # Create a table for decibel readings
-                table = doc.add_table(rows=1, cols=3)
-                table.style = 'Table Grid'
-                
-                # Add header row - bold the headers
-                header_cells = table.rows[0].cells
-                header_cells[0].paragraphs[0].add_run("Time").bold = True
-                header_cells[1].paragraphs[0].add_run("Reading (dB)").bold = True
-                header_cells[2].paragraphs[0].add_run("Location").bold = True
-                
-                # Center-align header cells
-                for cell in header_cells:
-                    for paragraph in cell.paragraphs:
-                        paragraph.alignment = 1  # 1 = CENTER
-
-                # Add data rows
-                for time_entry, reading_entry, location_entry in decibel_entries:
-                    time = time_entry.get().strip()
-                    reading = reading_entry.get().strip()
-                    location = location_entry.get().strip()
-                    if time and reading and location and time != "Time" and reading != "Reading (db)" and location != "Location":
-                        row_cells = table.add_row().cells
-                        row_cells[0].text = time
-                        row_cells[1].text = reading
-                        row_cells[2].text = location
-                        
-                        # Center-align all cells in this row
-                        for cell in row_cells:
-                            for paragraph in cell.paragraphs:
-                                paragraph.alignment = 1  # 1 = CENTER
-
-            add_bold_section_header("Patron Services (Membership, Patron Assistance, Problem Patrons)")
-            
-            # Add patron service notes with continuing counter
-            has_patron_notes = False
-            for box in patron_boxes:
-                content = box.get("1.0", "end").strip()
-                if content:
-                    has_patron_notes = True
-                    add_indented_paragraph(note_counter, content)
-                    note_counter += 1
-            
-            # Add an empty numbered note if no content
-            if not has_patron_notes:
-                add_indented_paragraph(note_counter, "")
-                note_counter += 1
-
-            add_bold_section_header("Access/Lock/Unlock")
-
-            # Special case for access notes - bold the user input instead
-            access_notes = [
-                {
-                    "text": f"At the early check, the loading dock arm gate was {access_inputs['early_gate'].get().lower()} at {access_inputs['early_time'].get()}.",
-                    "bold_parts": [access_inputs['early_gate'].get().lower(), access_inputs['early_time'].get()]
-                },
-                {
-                    "text": f"At the closing check, the loading dock arm gate was {access_inputs['close_gate'].get().lower()} at {access_inputs['close_time'].get()}.",
-                    "bold_parts": [access_inputs['close_gate'].get().lower(), access_inputs['close_time'].get()]
-                },
-                {
-                    "text": f"At the closing check, the HID scanners were {access_inputs['hid_status'].get().lower()}.",
-                    "bold_parts": [access_inputs['hid_status'].get().lower()]
-                },
-                {
-                    "text": f"I {access_inputs['door_status'].get().lower()} secured the loading dock overhead door for the night.",
-                    "bold_parts": [access_inputs['door_status'].get().lower()]
-                }
-            ]
-
-            # Auto-generated sentences with bold user inputs and continuing counter with indentation
-            for note_data in access_notes:
-                p = doc.add_paragraph("")
-                # Indent the entire paragraph using Inches
-                p.paragraph_format.left_indent = Inches(0.25)  # Change from 0.5 to 0.25
-                
-                # Add the number with bold formatting
-                p.add_run(f"{note_counter}. ").bold = True
-                
-                sentence = note_data["text"]
-                bold_parts = note_data["bold_parts"]
-                
-                current_pos = 0
-                for bold_part in bold_parts:
-                    if bold_part in sentence[current_pos:]:
-                        # Find position of bold part
-                        part_pos = sentence.find(bold_part, current_pos)
-                        
-                        # Add text before the bold part
-                        if part_pos > current_pos:
-                            p.add_run(sentence[current_pos:part_pos])
-                        
-                        # Add the bold part
-                        p.add_run(bold_part).bold = True
-                        
-                        # Update position
-                        current_pos = part_pos + len(bold_part)
-                
-                # Add any remaining text after the last bold part
-                if current_pos < len(sentence):
-                    p.add_run(sentence[current_pos:])
-                    
-                note_counter += 1
-                
-            # User-entered access notes
-            for box in access_note_boxes:
-                content = box.get("1.0", "end").strip()
-                if content:
-                    add_indented_paragraph(note_counter, content)
-                    note_counter += 1
-
-            add_bold_section_header("Cash Office")
-            
-            # Add cash office notes with continuing counter
-            has_cash_notes = False
-            for box in cash_boxes:
-                content = box.get("1.0", "end").strip()
-                if content:
-                    has_cash_notes = True
-                    add_indented_paragraph(note_counter, content)
-                    note_counter += 1
-            
-            # Add an empty numbered note if no content
-            if not has_cash_notes:
-                add_indented_paragraph(note_counter, "")
-                note_counter += 1
-
-            # Only include Memorial Union specific sections if the building is Memorial Union
-            if building == "Memorial Union":
-                add_bold_section_header("Carding Runs")
-                
-                # Add carding notes with continuing counter
-                has_carding_notes = False
-                for box in carding_boxes:
-                    content = box.get("1.0", "end").strip()
-                    if content:
-                        has_carding_notes = True
-                        add_indented_paragraph(note_counter, content)
-                        note_counter += 1
-                
-                # Add an empty numbered note if no content
-                if not has_carding_notes:
-                    add_indented_paragraph(note_counter, "")
-                    note_counter += 1
-
-                add_bold_section_header("Terrace Traffic")
-                
-                # Add terrace traffic notes with continuing counter
-                has_terrace_notes = False
-                for box in terrace_boxes:
-                    content = box.get("1.0", "end").strip()
-                    if content:
-                        has_terrace_notes = True
-                        add_indented_paragraph(note_counter, content)
-                        note_counter += 1
-                
-                # Add an empty numbered note if no content
-                if not has_terrace_notes:
-                    add_indented_paragraph(note_counter, "")
-                    note_counter += 1
+        with Image.open(image_path) as image:
+            # Let the JPEG decoder downscale while reading (either side may end up the width)
+            image.draft("RGB", (max(max_size), max(max_size)))
+            image = ImageOps.exif_transpose(image)
+            if image.mode != "RGB":
+                # Flatten transparency onto white rather than black
+                background = Image.new("RGB", image.size, "white")
+                background.paste(image, mask=image.convert("RGBA").getchannel("A"))
+                image = background
+            # The report stretches the photo to the printed box, so scale each side to fit it
+            size = (min(image.width, max_size[0]), min(image.height, max_size[1]))
+            if size != image.size:
+                image = image.resize(size, Image.LANCZOS)
+            os.makedirs(PHOTO_CACHE_DIR, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=PHOTO_CACHE_DIR, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                image.save(f, "JPEG", quality=PHOTO_JPEG_QUALITY, optimize=True, dpi=(PHOTO_DPI, PHOTO_DPI))
+            os.replace(tmp_path, cached_path)
+        prune_photo_cache()
+        return cached_path
+    except Exception as e:
+        print(f"Warning: Could not prepare photo {image_path}: {e}")
+        return image_path
 
-                add_bold_section_header("Terrace Enforcement")
-                
-                # Add enforcement notes with continuing counter
-                has_enforcement_notes = False
-                enforcement_index = 0  # Track index for both images and text notes
-                
-                for i, box in enumerate(enforcement_boxes):
-                    content = box.get("1.0", "end").strip()
-                    
-                    # Check if this is an image entry (has corresponding image path)
-                    if i < len(enforcement_images) and enforcement_images[i].get():
-                        # This is an image with description
-                        image_path = enforcement_images[i].get()
-                        
-                        # Add the image to the document
-                        try:
-                            # Insert image first with width fitting document and height of 400
-                            doc.add_picture(image_path, width=Inches(6.5), height=Inches(250/72))  # 6.5 inches width (standard doc width), 400px height converted to inches
-                            
-                            # Add numbered description after the image
-                            if content:
-                                p = doc.add_paragraph("")
-                                p.paragraph_format.left_indent = Inches(0.25)
-                                p.add_run(f"{note_counter}. ").bold = True
-                                p.add_run(content)
-                            else:
-                                # If no description, still add the number
-                                p = doc.add_paragraph("")
-                                p.paragraph_format.left_indent = Inches(0.25)
-                                p.add_run(f"{note_counter}. ").bold = True
-                            
-                            has_enforcement_notes = True
-                            note_counter += 1
-                        except Exception as e:
-                            # If image fails to load, just add the text
-                            if content:
-                                add_indented_paragraph(note_counter, content)
-                                has_enforcement_notes = True
-                                note_counter += 1
-                    else:
-                        # Regular text note
-                        if content:
-                            has_enforcement_notes = True
-                            add_indented_paragraph(note_counter, content)
-                            note_counter +=  1
-                
+def prune_photo_cache():
+    """Keep the PHOTO_CACHE_MAX_FILES most recently used photos"""
+    try:
+        photos = [entry for entry in os.scandir(PHOTO_CACHE_DIR) if entry.name.endswith(".jpg")]
+        photos.sort(key=lambda entry: entry.stat().st_mtime, reverse=True)
+        for entry in photos[PHOTO_CACHE_MAX_FILES:]:
+            os.remove(entry.path)
+    except OSError as e:
+        print(f"Warning: Could not prune photo cache: {e}")
+
+# === Note Event Store ===
+# Every End Shift also stores all of its notes in a SQLite file next to the yearly tally
+# workbook (MU_Tally_2026_notes.sqlite3 and so on), one row per note and tally tag, with
+# the section and text. The tally workbook is derived from it, and any other tally (by
+# week, by section, by building) is a single pandas pivot over it:
+#     python geNRator.py --tally-report <workbook or store> [...] --by week
+# It sits on the share because the workbook it feeds is shared, and is only touched
+# under the tally lock. SQLite never opens it there, since SQLite files on an SMB share
+# are easily corrupted: the lock holder copies it to the local disk, works on the copy
+# and writes it back through the share storage.
+
+def report_note_rows(report, notes):
+    """(section, note index, tally tag or None, text) for every note in the report, one
+    row per tag. The tally's special cases are resolved here, so counting is a group-by."""
+    if report.building == "Red Gym":
+        tallied_sections = {"red_gym_misc"}
+    else:
+        tallied_sections = {"mechanical", "production", "patron", "access", "cash", "dining"}
+        if report.building == "Memorial Union":
+            tallied_sections |= {"enforcement", "alumni", "pier"}
+    rows = []
+    for section in report.note_sections():
+        for note in notes[section]:
+            if not note.text:
+                continue
+            tags = sorted(set(note.tags)) if section in tallied_sections else []
+            if section == "patron" and not tags:
+                # If no tag but text, count as General Assistance
+                tags = ["Patron Services/inquires/General Assistance"]
+            elif section == "hotel":
+                tags = ["Hotel Request"]  # Every hotel note is a request
+            rows.extend((section, note.index, tag, note.text) for tag in tags or [None])
+    # Decibel checks count once per report
+    readings = [reading for reading in notes.decibel_readings if reading[0] and reading[0] != "Time"]
+    if readings and report.building != "Red Gym":
+        text = "; ".join(f"{reading_time}: {reading} dB at {location}" for reading_time, reading, location in readings)
+        rows.append(("decibel", 0, "Decibel checked", text))
+    return rows
+
+def tally_store_path(tally_path):
+    return f"{os.path.splitext(tally_path)[0]}_notes.sqlite3"
+
+@contextmanager
+def open_note_store(storage, tally_path):
+    """A local working copy of the note store beside a tally workbook (hold the tally lock).
+
+    save_note_store writes the copy back; otherwise it is thrown away."""
+    local_dir = os.path.join(LOCAL_DATA_DIR, "tally_notes")
+    os.makedirs(local_dir, exist_ok=True)
+    fd, local_path = tempfile.mkstemp(suffix=".sqlite3", dir=local_dir)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            try:
+                f.write(storage.read_bytes(tally_store_path(tally_path)))
+            except FileNotFoundError:
+                pass  # The workbook's first night; SQLite starts an empty file afresh
+        yield NoteEventStore(local_path)
+    finally:
+        try:
+            os.remove(local_path)
+        except OSError:
+            pass
 
-                # Add an empty numbered note if no content
-                if not has_enforcement_notes:
-                    add_indented_paragraph(note_counter, "")
-                    note_counter += 1
+def save_note_store(storage, store, tally_path, lock, perf):
+    """Write a working copy back beside the workbook, if the lock is still ours"""
+    with perf.phase("note_store"):
+        with open(store.db_path, "rb") as f:
+            data = f.read()
+        if not lock.held():
+            raise TallyLockError("The tally lock expired before the update was saved, so the tally was not changed")
+        storage.write_bytes(tally_store_path(tally_path), data)
+
+class NoteEventStore:
+    """Every note of every End Shift for one tally: one row per note and tally tag
+    (tag NULL for notes that aren't counted), replaced as a whole when a night is re-run"""
+
+    SCHEMA_VERSION = 1
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+
+    def connect(self):
+        # A short-lived connection per call, like the draft index
+        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+        conn = sqlite3.connect(self.db_path, timeout=10)
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        if version < self.SCHEMA_VERSION:
+            self.migrate(conn, version)
+        return conn
+
+    def migrate(self, conn, version):
+        with conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS note_tags (
+                    building TEXT NOT NULL,
+                    report_date TEXT NOT NULL,
+                    section TEXT NOT NULL,
+                    note_index INTEGER NOT NULL,
+                    tag TEXT,
+                    text TEXT NOT NULL,
+                    recorded_at TEXT NOT NULL,
+                    recorded_by TEXT NOT NULL DEFAULT ''
+                )""")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_note_tags_night ON note_tags (building, report_date)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_note_tags_tag ON note_tags (tag, report_date)")
+            conn.execute(f"PRAGMA user_version = {self.SCHEMA_VERSION}")
+
+    def replace_night(self, building_name, report_date, note_rows):
+        """Store a night's notes in place of any stored before"""
+        with closing(self.connect()) as conn, conn:
+            self._replace(conn, building_name, report_date, note_rows)
+
+    def replace_nights(self, nights):
+        """Store many nights ({(building, report date): note rows}) in one transaction"""
+        with closing(self.connect()) as conn, conn:
+            for (building_name, report_date), note_rows in nights.items():
+                self._replace(conn, building_name, report_date, note_rows)
+
+    def _replace(self, conn, building_name, report_date, note_rows):
+        recorded_at = datetime.now().isoformat(timespec="seconds")
+        recorded_by = getpass.getuser()
+        conn.execute("DELETE FROM note_tags WHERE building = ? AND report_date = ?", (building_name, report_date))
+        conn.executemany(
+            "INSERT INTO note_tags (building, report_date, section, note_index, tag, text, recorded_at, recorded_by) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            [(building_name, report_date, section, index, tag, text, recorded_at, recorded_by)
+             for section, index, tag, text in note_rows]
+        )
 
-                add_bold_section_header("Alumni Park")
-                
-                # Add alumni park notes with continuing counter
-                has_alumni_notes = False
-                for box in alumni_boxes:
-                    content = box.get("1.0", "end").strip()
-                    if content:
-                        has_alumni_notes = True
-                        add_indented_paragraph(note_counter, content)
-                        note_counter += 1
-                
-                # Add an empty numbered note if no content
-                if not has_alumni_notes:
-                    add_indented_paragraph(note_counter, "")
-                    note_counter += 1
+    def night_counts(self, categories):
+        """{(building, report date): {tag: count}} for the tally rows of every stored night"""
+        categories = set(categories)
+        with closing(self.connect()) as conn:
+            rows = conn.execute(
+                "SELECT building, report_date, tag, COUNT(*) FROM note_tags WHERE tag IS NOT NULL "
+                "GROUP BY building, report_date, tag"
+            ).fetchall()
+        nights = {}
+        for building_name, report_date, tag, count in rows:
+            if tag in categories:
+                nights.setdefault((building_name, report_date), {})[tag] = count
+        return nights
+
+    def frame(self):
+        """All rows as a pandas DataFrame, with the report's month and ISO week added"""
+        import pandas as pd
+        with closing(self.connect()) as conn:
+            frame = pd.read_sql_query(
+                "SELECT building, report_date, section, note_index, tag, text FROM note_tags", conn,
+                parse_dates=["report_date"]
+            )
+        frame["month"] = frame["report_date"].dt.month_name()
+        frame["week"] = frame["report_date"].dt.strftime("%G-W%V")
+        return frame
+
+def pivot_tally(frame, by="month"):
+    """Tagged rows counted per tag and per value of `by` (month, week, section, building, ...)"""
+    tagged = frame[frame["tag"].notna()]
+    return tagged.pivot_table(index="tag", columns=by, values="note_index", aggfunc="count", fill_value=0)
+
+# === Excel Tally ===
+# Each building keeps a yearly workbook with one row per tag and one column per month.
+# End Shift adds the report's tag counts to the current month's cells and leaves the
+# rest of the workbook alone, so formatting, charts, extra sheets and rows added by the
+# supervisors survive.
+#
+# Managers ending shifts at the same time would otherwise both read the workbook and
+# save over each other's counts, so the read-modify-write runs under a lock file next to
+# the workbook. Creating it is atomic on the share, and it records who holds it and
+# since when. A lock older than TALLY_LOCK_STALE_SECONDS is taken to be left behind by
+# a crashed run and is broken. The holder saves to a temp file, checks that it still
+# holds the lock and only then swaps the new workbook in.
+#
+# Each night's tag counts are also kept on a hidden "Nights" sheet in the workbook: what
+# the month cells hold for that night. An update first records the night in the note
+# store, then brings every night whose stored counts differ from that sheet in line by
+# applying the difference to its month. Running End Shift twice or regenerating a report
+# after a fix therefore replaces the night's counts instead of adding them again. The
+# ledger and the totals are saved in the same file replace, after the note store. If
+# the workbook save fails (the workbook open in Excel, say), the retry finds the night
+# in the store but not on the sheet and applies the full difference. "python
+# geNRator.py --rebuild-tally <workbook>" recomputes the months the store and the sheet
+# cover from scratch.
+
+TALLY_LOCK_TIMEOUT_SECONDS = 90  # Longer than the stale age, so a dead lock is always broken
+TALLY_LOCK_STALE_SECONDS = 60
+TALLY_LOCK_RETRY_SECONDS = 0.2
+TALLY_LOCK_RELEASE_ATTEMPTS = 3
+TALLY_LEDGER_SHEET = "Nights"
+
+TALLY_MONTHS = [
+    "January", "February", "March", "April", "May", "June",
+    "July", "August", "September", "October", "November", "December"
+]
+
+def tally_categories(building_name):
+    """Sorted tally rows for a building"""
+    if building_name == "Red Gym":
+        categories = set(RED_GYM_MISC_TAG_OPTIONS)
+    else:
+        # Master tag set from all tab tag lists, plus the special-case tags
+        categories = set()
+        for taglist in [MECHANICAL_TAG_OPTIONS, PRODUCTION_TAG_OPTIONS, PATRON_TAG_OPTIONS, ACCESS_TAG_OPTIONS, CASH_TAG_OPTIONS, DINING_TAG_OPTIONS, TERRACE_TAG_OPTIONS]:
+            categories.update(taglist)
+        categories.update(["Hotel Request", "Carding Support/Lead Carding", "Decibel checked",
+                           "Patron Services/inquires/General Assistance"])
+    categories.discard("None")
+    return sorted(categories)
+
+class TallyLockError(Exception):
+    """The tally lock couldn't be taken, or was lost before the update was saved"""
+
+class TallyLock:
+    """Lock file guarding one tally workbook's read-modify-write, in share storage"""
+
+    def __init__(self, storage, tally_path, timeout=TALLY_LOCK_TIMEOUT_SECONDS, stale_after=TALLY_LOCK_STALE_SECONDS):
+        self.storage = storage
+        self.path = f"{tally_path}.lock"
+        self.timeout = timeout
+        self.stale_after = stale_after
+        self.token = uuid.uuid4().hex
+        self.owner = f"{getpass.getuser()} on {socket.gethostname()}"
+        self.acquired = False
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.release()
+
+    def acquire(self):
+        deadline = time.monotonic() + self.timeout
+        while True:
+            info = {"owner": self.owner, "token": self.token, "acquired": time.time()}
+            try:
+                self.storage.create_exclusive(self.path, json.dumps(info).encode("utf-8"))
+            except FileExistsError:
+                self.break_if_stale()
+                if time.monotonic() > deadline:
+                    holder = (self.read() or {}).get("owner", "another computer")
+                    raise TallyLockError(f"Timed out waiting for {holder} to finish updating the tally")
+                # Jitter keeps waiting computers from retrying in lockstep
+                time.sleep(TALLY_LOCK_RETRY_SECONDS * random.uniform(0.5, 1.5))
+                continue
+            self.acquired = True
+            return
 
-                add_bold_section_header("Goodspeed Family Pier")
-                
-                # Add pier notes with continuing counter
-                has_pier_notes = False
-                for box in pier_boxes:
-                    content = box.get("1.0", "end").strip()
-                    if content:
-                        has_pier_notes = True
-                        add_indented_paragraph(note_counter, content)
-                        note_counter += 1
-                
-                # Add an empty numbered note if no content
-                if not has_pier_notes:
-                    add_indented_paragraph(note_counter, "")
-                    note_counter += 1
+    def read(self):
+        """The lock's contents, or None if it is gone or still being written"""
+        return self.read_file(self.path)
 
-            # === Dining Service & Markets ===
-            add_bold_section_header("Dining Service & Markets")
-            
-            # Add dining notes with continuing counter
-            has_dining_notes = False
-            for box in dining_boxes:
-                content = box.get("1.0", "end").strip()
-                if content:
-                    has_dining_notes = True
-                    add_indented_paragraph(note_counter, content)
-                    note_counter += 1
-            
-            # Add an empty numbered note if no content
-            if not has_dining_notes:
-                add_indented_paragraph(note_counter, "")
-                note_counter += 1
+    def read_file(self, path):
+        try:
+            return json.loads(self.storage.read_bytes(path))
+        except (OSError, ValueError):
+            return None
 
-            # === Hotel ===
-            add_bold_section_header("Hotel")
-            
-            # Add hotel notes with continuing counter
-            has_hotel_notes = False
-            for box in hotel_boxes:
-                content = box.get("1.0", "end").strip()
-                if content:
-                    has_hotel_notes = True
-                    add_indented_paragraph(note_counter, content)
-                    note_counter += 1
-            
-            # Add an empty numbered note if no content
-            if not has_hotel_notes:
-                add_indented_paragraph(note_counter, "")
-                note_counter += 1
+    def break_if_stale(self):
+        info = self.read()
+        try:
+            acquired = info["acquired"] if info else self.storage.getmtime(self.path)
+        except (OSError, KeyError, TypeError):
+            return  # Released in the meantime
+        if time.time() - acquired < self.stale_after:
+            return
+        # Move it aside first, then check that what moved is still the lock judged stale:
+        # another waiter may have broken it and taken a fresh lock since it was read
+        stale_path = f"{self.path}.{self.token}.stale"
+        try:
+            self.storage.replace(self.path, stale_path)
+        except OSError:
+            return
+        moved = self.read_file(stale_path)
+        if info != moved or (info is None and self.mtime(stale_path) != acquired):
+            self.restore(stale_path)
+            return
+        print(f"Warning: Breaking stale tally lock held by {(info or {}).get('owner', 'unknown')}")
+        try:
+            self.storage.remove(stale_path)
+        except OSError:
+            pass
 
-            # === Miscellaneous ===
-            add_bold_section_header("Miscellaneous")
-            
-            # Add miscellaneous notes with continuing counter
-            has_misc_notes = False
-            for box in misc_boxes:
-                content = box.get("1.0", "end").strip()
-                if content:
-                    has_misc_notes = True
-                    add_indented_paragraph(note_counter, content)
-                    note_counter += 1
-            
-            # Add an empty numbered note if no content
-            if not has_misc_notes:
-                add_indented_paragraph(note_counter, "")
-                note_counter += 1
+    def restore(self, stale_path):
+        """Put back a live lock moved aside by mistake, unless a newer lock has appeared"""
+        try:
+            self.storage.rename_noreplace(stale_path, self.path)
+        except OSError:
+            # Its owner finds the lock gone at its held() check and saves nothing
+            try:
+                self.storage.remove(stale_path)
+            except OSError:
+                pass
 
-            # === Security Section === Only for Memorial Union and Union South
-            add_bold_section_header("Security")  # Changed from "CSC Log"
+    def mtime(self, path):
+        try:
+            return self.storage.getmtime(path)
+        except OSError:
+            return None
 
-            table = doc.add_table(rows=1, cols=3)
-            table.style = 'Table Grid'
-            
-            hdr_cells = table.rows[0].cells
-            # Bold the headers
-            hdr_cells[0].paragraphs[0].add_run("Shift").bold = True
-            hdr_cells[1].paragraphs[0].add_run("Staff Requested").bold = True
-            hdr_cells[2].paragraphs[0].add_run("Staff Present").bold = True
-            
-            # Center-align header cells
-            for cell in hdr_cells:
-                for paragraph in cell.paragraphs:
-                    paragraph.alignment = 1  # 1 = CENTER
+    def held(self):
+        return (self.read() or {}).get("token") == self.token
 
-            for shift in csc_shifts:
-                req_val = csc_entries[shift]["requested"].get().strip()
-                pres_val = csc_entries[shift]["present"].get().strip()
-                names_val = csc_entries[shift]["names"].get().strip()
+    def release(self):
+        if not self.acquired:
+            return
+        self.acquired = False
+        # A lock left behind blocks every other computer until it goes stale, so a
+        # hiccup on the share is worth a couple more tries. Only a lock that reads as
+        # someone else's (ours was broken and taken over) is left alone; one that can't
+        # be read is still ours as far as we know.
+        for _ in range(TALLY_LOCK_RELEASE_ATTEMPTS):
+            info = self.read()
+            if info is not None and info.get("token") != self.token:
+                return
+            try:
+                self.storage.remove(self.path)
+                return
+            except FileNotFoundError:
+                return
+            except OSError as e:
+                error = e
+                time.sleep(TALLY_LOCK_RETRY_SECONDS)
+        print(f"Warning: Could not remove tally lock: {error}")
+
+def load_tally_sheet(storage, tally_path, categories, perf):
+    """(workbook, first sheet, tag -> row, month -> column), creating the workbook if needed"""
+    import openpyxl
+    from openpyxl.styles import Font
+    try:
+        with perf.phase("load_workbook"):
+            workbook = openpyxl.load_workbook(io.BytesIO(storage.read_bytes(tally_path)))
+    except FileNotFoundError:
+        workbook = None
+    if workbook is not None:
+        sheet = workbook.worksheets[0]
+    else:
+        workbook = openpyxl.Workbook()
+        sheet = workbook.active
+        sheet.append([None] + TALLY_MONTHS)
+        for category in categories:
+            sheet.append([category] + [0] * len(TALLY_MONTHS))
+        for cell in sheet[1] + sheet["A"]:
+            cell.font = Font(bold=True)
+    # Tag -> row and month -> column, read once from the labels
+    rows = {cell.value: cell.row for cell in sheet["A"][1:] if cell.value is not None}
+    columns = {cell.value: cell.column for cell in sheet[1] if cell.value is not None}
+    return workbook, sheet, rows, columns
+
+def tally_cell(sheet, rows, columns, category, month):
+    """The cell for a tag and month, adding a row at the bottom or a month column if missing"""
+    from openpyxl.styles import Font
+    if month not in columns:
+        columns[month] = sheet.max_column + 1
+        sheet.cell(row=1, column=columns[month], value=month).font = Font(bold=True)
+    if category not in rows:
+        rows[category] = sheet.max_row + 1
+        sheet.cell(row=rows[category], column=1, value=category).font = Font(bold=True)
+        for column in columns.values():
+            sheet.cell(row=rows[category], column=column, value=0)
+    return sheet.cell(row=rows[category], column=columns[month])
+
+def tally_ledger(workbook):
+    """{(building, report date): {tag: count}} from the ledger sheet, or None if there is none"""
+    if TALLY_LEDGER_SHEET not in workbook.sheetnames:
+        return None
+    nights = {}
+    for building_name, report_date, tag, count in workbook[TALLY_LEDGER_SHEET].iter_rows(min_row=2, values_only=True):
+        if tag is not None:
+            nights.setdefault((building_name, report_date), {})[tag] = count
+    return nights
+
+def write_tally_ledger(workbook, nights):
+    """Replace the ledger sheet (hidden, after the tally sheet) with nights"""
+    if TALLY_LEDGER_SHEET in workbook.sheetnames:
+        del workbook[TALLY_LEDGER_SHEET]
+    sheet = workbook.create_sheet(TALLY_LEDGER_SHEET)
+    sheet.sheet_state = "hidden"
+    sheet.append(["Building", "Report date", "Tag", "Count"])
+    for (building_name, report_date), counts in sorted(nights.items()):
+        for tag, count in sorted(counts.items()):
+            sheet.append([building_name, report_date, tag, count])
+
+def save_tally_workbook(storage, workbook, tally_path, lock, perf):
+    tmp_path = f"{tally_path}.{lock.token}.tmp"
+    try:
+        with perf.phase("save_workbook"):
+            buffer = io.BytesIO()
+            workbook.save(buffer)
+            storage.write_bytes(tmp_path, buffer.getvalue())
+        if not lock.held():
+            raise TallyLockError("The tally lock expired before the update was saved, so the tally was not changed")
+        storage.replace(tmp_path, tally_path)
+    except BaseException:
+        try:
+            storage.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+def apply_tally_nights(sheet, rows, columns, ledger, nights):
+    """Bring the month cells and the ledger in line with nights, night by night"""
+    for night, counts in nights.items():
+        previous = ledger.get(night, {})
+        if counts == previous:
+            continue
+        month = TALLY_MONTHS[int(night[1][5:7]) - 1]
+        for category in sorted(set(counts) | set(previous)):
+            change = counts.get(category, 0) - previous.get(category, 0)
+            if change:
+                cell = tally_cell(sheet, rows, columns, category, month)
+                cell.value = (cell.value if isinstance(cell.value, (int, float)) else 0) + change
+        ledger[night] = counts
+
+def update_tally(storage, tally_path, report_date, building_name, categories, note_rows, perf):
+    """Record one night's notes in the note store and bring the workbook in line with it.
+
+    A night that was counted before gets its old counts replaced, not added to."""
+    date_key = report_date.strftime("%Y-%m-%d")
+    with TallyLock(storage, tally_path) as lock, open_note_store(storage, tally_path) as store:
+        with perf.phase("note_store"):
+            store.replace_night(building_name, date_key, note_rows)
+            nights = store.night_counts(categories)
+        workbook, sheet, rows, columns = load_tally_sheet(storage, tally_path, categories, perf)
+        ledger = tally_ledger(workbook) or {}
+        apply_tally_nights(sheet, rows, columns, ledger, nights)
+        write_tally_ledger(workbook, ledger)
+        save_note_store(storage, store, tally_path, lock, perf)
+        save_tally_workbook(storage, workbook, tally_path, lock, perf)
+
+def tally_building(tally_path):
+    """The building a tally workbook belongs to, from its MU_/US_/RG_ prefix"""
+    prefix = os.path.basename(tally_path).split("_")[0]
+    return {short: name for name, short in BUILDING_SHORT_NAMES.items()}.get(prefix, "Union South")
+
+def rebuild_tally(storage, tally_path, perf, nights=None):
+    """Recompute every month the note store and the ledger cover with one pivot; returns
+    those months.
+
+    nights ({(building, report date): note rows}) replace those nights in the store first.
+    The store's counts win over the ledger's; nights only the ledger has (from before the
+    store) still count. Other months and rows that aren't tags are left as they are."""
+    import pandas as pd
+    categories = tally_categories(tally_building(tally_path))
+    with TallyLock(storage, tally_path) as lock, open_note_store(storage, tally_path) as store:
+        with perf.phase("note_store"):
+            if nights:
+                store.replace_nights(nights)
+            stored = store.night_counts(categories)
+        workbook, sheet, rows, columns = load_tally_sheet(storage, tally_path, categories, perf)
+        ledger = tally_ledger(workbook) or {}
+        ledger.update(stored)
+        if not ledger:
+            return []
+        frame = pd.DataFrame(
+            [(report_date, tag, count) for (_, report_date), counts in ledger.items() for tag, count in counts.items()],
+            columns=["report_date", "tag", "count"]
+        )
+        frame["month"] = pd.to_datetime(frame["report_date"]).dt.month_name()
+        monthly = frame.pivot_table(index="tag", columns="month", values="count", aggfunc="sum", fill_value=0)
+        covered = {TALLY_MONTHS[int(report_date[5:7]) - 1] for _, report_date in ledger}
+        months = [month for month in TALLY_MONTHS if month in covered]
+        for month in months:
+            for category in categories:
+                count = monthly.at[category, month] if category in monthly.index and month in monthly.columns else 0
+                tally_cell(sheet, rows, columns, category, month).value = int(count)
+        write_tally_ledger(workbook, ledger)
+        if nights:
+            save_note_store(storage, store, tally_path, lock, perf)
+        save_tally_workbook(storage, workbook, tally_path, lock, perf)
+    return months
+
+# === Tally Backfill ===
+# After a tag list changes, earlier nights can be recounted with the current lists:
+#     python geNRator.py --backfill-tally "Memorial Union" 2025
+# This scans the year's month folders on the share for final drafts (saved by End Shift
+# next to each report) and leftover drafts. Each night's notes replace those in the
+# note store beside the workbook, and the months are recomputed from it. Nights that only have a .docx are looked up in this PC's draft index.
+# Parse results are cached locally by path, size and modification time, so a rerun only
+# reads files that changed. The files are read on a thread pool: the work is mostly
+# waiting on the share, and worker processes would each have to re-run this whole Tk
+# script on Windows.
+
+BACKFILL_WORKERS = 8
+BACKFILL_PARSE_VERSION = 1  # Bump when report_note_rows changes, to reparse everything
+FINAL_DRAFTS_FOLDER = "final_drafts"
+
+def archived_draft_files(year_dir):
+    """(path, mtime, size, is_final) of every draft JSON in the year's month folders"""
+    files = []
+    for month in TALLY_MONTHS:
+        for folder, is_final in ((FINAL_DRAFTS_FOLDER, True), ("drafts", False)):
+            try:
+                entries = list(os.scandir(os.path.join(year_dir, month, folder)))
+            except OSError:
+                continue
+            for entry in entries:
+                if entry.name.endswith(".json") and entry.is_file():
+                    stat = entry.stat()
+                    files.append((entry.path, stat.st_mtime, stat.st_size, is_final))
+    return files
+
+def archived_report_dates(year_dir):
+    """ISO dates of the .docx reports (named M-D-YY.docx) in the year's month folders"""
+    dates = set()
+    for month in TALLY_MONTHS:
+        try:
+            names = os.listdir(os.path.join(year_dir, month))
+        except OSError:
+            continue
+        for name in names:
+            try:
+                dates.add(datetime.strptime(name[:-5], "%m-%d-%y").strftime("%Y-%m-%d"))
+            except ValueError:
+                continue  # Not a report
+    return dates
+
+def draft_night(data):
+    """Building, report date, save time and note store rows of one draft"""
+    report = ReportModel()
+    report.load_draft(data)
+    return {
+        "building": report.building,
+        "report_date": report_date_key(data),
+        "timestamp": str(data.get("timestamp", "")),
+        "rows": report_note_rows(report, ReportNotes(report))
+    }
 
-                # Format names in parentheses only if present is a number
-                pres_display = pres_val
-                if pres_val.isdigit() and names_val:
-                    pres_display = f"{pres_val} ({names_val})"
+def parse_archived_draft(path):
+    with open(path, encoding="utf-8") as f:
+        return draft_night(json.load(f))
+
+class BackfillCache:
+    """Local SQLite cache of parsed draft files, valid while their size and mtime match"""
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+
+    def connect(self):
+        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+        conn = sqlite3.connect(self.db_path, timeout=10)
+        with conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS parsed (
+                    path TEXT PRIMARY KEY,
+                    mtime REAL NOT NULL,
+                    size INTEGER NOT NULL,
+                    version INTEGER NOT NULL,
+                    result TEXT NOT NULL
+                )""")
+        return conn
+
+    def lookup(self, files):
+        """path -> parse result for the files that haven't changed since they were parsed"""
+        with closing(self.connect()) as conn:
+            cached = {path: (mtime, size, version, result) for path, mtime, size, version, result
+                      in conn.execute("SELECT path, mtime, size, version, result FROM parsed")}
+        results = {}
+        for path, mtime, size, _ in files:
+            entry = cached.get(path)
+            if entry and entry[:3] == (mtime, size, BACKFILL_PARSE_VERSION):
+                results[path] = json.loads(entry[3])
+        return results
+
+    def store(self, entries):
+        """Save (path, mtime, size, result) parse results"""
+        with closing(self.connect()) as conn, conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO parsed (path, mtime, size, version, result) VALUES (?, ?, ?, ?, ?)",
+                [(path, mtime, size, BACKFILL_PARSE_VERSION, json.dumps(result, ensure_ascii=False))
+                 for path, mtime, size, result in entries]
+            )
 
-                row = table.add_row().cells
-                
-                # Bold the shift name - no tab character needed
-                shift_run = row[0].paragraphs[0].add_run(shift)
-                shift_run.bold = True
-                
-                # Set text directly
-                row[1].text = req_val if req_val else "-"
-                row[2].text = pres_display if pres_display else "-"
-                
-                # Center-align all cells in this row
-                for cell in row:
-                    for paragraph in cell.paragraphs:
-                        paragraph.alignment = 1  # 1 = CENTER
+def backfill_tally(building_name, year, perf):
+    """Recount a year's nights from archived drafts into the note store and workbook.
 
-        # Excel Tally Update - Only for non-Red Gym buildings
-        if building != "Red Gym":
-            try:
-                # Extract year and date for folder and filename
-                user_date = entries["date"].get()
-                parsed_date = datetime.strptime(user_date, "%A, %B %d, %Y")
-                current_year = parsed_date.strftime("%Y")
-                current_month = parsed_date.strftime("%B")
-                # Build master tag set from all tab tag lists
-                master_tag_set = set()
-                for taglist in [MECHANICAL_TAG_OPTIONS, PRODUCTION_TAG_OPTIONS, PATRON_TAG_OPTIONS, ACCESS_TAG_OPTIONS, CASH_TAG_OPTIONS, DINING_TAG_OPTIONS, TERRACE_TAG_OPTIONS]:
-                    master_tag_set.update(tag for tag in taglist if tag != "None")
-                # Add special-case tags
-                master_tag_set.add("Hotel Request")
-                master_tag_set.add("Carding Support/Lead Carding")
-                master_tag_set.add("Decibel checked")
-                master_tag_set.add("Patron Services/inquires/General Assistance")
-                categories = sorted(master_tag_set)
-                months = [
-                    "January", "February", "March", "April", "May", "June",
-                    "July", "August", "September", "October", "November", "December"
-                ]
-                # Create year folder in building-specific directory
-                base_dir = f"M:\\Sh_BM\\{building}\\Night Reports"
-                year_dir = os.path.join(base_dir, current_year)
-                os.makedirs(year_dir, exist_ok=True)
-                # Save tally as building_Tally_YYYY.xlsx in year folder
-                building_short = "MU" if building == "Memorial Union" else "US"
-                tally_filename = f"{building_short}_Tally_{current_year}.xlsx"
-                tally_path = os.path.join(year_dir, tally_filename)
-                # Load or create the Excel file for the current year/building
-                if os.path.exists(tally_path):
-                    df = pd.read_excel(tally_path, index_col=0)
-                    for category in categories:
-                        if category not in df.index:
-                            df.loc[category] = [0] * len(df.columns)
-                    # Remove any rows not in master list
-                    for row in list(df.index):
-                        if row not in categories:
-                            df = df.drop(row)
-                else:
-                    df = pd.DataFrame(0, index=categories, columns=months)
-                # Tally tags for all notes
-                tag_counts = {cat: 0 for cat in categories}
-                # Mechanical
-                for tag_var_list, box in zip(mechanical_note_tags, mechanical_boxes):
-                    content = box.get("1.0", "end").strip()
-                    if not content:
-                        continue
-                    tags = set(var.get() for var in tag_var_list if var.get() != "None")
-                    for tag in tags:
-                        tag_counts[tag] += 1
-                # Production
-                for tag_var_list, box in zip(production_note_tags, production_boxes):
-                    content = box.get("1.0", "end").strip()
-                    if not content:
-                        continue
-                    tags = set(var.get() for var in tag_var_list if var.get() != "None")
-                    for tag in tags:
-                        tag_counts[tag] += 1
-                # Patron
-                for tag_var_list, box in zip(patron_note_tags, patron_boxes):
-                    content = box.get("1.0", "end").strip()
-                    if not content:
-                        continue
-                    tags = set(var.get() for var in tag_var_list if var.get() != "None")
-                    if tags:
-                        for tag in tags:
-                            tag_counts[tag] += 1
-                    else:
-                        # If no tag but text, count as General Assistance
-                        tag_counts["Patron Services/inquires/General Assistance"] += 1
-                # Access
-                for tag_var_list, box in zip(access_note_tags, access_note_boxes):
-                    content = box.get("1.0", "end").strip()
-                    if not content:
-                        continue
-                    tags = set(var.get() for var in tag_var_list if var.get() != "None")
-                    for tag in tags:
-                        tag_counts[tag] += 1
-                # Cash
-                for tag_var_list, box in zip(cash_note_tags, cash_boxes):
-                    content = box.get("1.0", "end").strip()
-                    if not content:
-                        continue
-                    tags = set(var.get() for var in tag_var_list if var.get() != "None")
-                    for tag in tags:
-                        tag_counts[tag] += 1
-                # Dining
-                for tag_var_list, box in zip(dining_note_tags, dining_boxes):
-                    content = box.get("1.0", "end").strip()
-                    if not content:
-                        continue
-                    tags = set(var.get() for var in tag_var_list if var.get() != "None")
-                    for tag in tags:
-                        tag_counts[tag] += 1
-                # Memorial Union specific sections
-                if building == "Memorial Union":
-                    # Enforcement
-                    for tag_var_list, box in zip(enforcement_note_tags, enforcement_boxes):
-                        content = box.get("1.0", "end").strip()
-                        if not content:
-                            continue
-                        tags = set(var.get() for var in tag_var_list if var.get() != "None")
-                        for tag in tags:
-                            tag_counts[tag] += 1
-                    # Alumni
-                    for tag_var_list, box in zip(alumni_note_tags, alumni_boxes):
-                        content = box.get("1.0", "end").strip()
-                        if not content:
-                            continue
-                        tags = set(var.get() for var in tag_var_list if var.get() != "None")
-                        for tag in tags:
-                            tag_counts[tag] += 1
-                    # Pier
-                    for tag_var_list, box in zip(pier_note_tags, pier_boxes):
-                        content = box.get("1.0", "end").strip()
-                        if not content:
-                            continue
-                        tags = set(var.get() for var in tag_var_list if var.get() != "None")
-                        for tag in tags:
-                            tag_counts[tag] += 1
-                # Hotel (special case)
-                for box in hotel_boxes:
-                    content = box.get("1.0", "end").strip()
-                    if content:
-                        tag_counts["Hotel Request"] +=   1
-                # Decibel (special case)
-                if any(time.get().strip() and time.get().strip() != "Time" for time, _, _ in decibel_entries):
-                    tag_counts["Decibel checked"] += 1
-                # Write tallies to Excel
-                for category, count in tag_counts.items():
-                    if category in df.index and current_month in df.columns:
-                        df.loc[category, current_month] += count
-                df = df.loc[categories]  # Ensure order
-                df.to_excel(tally_path)
-            except Exception as e:
-                messagebox.showerror("Excel Error", f"Failed to update Excel tally: {e}")
+    Returns a summary dict: nights recorded, report dates with no draft anywhere,
+    files parsed and reused from the cache, and the months recomputed."""
+    from concurrent.futures import ThreadPoolExecutor
+    year_dir = os.path.join(share_storage.reports_dir(building_name), str(year))
+    tally_path = os.path.join(year_dir, f"{BUILDING_SHORT_NAMES[building_name]}_Tally_{year}.xlsx")
+    cache = BackfillCache(os.path.join(LOCAL_DATA_DIR, "backfill_cache.sqlite3"))
+    
+    files = archived_draft_files(year_dir)
+    results = cache.lookup(files)
+    to_parse = [file for file in files if file[0] not in results]
+    
+    def parse(file):
+        try:
+            return file, parse_archived_draft(file[0])
+        except (OSError, ValueError, AttributeError) as e:
+            print(f"Warning: Skipping {file[0]}: {e}")
+            return file, None
+    with perf.phase("parse_drafts"), ThreadPoolExecutor(max_workers=BACKFILL_WORKERS) as pool:
+        parsed = [(file, result) for file, result in pool.map(parse, to_parse) if result]
+    cache.store([(path, mtime, size, result) for (path, mtime, size, _), result in parsed])
+    results.update((file[0], result) for file, result in parsed)
+    
+    # Best source per night: a final draft over leftover drafts, then the latest save
+    nights = {}
+    for path, mtime, size, is_final in files:
+        result = results.get(path)
+        if not result or result["building"] != building_name or not result["report_date"].startswith(f"{year}-"):
+            continue
+        rank = (is_final, result["timestamp"], mtime)
+        if result["report_date"] not in nights or rank > nights[result["report_date"]][0]:
+            nights[result["report_date"]] = (rank, result["rows"])
+    
+    # Nights that only have a report: this PC's draft index may still hold the last save
+    unrecovered = []
+    draft_store = get_draft_store(building_name)
+    for date_key in sorted(archived_report_dates(year_dir) - set(nights)):
+        history = draft_store.history(date_key) if os.path.exists(draft_store.db_path) else []
+        if history:
+            nights[date_key] = (None, draft_night(draft_store.load(history[-1][0]))["rows"])
         else:
-            # Red Gym Excel Tally Update
-            try:
-                # Extract year and date for folder and filename
-                user_date = entries["date"].get()
-                parsed_date = datetime.strptime(user_date, "%A, %B %d, %Y")
-                current_year = parsed_date.strftime("%Y")
-                current_month = parsed_date.strftime("%B")
-                # Build Red Gym tag set
-                red_gym_tag_set = set()
-                for taglist in [RED_GYM_MISC_TAG_OPTIONS]:
-                    red_gym_tag_set.update(tag for tag in taglist if tag != "None")
-                categories = sorted(red_gym_tag_set)
-                months = [
-                    "January", "February", "March", "April", "May", "June",
-                    "July", "August", "September", "October", "November", "December"
-                ]
-                # Create year folder in Red Gym directory
-                base_dir = f"M:\\Sh_BM\\{building}\\Night Reports"
-                year_dir = os.path.join(base_dir, current_year)
-                os.makedirs(year_dir, exist_ok=True)
-                # Save tally as RG_Tally_YYYY.xlsx in year folder
-                tally_filename = f"RG_Tally_{current_year}.xlsx"
-                tally_path = os.path.join(year_dir, tally_filename)
-                # Load or create the Excel file for the current year/building
-                if os.path.exists(tally_path):
-                    df = pd.read_excel(tally_path, index_col=0)
-                    for category in categories:
-                        if category not in df.index:
-                            df.loc[category] = [0] * len(df.columns)
-                    # Remove any rows not in master list
-                    for row in list(df.index):
-                        if row not in categories:
-                            df = df.drop(row)
-                else:
-                    df = pd.DataFrame(0, index=categories, columns=months)
-                # Tally tags for Red Gym misc notes
-                tag_counts = {cat: 0 for cat in categories}
-                # Red Gym Misc
-                for tag_var_list, box in zip(misc_note_tags, red_gym_misc_boxes):
-                    content = box.get("1.0", "end").strip()
+            unrecovered.append(date_key)
+    
+    months = rebuild_tally(share_storage, tally_path, perf,
+                           {(building_name, date_key): rows for date_key, (_, rows) in nights.items()})
+    return {"nights": sorted(nights), "unrecovered": unrecovered, "parsed": len(parsed),
+            "cached": len(files) - len(to_parse), "months": months}
+
+# === Report Templates ===
+# The report is filled into a building-specific Word template instead of being built
+# run by run. The template holds the heading and staff lines as {{placeholders}} plus a
+# {{notes}} paragraph. The numbered notes and tables are rendered as one block of XML in
+# the template's named styles and spliced in where {{notes}} sits. To restyle a report,
+# copy its default template from the local data folder to REPORT_TEMPLATE_DIR as
+# "<building>.docx" and edit the Report styles in Word. If the template can't be
+# opened, the report is rendered into the built-in one instead.
+
+REPORT_TEMPLATE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "templates")
+DEFAULT_TEMPLATE_DIR = os.path.join(LOCAL_DATA_DIR, "templates")
+REPORT_TEMPLATE_VERSION = 1  # Bump whenever default_template changes
+PLACEHOLDER_PATTERN = re.compile(r"\{\{\s*(\w+)\s*\}\}")
+INVALID_XML_CHARS = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f]")
+WORD_NAMESPACE = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+
+# Staff lines under the heading: (label, entries key)
+REPORT_HEADER_FIELDS = [
+    ("Date", "date"),
+    ("Shift Hours", "shift_hours"),
+    ("Building Manager(s)", "bms"),
+    ("Terrace Manager(s)", "terrace_managers"),
+    ("Event Manager(s)", "eventmanagers"),
+    ("Guest Service Specialist", "gss"),
+    ("Operation Manager(s)", "operation_managers"),
+    ("Custodial Supervisor(s)", "custodial"),
+    ("Production Supervisor(s)", "production"),
+    ("Retail & Dining Supervisor(s)", "retail"),
+    ("Catering Supervisor(s)", "catering"),
+    ("CAVR Desk Staff", "cavr"),
+]
+
+# Named styles the renderer uses: name -> (kind, bold, left indent in inches, centered)
+REPORT_STYLES = {
+    "Report Section": ("paragraph", True, 0, False),
+    "Report Note": ("paragraph", False, 0.25, False),
+    "Report Sub Note": ("paragraph", False, 0.75, False),
+    "Report Table Text": ("paragraph", False, 0, True),
+    "Report Emphasis": ("character", True, 0, False),
+}
+
+def report_header_fields(building_name):
+    """Staff lines printed for a building"""
+    if building_name == "Red Gym":
+        return REPORT_HEADER_FIELDS[:3]
+    if building_name != "Memorial Union":
+        return [field for field in REPORT_HEADER_FIELDS if field[1] != "terrace_managers"]
+    return REPORT_HEADER_FIELDS
+
+def ensure_report_styles(doc):
+    """Add any Report style the template lacks and return style name -> style id"""
+    from docx.enum.style import WD_STYLE_TYPE
+    from docx.enum.text import WD_ALIGN_PARAGRAPH
+    from docx.shared import Inches
+    existing = {style.name for style in doc.styles}
+    for name, (kind, bold, indent, centered) in REPORT_STYLES.items():
+        if name in existing:
+            continue
+        if kind == "character":
+            style = doc.styles.add_style(name, WD_STYLE_TYPE.CHARACTER)
+        else:
+            style = doc.styles.add_style(name, WD_STYLE_TYPE.PARAGRAPH)
+            style.base_style = doc.styles["Normal"]
+            if indent:
+                style.paragraph_format.left_indent = Inches(indent)
+            if centered:
+                style.paragraph_format.alignment = WD_ALIGN_PARAGRAPH.CENTER
+        if bold:
+            style.font.bold = True
+    style_ids = {name: doc.styles[name].style_id for name in REPORT_STYLES}
+    style_ids["Table Grid"] = doc.styles["Table Grid"].style_id if "Table Grid" in existing else None
+    return style_ids
+
+def default_template(building_name):
+    """The built-in template for a building, as an unsaved document"""
+    from docx import Document
+    doc = Document()
+    ensure_report_styles(doc)
+    doc.add_heading("{{building}}\nBUILDING MANAGER'S NIGHT REPORT", level=1)
+    for label, key in report_header_fields(building_name):
+        p = doc.add_paragraph()
+        p.add_run(f"{label}: ", style="Report Emphasis")
+        p.add_run(f"{{{{{key}}}}}")
+    doc.add_paragraph("\nNotes:", style="Report Section")
+    doc.add_paragraph("{{notes}}")
+    return doc
+
+def write_default_template(building_name, path):
+    """Save the built-in template for a building"""
+    doc = default_template(building_name)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    doc.save(tmp_path)
+    os.replace(tmp_path, path)
+
+def open_report_template(building_name):
+    """Open the building's template, preferring a customized one in REPORT_TEMPLATE_DIR"""
+    from docx import Document
+    path = os.path.join(REPORT_TEMPLATE_DIR, f"{building_name}.docx")
+    if not os.path.exists(path):
+        path = os.path.join(DEFAULT_TEMPLATE_DIR, f"{building_name} v{REPORT_TEMPLATE_VERSION}.docx")
+        if not os.path.exists(path):
+            write_default_template(building_name, path)
+    return Document(path)
+
+def template_paragraphs(doc):
+    """Body paragraphs, then those of any page header or footer the template defines"""
+    yield from doc.paragraphs
+    for section in doc.sections:
+        for part in (section.header, section.footer):
+            if not part.is_linked_to_previous:
+                yield from part.paragraphs
+
+def fill_placeholders(doc, values):
+    """Replace {{name}} placeholders in one pass; returns the {{notes}} paragraph, if any.
+
+    Unknown placeholders are left as they are so a typo shows up in the report."""
+    notes_paragraph = None
+    substitute = lambda match: values.get(match.group(1), match.group(0))
+    for paragraph in template_paragraphs(doc):
+        text = paragraph.text
+        if "{{" not in text:
+            continue
+        match = PLACEHOLDER_PATTERN.fullmatch(text.strip())
+        if match and match.group(1) == "notes":
+            notes_paragraph = paragraph
+            continue
+        for run in paragraph.runs:
+            if "{{" in run.text:
+                run.text = PLACEHOLDER_PATTERN.sub(substitute, run.text)
+        # Word sometimes splits a placeholder over several runs; then the paragraph
+        # takes the first run's formatting
+        runs = paragraph.runs
+        if runs and any(match.group(1) in values for match in PLACEHOLDER_PATTERN.finditer(paragraph.text)):
+            runs[0].text = PLACEHOLDER_PATTERN.sub(substitute, paragraph.text)
+            for run in runs[1:]:
+                run.text = ""
+    return notes_paragraph
+
+class ReportBody:
+    """The numbered notes and tables of a report, collected as WordprocessingML and
+    parsed into the template in one go"""
+
+    def __init__(self, doc, style_ids):
+        self.doc = doc
+        self.style_ids = style_ids
+        self.parts = []
+        self.pictures = []  # Inline picture elements, in document order
+        self.counter = 0  # Notes are numbered across all sections
+        section = doc.sections[-1]
+        try:
+            # Text width in twentieths of a point, as Word sizes table columns
+            self.text_width = (section.page_width - section.left_margin - section.right_margin) // 635
+        except TypeError:
+            self.text_width = 9360  # 6.5 inches when the template doesn't say
+
+    def run(self, text, emphasized=False):
+        props = f'<w:rPr><w:rStyle w:val="{self.style_ids["Report Emphasis"]}"/></w:rPr>' if emphasized else ""
+        pieces = []
+        for i, line in enumerate(INVALID_XML_CHARS.sub("", text).split("\n")):
+            if i:
+                pieces.append("<w:br/>")
+            for j, chunk in enumerate(line.split("\t")):
+                if j:
+                    pieces.append("<w:tab/>")
+                if chunk:
+                    pieces.append(f'<w:t xml:space="preserve">{xml_escape(chunk)}</w:t>')
+        return f"<w:r>{props}{''.join(pieces)}</w:r>"
+
+    def paragraph(self, style, segments):
+        """Paragraph XML from strings (plain) and (text, emphasized) pairs"""
+        runs = "".join(self.run(segment) if isinstance(segment, str) else self.run(*segment) for segment in segments)
+        return f'<w:p><w:pPr><w:pStyle w:val="{self.style_ids[style]}"/></w:pPr>{runs}</w:p>'
+
+    def section(self, title):
+        self.parts.append(self.paragraph("Report Section", [title]))
+
+    def note(self, *segments):
+        self.counter += 1
+        self.parts.append(self.paragraph("Report Note", [(f"{self.counter}. ", True), *segments]))
+
+    def sub_note(self, letter, content):
+        self.parts.append(self.paragraph("Report Sub Note", [(f"{letter}. ", True), content]))
+
+    def note_section(self, title, notes, empty_text=""):
+        """A section header and its non-empty notes, or one numbered empty_text"""
+        self.section(title)
+        contents = [note.text for note in notes if note.text] or [empty_text]
+        for content in contents:
+            self.note(content)
+
+    def table(self, rows):
+        """A grid of centered cells; each cell is a string or a (text, emphasized) pair"""
+        column_width = self.text_width // len(rows[0])
+        grid_style = self.style_ids["Table Grid"]
+        parts = ["<w:tbl><w:tblPr>"]
+        if grid_style:
+            parts.append(f'<w:tblStyle w:val="{grid_style}"/>')
+        parts.append('<w:tblW w:type="auto" w:w="0"/><w:tblLook w:firstRow="1" w:firstColumn="1" w:lastRow="0" w:lastColumn="0" w:noHBand="0" w:noVBand="1" w:val="04A0"/></w:tblPr><w:tblGrid>')
+        parts.append(f'<w:gridCol w:w="{column_width}"/>' * len(rows[0]))
+        parts.append("</w:tblGrid>")
+        for row in rows:
+            parts.append("<w:tr>")
+            for cell in row:
+                parts.append(f'<w:tc><w:tcPr><w:tcW w:type="dxa" w:w="{column_width}"/></w:tcPr>')
+                parts.append(self.paragraph("Report Table Text", [cell]))
+                parts.append("</w:tc>")
+            parts.append("</w:tr>")
+        parts.append("</w:tbl>")
+        self.parts.append("".join(parts))
+
+    def picture(self, path, width_in, height_in):
+        """A picture on its own line (raises if the image can't be read)"""
+        from docx.shared import Inches
+        self.pictures.append(self.doc.part.new_pic_inline(path, Inches(width_in), Inches(height_in)))
+        self.parts.append("<w:p><w:r><w:drawing/></w:r></w:p>")
+
+    def render_into(self, placeholder):
+        """Replace the placeholder paragraph with everything collected"""
+        from docx.oxml import parse_xml
+        from docx.oxml.ns import qn
+        body = parse_xml(f'<w:body xmlns:w="{WORD_NAMESPACE}">{"".join(self.parts)}</w:body>')
+        drawings = list(body.iter(qn("w:drawing")))
+        for drawing, inline in zip(drawings, self.pictures):
+            drawing.append(inline)
+        anchor = placeholder._p
+        for element in list(body):
+            anchor.addprevious(element)
+        anchor.getparent().remove(anchor)
+
+def write_red_gym_notes(body, report, notes):
+    body.note_section("Building Traffic", notes["building_traffic"])
+
+    body.section("Security")
+    tours = report.red_gym.get("red_gym_building_tours", "").strip()
+    body.note(f"Building Tours: {tours}" if tours else "Building Tours:")
+    num_deviations = int(report.red_gym.get("red_gym_deviations_count") or "0")
+    body.note("There were ", (str(num_deviations), True), " deviations from the standard building locking protocol today.")
+    if num_deviations > 0:
+        for i, note in enumerate(notes["red_gym_deviations"]):
+            body.sub_note(chr(97 + i), note.text)  # a, b, c, etc.
+    door_time = report.red_gym.get("red_gym_door_check_time", "").strip()
+    door_day_type = report.red_gym.get("red_gym_door_check_day_type", "")
+    body.note("I checked to confirm that the Building Doors were locked and the door swipe scanner was red at ",
+              (door_time, True), " on a ", (door_day_type, True), ".")
+
+    body.note_section("Mail", notes["red_gym_mail"])
+    body.note_section("Miscellaneous", notes["red_gym_misc"], empty_text="None")
+
+def write_union_notes(body, report, notes, job, perf):
+    """Notes and tables for Memorial Union and Union South"""
+    body.note_section("Building Traffic", notes["building_traffic"])
+    body.note_section("Mechanical/Repairs/Custodial", notes["mechanical"])
+    body.note_section("Production Services (Meetings, Events, Set-ups, AV)", notes["production"])
+
+    if notes.decibel_readings:
+        body.section("Decibel Readings")
+        rows = [[("Time", True), ("Reading (dB)", True), ("Location", True)]]
+        for reading_time, reading, location in notes.decibel_readings:
+            # Skip readings that are blank or still show the entry hints
+            if reading_time and reading and location and reading_time != "Time" and reading != "Reading (db)" and location != "Location":
+                rows.append([reading_time, reading, location])
+        body.table(rows)
+
+    body.note_section("Patron Services (Membership, Patron Assistance, Problem Patrons)", notes["patron"])
+
+    # The access checks are fixed sentences with the entered values in bold
+    access_values = report.access_inputs
+    value = lambda key: (access_values.get(key, ""), True)
+    lower = lambda key: (access_values.get(key, "").lower(), True)
+    body.section("Access/Lock/Unlock")
+    body.note("At the early check, the loading dock arm gate was ", lower("early_gate"), " at ", value("early_time"), ".")
+    body.note("At the closing check, the loading dock arm gate was ", lower("close_gate"), " at ", value("close_time"), ".")
+    body.note("At the closing check, the HID scanners were ", lower("hid_status"), ".")
+    body.note("I ", lower("door_status"), " secured the loading dock overhead door for the night.")
+    for note in notes["access"]:
+        if note.text:
+            body.note(note.text)
+
+    body.note_section("Cash Office", notes["cash"])
+
+    if report.building == "Memorial Union":
+        body.note_section("Carding Runs", notes["carding"])
+        body.note_section("Terrace Traffic", notes["terrace"])
+
+        body.section("Terrace Enforcement")
+        has_enforcement_notes = False
+        for note in notes["enforcement"]:
+            content = note.text
+            if note.image_path:
+                job.check_cancelled()  # Photos are the slow part of the document
+                try:
+                    with perf.phase("prepare_photo"):
+                        photo_path = prepare_report_photo(note.image_path)
+                    with perf.phase("add_picture"):
+                        body.picture(photo_path, PHOTO_WIDTH_IN, PHOTO_HEIGHT_IN)
+                except Exception:
+                    # If the image can't be embedded, keep just the description
                     if not content:
                         continue
-                    tags = set(var.get() for var in tag_var_list if var.get() != "None")
-                    for tag in tags:
-                        tag_counts[tag] += 1
-                # Write tallies to Excel
-                for category, count in tag_counts.items():
-                    if category in df.index and current_month in df.columns:
-                        df.loc[category, current_month] += count
-                df = df.loc[categories]  # Ensure order
-                df.to_excel(tally_path)
-            except Exception as e:
-                messagebox.showerror("Excel Error", f"Failed to update Red Gym Excel tally: {e}")
+                # The description is numbered even when empty, under its photo
+                body.note(content)
+                has_enforcement_notes = True
+            elif content:
+                body.note(content)
+                has_enforcement_notes = True
+        if not has_enforcement_notes:
+            body.note("")
+
+        body.note_section("Alumni Park", notes["alumni"])
+        body.note_section("Goodspeed Family Pier", notes["pier"])
+
+    body.note_section("Dining Service & Markets", notes["dining"])
+    body.note_section("Hotel", notes["hotel"])
+    body.note_section("Miscellaneous", notes["misc"])
+
+    body.section("Security")
+    rows = [[("Shift", True), ("Staff Requested", True), ("Staff Present", True)]]
+    for shift in csc_shifts:
+        shift_values = report.csc.get(shift, {})
+        requested = shift_values.get("requested", "").strip()
+        present = shift_values.get("present", "").strip()
+        names = shift_values.get("names", "").strip()
+        # Names go in parentheses only if present is a number
+        if present.isdigit() and names:
+            present = f"{present} ({names})"
+        rows.append([(shift, True), requested or "-", present or "-"])
+    body.table(rows)
+
+def render_report_document(doc, report, notes, job, perf):
+    """Fill an opened template with the report"""
+    style_ids = ensure_report_styles(doc)
+    values = {key: "" for _, key in REPORT_HEADER_FIELDS}
+    values.update((key, str(value)) for key, value in report.entries.items())
+    values["building"] = report.building.upper()
+    notes_paragraph = fill_placeholders(doc, values) or doc.add_paragraph()
+    body = ReportBody(doc, style_ids)
+    if report.building == "Red Gym":
+        write_red_gym_notes(body, report, notes)
+    else:
+        write_union_notes(body, report, notes, job, perf)
+    body.render_into(notes_paragraph)
+    return doc
 
-        # Save report as MM-DD-YY.docx in the correct folder (for all building types)
-        user_date = entries["date"].get()
-        parsed_date = datetime.strptime(user_date, "%A, %B %d, %Y")
+def build_report_document(report, notes, job, perf, warnings):
+    """The report document, from the building's template or, if that can't be opened,
+    from the built-in one"""
+    try:
+        with perf.phase("load_template"):
+            doc = open_report_template(report.building)
+    except Exception as e:
+        warnings.append(("Template Error", f"Could not open the report template, so the built-in layout was used: {e}"))
+        doc = default_template(report.building)
+    return render_report_document(doc, report, notes, job, perf)
+
+# === Generate Report Logic === (renamed from generate_report)
+def generate_report(report, job, perf):
+    """Build the Word report, update the tally and save both (runs on the report worker).
+
+    Reads only the snapshot in report. Returns (report path, [(title, warning)] for the user)."""
+    building = report.building
+    warnings = []
+    # Imported on first use; usually already warmed up in the background
+    job.stage("imports")
+    with perf.phase("imports"):
+        import docx  # The document builders and the tally import from these
+        import openpyxl
+    # Everything below reads from the snapshot, not from the widgets
+    job.stage("document")
+    report_entries = report.entries
+    build_start = time.perf_counter()
+    # One pass over the notes feeds both the document and the tally
+    notes = ReportNotes(report)
+    doc = build_report_document(report, notes, job, perf, warnings)
+    perf.record("document_build", build_start, exclude=("load_template", "prepare_photo", "add_picture"))
+
+    # Excel Tally Update
+    # Once the update is queued for the share the run can no longer be cancelled
+    job.stage("tally")
+    tally_start = time.perf_counter()
+    try:
+        # Extract year and month for folder and filename
+        parsed_date = datetime.strptime(report_entries.get("date", ""), "%A, %B %d, %Y")
         current_year = parsed_date.strftime("%Y")
-        current_month = parsed_date.strftime("%B")
-        
-        # Create year and month folders in building-specific directory
-        base_dir = f"M:\\Sh_BM\\{building}\\Night Reports"
-        year_dir = os.path.join(base_dir, current_year)
-        month_dir = os.path.join(year_dir, current_month)
-        os.makedirs(month_dir, exist_ok=True)
-        
-        report_filename = f"{parsed_date.month}-{parsed_date.day}-{str(parsed_date.year)[2:]}.docx"
-        report_path = os.path.join(month_dir, report_filename)
-        doc.save(report_path)
-        
-        messagebox.showinfo("Success", f"Report saved as {report_path}")
+        year_dir = os.path.join(share_storage.reports_dir(building), current_year)
+        # Saved as MU_Tally_YYYY.xlsx, US_Tally_YYYY.xlsx or RG_Tally_YYYY.xlsx in the year folder
+        building_short = {"Memorial Union": "MU", "Red Gym": "RG"}.get(building, "US")
+        tally_path = os.path.join(year_dir, f"{building_short}_Tally_{current_year}.xlsx")
+        # The sync worker applies it to the workbook (see ShareSync.apply)
+        share_spool.add_tally(tally_path, parsed_date, building, report_note_rows(report, notes))
     except Exception as e:
-        messagebox.showerror("Error", str(e))
+        tally_name = "Red Gym Excel tally" if building == "Red Gym" else "Excel tally"
+        warnings.append(("Excel Error", f"Failed to queue the {tally_name} update: {e}"))
+    perf.record("tally_update", tally_start)
+
+    job.stage("save")
+    # Save report as MM-DD-YY.docx in the correct folder (for all building types)
+    user_date = report_entries.get("date", "")
+    parsed_date = datetime.strptime(user_date, "%A, %B %d, %Y")
+    current_year = parsed_date.strftime("%Y")
+    current_month = parsed_date.strftime("%B")
+    
+    # Year and month folders in the building-specific directory are created by the sync
+    base_dir = share_storage.reports_dir(building)
+    year_dir = os.path.join(base_dir, current_year)
+    month_dir = os.path.join(year_dir, current_month)
+    
+    report_filename = f"{parsed_date.month}-{parsed_date.day}-{str(parsed_date.year)[2:]}.docx"
+    report_path = os.path.join(month_dir, report_filename)
+    with perf.phase("doc_save"):
+        share_spool.add_file(report_path, doc.save)
+    # The snapshot the report and tally came from stays next to it, so the night can be
+    # recounted later from the same notes
+    try:
+        share_spool.add_text(os.path.join(month_dir, FINAL_DRAFTS_FOLDER, f"{os.path.splitext(report_filename)[0]}.json"),
+                             json.dumps(job.snapshot, indent=2, ensure_ascii=False))
+    except OSError as e:
+        print(f"Warning: Could not save final draft: {e}")
+    return report_path, warnings
+
+# === Deferred Imports ===
+# python-docx and openpyxl take most of a second to import on the front-desk PCs but are
+# only needed at End Shift, so generate_report imports them itself. Once the first
+# window is up they are imported in a background thread, and End Shift rarely waits.
+
+REPORT_LIBRARIES = ("docx", "docx.shared", "openpyxl")
+report_libraries_warmed = False
+
+def warm_up_report_libraries():
+    """Start importing the End Shift libraries in the background (once)"""
+    global report_libraries_warmed
+    if report_libraries_warmed:
+        return
+    report_libraries_warmed = True
+    
+    def run():
+        for name in REPORT_LIBRARIES:
+            try:
+                __import__(name)
+            except ImportError as e:
+                # generate_report will report it when the libraries are actually needed
+                print(f"Warning: Could not preload {name}: {e}")
+    threading.Thread(target=run, daemon=True).start()
 
 # Wrap the initial UI setup in a function to be called after mainloop starts
 def show_startup_modal():
     """Show initial modal to choose between creating new report or loading saved report"""
+    # A crash left edits in the local journal - offer those before anything else
+    if offer_journal_recovery():
+        return
+    
     startup_window = tk.Toplevel()
     startup_window.title("Night Report Generator")
     startup_window.configure(bg="black")
@@ -3673,30 +5058,48 @@ def show_startup_modal():
     )
     instructions_label.pack(pady=(20, 10))
     
+    # The window is up; load the report libraries while the user decides
+    startup_window.after_idle(warm_up_report_libraries)
+    
     # Wait for this window to be destroyed before proceeding
     root.wait_window(startup_window)
 
+def open_draft_data(data, perf=None):
+    """Build the form for the draft's building and fill it in (startup flow)"""
+    perf = perf or perf_log.start("load")
+    # Set the global building variable from the loaded data
+    global building, loaded_from_draft
+    building = data["building"]
+    loaded_from_draft = True
+    
+    # Update window title with loaded building
+    root.title(f"{building} - Night Report Generator")
+    
+    # Configure tabs for the loaded building
+    with perf.phase("build_tabs"):
+        configure_tabs_for_building()
+    
+    # Populate the form with the loaded data
+    with perf.phase("populate"):
+        populate_form_from_data(data)
+    show_perf_summary(perf.finish())
+
 def load_draft_report_startup():
     """Special version of load_draft_report for startup flow"""
     try:
-        # Get the file path from user
-        file_path = filedialog.askopenfilename(
-            title="Select Draft Report to Load",
-            filetypes=[
-                ("JSON files", "*.json"),
-                ("All files", "*.*")
-            ],
-            initialdir=os.path.expanduser("~/Desktop")  # Start at Desktop for startup
-        )
+        # Pick a recent draft from the local index, or browse starting at the Desktop
+        file_path, data = choose_draft(os.path.expanduser("~/Desktop"))
         
-        if not file_path:
+        if not file_path and data is None:
             # User cancelled - show the startup modal again
             show_startup_modal()
             return
         
         # Load and validate the JSON data
-        with open(file_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        perf = perf_log.start("load")
+        if data is None:
+            with perf.phase("read_file"), open(file_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
         
         # Validate the data structure with backward compatibility
         if not isinstance(data, dict):
@@ -3713,19 +5116,8 @@ def load_draft_report_startup():
         if "notes" not in data:
             data["notes"] = {}
         
-        # Set the global building variable from the loaded data
-        global building, loaded_from_draft
-        building = data["building"]
-        loaded_from_draft = True
-        
-        # Update window title with loaded building
-        root.title(f"{building} - Night Report Generator")
-        
-        # Configure tabs for the loaded building
-        configure_tabs_for_building()
-        
-        # Populate the form with the loaded data
-        populate_form_from_data(data)
+        # Build the tabs for the draft's building and fill them in
+        open_draft_data(data, perf)
         
         # Show success message
         messagebox.showinfo("Success", "Report loaded successfully!")
@@ -3743,7 +5135,384 @@ def load_draft_report_startup():
         messagebox.showerror("Load Error", str(e))
         show_startup_modal()
 
+# === Restore Benchmark ===
+# Run "python geNRator.py --benchmark-restore" to time draft restores of growing size,
+# with and without bulk restore. Nothing is written to the share or the real journal.
+
+BENCHMARK_NOTE_SECTIONS = [
+    ("mechanical", MECHANICAL_TAG_OPTIONS), ("production", PRODUCTION_TAG_OPTIONS),
+    ("patron", PATRON_TAG_OPTIONS), ("access", ACCESS_TAG_OPTIONS), ("cash", CASH_TAG_OPTIONS),
+    ("dining", DINING_TAG_OPTIONS), ("alumni", TERRACE_TAG_OPTIONS), ("pier", TERRACE_TAG_OPTIONS),
+    ("hotel", None), ("misc", None), ("carding", None), ("terrace", None)
+]
+
+def make_benchmark_draft(note_count):
+    """A Memorial Union draft with note_count notes spread over the note tabs"""
+    notes = {}
+    for i in range(note_count):
+        section, tag_options = BENCHMARK_NOTE_SECTIONS[i % len(BENCHMARK_NOTE_SECTIONS)]
+        text = f"Benchmark note {i + 1}. " + "Checked the area and followed up with staff. " * (1 + i % 5)
+        if tag_options:
+            notes.setdefault(section, []).append({"text": text, "tags": [tag_options[1 + i % (len(tag_options) - 1)]]})
+        else:
+            notes.setdefault(section, []).append(text)
+    return {
+        "building": "Memorial Union",
+        "entries": {"date": datetime.now().strftime("%A, %B %d, %Y"), "bms": "Benchmark"},
+        "notes": notes
+    }
+
+def run_restore_benchmark(note_counts=(10, 30, 60, 120), repeats=3):
+    """Print restore time (build + layout + height pass) against note count"""
+    global building, BULK_RESTORE_ENABLED
+    edit_journal.path = os.path.join(tempfile.mkdtemp(), "edit_journal.jsonl")
+    building = "Memorial Union"
+    root.deiconify()
+    print(f"{'notes':>6} {'per-box (s)':>12} {'bulk (s)':>10}")
+    for note_count in note_counts:
+        data = make_benchmark_draft(note_count)
+        timings = []
+        for bulk in (False, True):
+            BULK_RESTORE_ENABLED = bulk
+            best = None
+            for _ in range(repeats):
+                configure_tabs_for_building()
+                stop_autosave()
+                root.update()
+                start = time.perf_counter()
+                with bulk_restore():
+                    populate_form_from_data(data)
+                    build_all_tabs()  # Time every tab, not just the visible one
+                root.update_idletasks()
+                elapsed = time.perf_counter() - start
+                best = elapsed if best is None else min(best, elapsed)
+            timings.append(best)
+        print(f"{note_count:>6} {timings[0]:>12.3f} {timings[1]:>10.3f}")
+    BULK_RESTORE_ENABLED = True
+    stop_autosave()
+    edit_journal.discard()
+    root.destroy()
+
+# === Widget Leak Check ===
+# Reloads a large draft over and over and compares Tk's own counts of widgets, commands
+# (Python callbacks) and global variables (StringVars) before and after. Run with
+# --leak-check; the exit status is 1 if anything kept growing.
+
+LEAK_CHECK_RELOADS = 100
+LEAK_CHECK_WARMUP = 5  # Reloads before the baseline (pools and caches fill up first)
+
+def count_tk_widgets(path="."):
+    children = root.tk.splitlist(root.tk.call("winfo", "children", path))
+    return 1 + sum(count_tk_widgets(child) for child in children)
+
+def tk_resource_counts():
+    return {
+        "widgets": count_tk_widgets(),
+        "commands": len(root.tk.splitlist(root.tk.call("info", "commands"))),
+        "variables": len(root.tk.splitlist(root.tk.call("info", "globals"))),
+    }
+
+def run_leak_check(reloads=LEAK_CHECK_RELOADS, note_count=120):
+    """Reload a large draft repeatedly and check that Tk resources stay flat"""
+    global building
+    edit_journal.path = os.path.join(tempfile.mkdtemp(), "edit_journal.jsonl")
+    building = "Memorial Union"
+    root.deiconify()
+    data = make_benchmark_draft(note_count)
+    counts = []
+    for _ in range(reloads):
+        # The same steps as loading a draft from the menu
+        configure_tabs_for_building()
+        stop_autosave()
+        populate_form_from_data(data)
+        build_all_tabs()
+        root.update()
+        counts.append(tk_resource_counts())
+    
+    baseline, final = counts[LEAK_CHECK_WARMUP - 1], counts[-1]
+    grown = {name: final[name] - baseline[name] for name in final if final[name] > baseline[name]}
+    for name in final:
+        print(f"{name:>10}: {baseline[name]} after {LEAK_CHECK_WARMUP} reloads, {final[name]} after {reloads}")
+    print("Leak check " + ("FAILED: " + ", ".join(f"{name} +{count}" for name, count in grown.items()) if grown else "passed"))
+    stop_autosave()
+    edit_journal.discard()
+    root.destroy()
+    sys.exit(1 if grown else 0)
+
+# === Startup Benchmark ===
+# Time from launching the process to the building picker being ready for input. Each run
+# is a fresh interpreter started with --startup-probe, which opens the picker the way
+# "Create New Report" does, prints once it is drawn and idle, and exits.
+
+STARTUP_BENCHMARK_RUNS = 5
+
+def run_startup_probe():
+    warm_up_report_libraries()  # Started by the startup modal in normal use
+    # The picker is built but not waited on, so no one has to pick a building
+    build_building_window().update()
+    print("ready", flush=True)
+    os._exit(0)  # Don't wait for the warm-up thread
+
+def time_process(arguments):
+    """Seconds from spawning a Python process until it prints its first line"""
+    start = time.perf_counter()
+    process = subprocess.Popen([sys.executable] + arguments, stdout=subprocess.PIPE, text=True)
+    process.stdout.readline()
+    elapsed = time.perf_counter() - start
+    process.wait()
+    return elapsed
+
+def run_startup_benchmark(runs=STARTUP_BENCHMARK_RUNS):
+    """Print process start -> interactive building picker, next to the import cost saved"""
+    script = os.path.abspath(__file__)
+    startup = sorted(time_process([script, "--startup-probe"]) for _ in range(runs))
+    imports = sorted(time_process(["-c", "import docx.shared, openpyxl; print('ready')"]) for _ in range(runs))
+    baseline = sorted(time_process(["-c", "print('ready')"]) for _ in range(runs))
+    print(f"Building picker interactive: {startup[runs // 2]:.3f}s median, {startup[0]:.3f}s best ({runs} runs)")
+    print(f"docx + openpyxl import (no longer on the startup path): {imports[runs // 2] - baseline[runs // 2]:.3f}s median")
+    root.destroy()
+
+# === Render Benchmark ===
+# Run "python geNRator.py --benchmark-render" to time the template renderer (build +
+# save) on reports of growing size. Reports are saved to a temp folder, not the share.
+
+def run_render_benchmark(note_counts=(10, 60, 240), repeats=3):
+    """Print render time and file size against note count"""
+    out_dir = tempfile.mkdtemp()
+    print(f"{'notes':>6} {'render (s)':>11} {'size (KB)':>10}")
+    for note_count in note_counts:
+        job = ReportJob(make_benchmark_draft(note_count), out_dir)
+        report = job.report
+        path = os.path.join(out_dir, f"report-{note_count}.docx")
+        best = None
+        for _ in range(repeats):
+            start = time.perf_counter()
+            build_report_document(report, ReportNotes(report), job, perf_log.start("benchmark"), []).save(path)
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        print(f"{note_count:>6} {best:>11.3f} {os.path.getsize(path) / 1024:>10.1f}")
+    print(f"Reports saved in {out_dir}")
+    root.destroy()
+
+# === Storage Benchmark ===
+# Run "python geNRator.py --benchmark-storage [ms]" to time a manual save, an autosave
+# and End Shift against an in-memory share where every operation takes ms. For each
+# path it prints how long the form waits (the spool write) and how long the background
+# sync takes to reach the share, followed by a batch of autosaves queued while the share
+# was unreachable and a run where a fifth of the share operations fail.
+
+def run_storage_benchmark(latency_ms=STORAGE_BENCHMARK_LATENCY_MS, note_count=60, offline_saves=10):
+    global share_spool, DRAFT_INDEX_ENABLED
+    DRAFT_INDEX_ENABLED = False  # Keep the benchmark drafts out of this PC's draft index
+    share_spool = ShareSpool(tempfile.mkdtemp())
+    storage = LatencyStorage(MemoryStorage(), latency_ms / 1000)
+    sync = ShareSync(share_spool, storage)
+    report = ReportModel()
+    report.load_draft(make_benchmark_draft(note_count))
+    data = report.snapshot(datetime.now().isoformat())
+    report_date = datetime.strptime(report.entries["date"], "%A, %B %d, %Y")
+    drafts_dir = os.path.join(storage.reports_dir(report.building), report_date.strftime("%Y"),
+                              report_date.strftime("%B"), "drafts")
+    saves = iter(range(1, 1000))
+
+    def save_draft(prefix):
+        draft_writer.submit(DraftWriteJob(drafts_dir, f"{prefix}_{next(saves)}.json", data, 0,
+                                          datetime.now(), prefix == "autosave"))
+        draft_writer.wait_until_idle()
+
+    def end_shift():
+        job = ReportJob(data, drafts_dir)
+        generate_report(job.report, job, perf_log.start("benchmark"))
+        job.remove_drafts()
+
+    def timed_push():
+        storage.calls.clear()
+        start = time.perf_counter()
+        passes = 1
+        while not sync.push():
+            passes += 1
+        return time.perf_counter() - start, sum(storage.calls.values()), passes
+
+    print(f"Share latency {latency_ms} ms per operation, {note_count} notes")
+    print(f"{'path':<22} {'form waits (s)':>15} {'share sync (s)':>15} {'share ops':>10}")
+    paths = [
+        ("manual save", lambda: save_draft("draft")),
+        ("autosave", lambda: save_draft("autosave")),
+        (f"{offline_saves} autosaves offline", lambda: [save_draft("autosave") for _ in range(offline_saves)]),
+        ("end shift", end_shift),
+    ]
+    for name, run in paths:
+        start = time.perf_counter()
+        run()
+        waited = time.perf_counter() - start
+        elapsed, operations, _ = timed_push()
+        print(f"{name:<22} {waited:>15.3f} {elapsed:>15.3f} {operations:>10}")
+    
+    storage.failure_rate = 0.2
+    storage.random.seed(1)
+    for _ in range(offline_saves):
+        save_draft("autosave")
+    end_shift()
+    elapsed, operations, passes = timed_push()
+    print(f"With 20% of operations failing: {offline_saves} autosaves and End Shift reached the share "
+          f"in {passes} passes, {operations} ops, {elapsed:.3f} s (not counting backoff)")
+    root.destroy()
+
+# === Tally Stress Test ===
+# Run "python geNRator.py --stress-tally" to start TALLY_STRESS_WORKERS processes that
+# each add random counts for their own nights to the same tally workbook in a temp
+# folder, as concurrent End Shifts would, and then re-run their first night with new
+# counts, as a regenerated report would. Each worker prints its final counts per night;
+# every month column must hold their sum. The exit status is 1 if anything is off.
+
+TALLY_STRESS_WORKERS = 8
+TALLY_STRESS_UPDATES = 10
+
+def run_tally_stress_worker(tally_path, worker, updates):
+    categories = tally_categories("Memorial Union")
+    first_night = datetime(datetime.now().year, 1, 1)
+    nights = {}
+    for n in list(range(updates)) + [0]:
+        night = first_night + timedelta(days=worker * updates + n)
+        tag_counts = {category: random.randint(1, 3) for category in random.sample(categories, 5)}
+        note_rows = [("misc", i, category, "Stress test note") for category, count in tag_counts.items() for i in range(count)]
+        update_tally(share_storage, tally_path, night, "Memorial Union", categories, note_rows, perf_log.start("stress"))
+        nights[night.strftime("%Y-%m-%d")] = tag_counts
+    print(json.dumps(nights), flush=True)
+    os._exit(0)
+
+def run_tally_stress_test(workers=TALLY_STRESS_WORKERS, updates=TALLY_STRESS_UPDATES):
+    """Check that concurrent and repeated tally updates neither lose nor double counts"""
+    import openpyxl
+    stress_dir = tempfile.mkdtemp()
+    tally_path = os.path.join(stress_dir, "MU_Tally_stress.xlsx")
+    script = os.path.abspath(__file__)
+    # The workers' working copies of the note store go in the temp folder, not this PC's local data
+    environment = dict(os.environ, LOCALAPPDATA=stress_dir)
+    start = time.perf_counter()
+    processes = [
+        subprocess.Popen([sys.executable, script, "--tally-stress-worker", tally_path, str(worker), str(updates)],
+                         stdout=subprocess.PIPE, text=True, env=environment)
+        for worker in range(workers)
+    ]
+    expected = {}  # (month, tag) -> count
+    failed_workers = 0
+    for process in processes:
+        output, _ = process.communicate()
+        lines = output.strip().splitlines()
+        if process.returncode or not lines:
+            failed_workers += 1
+            continue
+        for date_key, tag_counts in json.loads(lines[-1]).items():
+            month = TALLY_MONTHS[int(date_key[5:7]) - 1]
+            for category, count in tag_counts.items():
+                expected[month, category] = expected.get((month, category), 0) + count
+    elapsed = time.perf_counter() - start
+    
+    sheet = openpyxl.load_workbook(tally_path).worksheets[0]
+    columns = {cell.value: cell.column for cell in sheet[1]}
+    actual = {(month, row[0].value): row[column - 1].value
+              for row in sheet.iter_rows(min_row=2) for month, column in columns.items() if month}
+    wrong = [key for key, count in expected.items() if actual.get(key, 0) != count]
+    print(f"{workers} workers x {updates + 1} updates in {elapsed:.1f}s, {failed_workers} workers failed")
+    print("Tally stress test " + (f"FAILED: {len(wrong)} cells differ" if wrong or failed_workers else "passed"))
+    root.destroy()
+    sys.exit(1 if wrong or failed_workers else 0)
+
+def run_tally_rebuild(tally_path):
+    """Recompute a tally workbook's months from its note store and ledger (--rebuild-tally)"""
+    try:
+        months = rebuild_tally(share_storage, tally_path, perf_log.start("rebuild"))
+        print(f"Rebuilt {', '.join(months) or 'nothing'} in {tally_path} from its note store and {TALLY_LEDGER_SHEET} sheet")
+    except Exception as e:
+        print(f"Could not rebuild {tally_path}: {e}")
+    root.destroy()
+
+def run_tally_query(paths, by="month"):
+    """Print a tally pivoted by month, week, section, building or report_date (--tally-report).
+
+    Reads the note stores beside the workbooks, so it covers every PC's End Shifts."""
+    import pandas as pd
+    tally_paths = [path[:-len("_notes.sqlite3")] + ".xlsx" if path.endswith("_notes.sqlite3") else path for path in paths]
+    store_paths = [tally_store_path(path) for path in tally_paths]
+    missing = [path for path in store_paths if not share_storage.exists(path)]
+    if missing or not store_paths:
+        print(f"No note store at {', '.join(missing) or '(no path given)'}")
+    else:
+        frames = []
+        for tally_path in tally_paths:
+            with TallyLock(share_storage, tally_path), open_note_store(share_storage, tally_path) as store:
+                frames.append(store.frame())
+        frame = pd.concat(frames, ignore_index=True)
+        start = time.perf_counter()
+        table = pivot_tally(frame, by)
+        elapsed = time.perf_counter() - start
+        print(table.to_string())
+        print(f"{len(frame)} note rows from {len(store_paths)} store(s), pivoted by {by} in {elapsed * 1000:.1f} ms")
+    root.destroy()
+
+def run_tally_backfill(building_name, year):
+    """Recount a year of archived drafts into the tally (--backfill-tally)"""
+    building_name = {short: name for name, short in BUILDING_SHORT_NAMES.items()}.get(building_name, building_name)
+    if building_name not in BUILDING_SHORT_NAMES:
+        print(f"Unknown building {building_name!r}; use one of {', '.join(BUILDING_SHORT_NAMES)}")
+    else:
+        start = time.perf_counter()
+        try:
+            summary = backfill_tally(building_name, int(year), perf_log.start("backfill"))
+            print(f"{len(summary['nights'])} nights recounted ({summary['parsed']} files parsed, "
+                  f"{summary['cached']} from cache) in {time.perf_counter() - start:.1f}s")
+            print(f"Months recomputed: {', '.join(summary['months']) or 'none'}")
+            if summary["unrecovered"]:
+                print(f"No draft found for {len(summary['unrecovered'])} reports: {', '.join(summary['unrecovered'])}")
+        except Exception as e:
+            print(f"Could not backfill the {building_name} {year} tally: {e}")
+    root.destroy()
+
 def start_app():
+    if "--startup-probe" in sys.argv:
+        run_startup_probe()
+        return
+    if "--benchmark-startup" in sys.argv:
+        run_startup_benchmark()
+        return
+    if "--benchmark-restore" in sys.argv:
+        run_restore_benchmark()
+        return
+    if "--benchmark-render" in sys.argv:
+        run_render_benchmark()
+        return
+    if "--benchmark-storage" in sys.argv:
+        arguments = sys.argv[sys.argv.index("--benchmark-storage") + 1:]
+        run_storage_benchmark(float(arguments[0]) if arguments else STORAGE_BENCHMARK_LATENCY_MS)
+        return
+    if "--tally-stress-worker" in sys.argv:
+        i = sys.argv.index("--tally-stress-worker")
+        run_tally_stress_worker(sys.argv[i + 1], int(sys.argv[i + 2]), int(sys.argv[i + 3]))
+        return
+    if "--stress-tally" in sys.argv:
+        run_tally_stress_test()
+        return
+    if "--tally-report" in sys.argv:
+        paths = sys.argv[sys.argv.index("--tally-report") + 1:]
+        by = "month"
+        if "--by" in paths:
+            i = paths.index("--by")
+            by = paths[i + 1]
+            del paths[i:i + 2]
+        run_tally_query(paths, by)
+        return
+    if "--backfill-tally" in sys.argv:
+        i = sys.argv.index("--backfill-tally")
+        run_tally_backfill(sys.argv[i + 1], sys.argv[i + 2])
+        return
+    if "--rebuild-tally" in sys.argv:
+        run_tally_rebuild(sys.argv[sys.argv.index("--rebuild-tally") + 1])
+        return
+    if "--leak-check" in sys.argv:
+        run_leak_check()
+        return
+    start_share_sync()
     show_startup_modal()
 
 # Schedule the app start after the mainloop starts